@@ -0,0 +1,91 @@
+"""
+Ürün görseli varyantları (liste küçük resmi ve detay boyutu) üretimi.
+
+Bu modül veritabanına ve depolamaya erişmez: yüklenen görselin baytları
+alınır, Pillow ile küçültülüp WebP ve JPEG olarak kodlanır ve baytlar
+döndürülür. Böylece işlem ayrı bir süreç havuzunda çalıştırılabilir ve
+event loop'u bloklamaz; depolamaya yazma işini çağıran taraf yapar.
+Tekrar yüklenen görselleri yakalamak için algısal hash (dHash) da burada
+hesaplanır.
+"""
+import io
+
+from PIL import Image, ImageOps
+
+# Varyant adı -> en uzun kenar (piksel). Büyükten küçüğe sıralı tutulur,
+# her varyant bir öncekinden küçültülür.
+VARIANT_SIZES = {
+    "medium": 960,
+    "thumb": 320,
+}
+
+# Format adı -> (Pillow formatı, kayıt seçenekleri)
+VARIANT_FORMATS = {
+    "webp": ("WEBP", {"quality": 78, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 80, "optimize": True, "progressive": True}),
+}
+
+
+def _to_rgb(image: Image.Image) -> Image.Image:
+    """Saydam görselleri beyaz zemine oturt (JPEG saydamlık desteklemez)"""
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        rgba = image.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    if image.mode != "RGB":
+        return image.convert("RGB")
+    return image
+
+
+def render_variants(contents: bytes) -> list:
+    """
+    Görselin tüm varyantlarını üret.
+    [{"size", "format", "width", "height", "content"}, ...] döndürür.
+    Görsel hedef boyuttan küçükse büyütülmez, yalnızca yeniden kodlanır.
+    """
+    largest = max(VARIANT_SIZES.values())
+    with Image.open(io.BytesIO(contents)) as source:
+        # JPEG'lerde DCT ölçekleme ile doğrudan küçük boyutta çöz
+        source.draft("RGB", (largest, largest))
+        image = _to_rgb(ImageOps.exif_transpose(source))
+
+    variants = []
+    for size, edge in sorted(VARIANT_SIZES.items(), key=lambda item: -item[1]):
+        image.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+        for fmt, (pil_format, options) in VARIANT_FORMATS.items():
+            buffer = io.BytesIO()
+            image.save(buffer, pil_format, **options)
+            variants.append({
+                "size": size,
+                "format": fmt,
+                "width": image.width,
+                "height": image.height,
+                "content": buffer.getvalue(),
+            })
+    return variants
+
+
+def difference_hash(contents: bytes, hash_size: int = 8) -> str:
+    """
+    Algısal fark hash'i (dHash), hex olarak. Görsel gri tonlamaya çevrilip
+    (hash_size + 1) x hash_size boyutuna küçültülür ve yan yana piksellerin
+    parlaklık farkının işareti bit olarak alınır. Aynı fotoğrafın yeniden
+    kodlanmış veya küçültülmüş kopyaları genellikle aynı hash'i verir.
+    """
+    with Image.open(io.BytesIO(contents)) as source:
+        source.draft("L", (hash_size * 16, hash_size * 16))
+        image = ImageOps.exif_transpose(source).convert("L")
+    image = image.resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+    pixels = image.tobytes()
+    bits = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            bits = bits << 1 | (pixels[offset + col] > pixels[offset + col + 1])
+    return f"{bits:0{hash_size * hash_size // 4}x}"
+
+
+def process_image(contents: bytes) -> dict:
+    """Yükleme sonrası tek worker çağrısı: {"variants": render_variants(), "dhash": difference_hash()}"""
+    return {"variants": render_variants(contents), "dhash": difference_hash(contents)}
@@ -0,0 +1,628 @@
+"""
+PDF rapor üretimi (günlük ziyaret raporu ve haftalık/aylık dönem raporu).
+
+Bu modül veritabanına erişmez: handler'lar gerekli veriyi düz dict/list
+anlık görüntüsü (snapshot) olarak hazırlar, burada yalnızca FPDF ile çizim
+yapılıp PDF baytları döndürülür. Böylece render işlemi ayrı bir süreç
+havuzunda çalıştırılabilir ve event loop'u bloklamaz.
+"""
+import io
+from datetime import datetime, timezone
+
+from fontTools import ttLib
+from fpdf import FPDF
+from fpdf.fonts import SubsetMap, TTFFont
+
+# Türkçe karakterler için Unicode font
+REPORT_FONT_FAMILY = "DejaVu"
+REPORT_FONTS = {
+    "": "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "B": "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+}
+
+# Süreç başına bir kez ayrıştırılan fontlar: fontkey -> (TTFFont şablonu, font dosyası baytları)
+_FONT_CACHE = {}
+
+
+def _load_font(style: str, path: str) -> tuple:
+    """Fontu ilk kullanımda okuyup ayrıştır, sonraki belgeler için sakla"""
+    fontkey = f"{REPORT_FONT_FAMILY.lower()}{style}"
+    cached = _FONT_CACHE.get(fontkey)
+    if cached is None:
+        with open(path, "rb") as f:
+            font_bytes = f.read()
+        loader = FPDF()
+        loader.add_font(REPORT_FONT_FAMILY, style, path)
+        cached = (loader.fonts[fontkey], font_bytes)
+        _FONT_CACHE[fontkey] = cached
+    return cached
+
+
+def _clone_font(pdf: FPDF, template: TTFFont, font_bytes: bytes) -> TTFFont:
+    """
+    Ayrıştırılmış font şablonundan belgeye özel bir kopya oluştur.
+    cmap, karakter genişlikleri ve glyph id'leri paylaşılır. fpdf2 çıktı
+    sırasında alt küme (subset) çıkarırken ttfont nesnesini yerinde değiştirdiği
+    için her belge bellekteki font dosyasından tembel (lazy) açılan kendi
+    ttfont'unu ve boş bir subset haritasını alır.
+    """
+    font = TTFFont.__new__(TTFFont)
+    for attr in TTFFont.__slots__:
+        if hasattr(template, attr):
+            setattr(font, attr, getattr(template, attr))
+    font.i = len(pdf.fonts) + 1
+    font.ttfont = ttLib.TTFont(io.BytesIO(font_bytes), recalcTimestamp=False, fontNumber=0, lazy=True)
+    font.cw = template.cw.copy()
+    font.missing_glyphs = []
+    font.biggest_size_pt = 0
+    font._hbfont = None
+    font.subset = SubsetMap(font)
+    return font
+
+
+def warm_up_fonts():
+    """Rapor fontlarını önceden yükle (süreç havuzu initializer'ı)"""
+    for style, path in REPORT_FONTS.items():
+        _load_font(style, path)
+
+
+class ReportPDF(FPDF):
+    """
+    Rapor belgeleri için temel sınıf. DejaVu fontları her istekte diskten
+    okunup ayrıştırılmaz; süreç başına bir kez yüklenen şablonlardan kopyalanır.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.set_auto_page_break(auto=True, margin=15)
+        for style, path in REPORT_FONTS.items():
+            template, font_bytes = _load_font(style, path)
+            self.fonts[template.fontkey] = _clone_font(self, template, font_bytes)
+
+
+def render_daily_report(report: dict) -> bytes:
+    """
+    Günlük ziyaret raporunu çiz - profesyonel, kompakt, tablo bazlı format.
+    report: generate_daily_report_pdf tarafından hazırlanan snapshot
+    """
+    day_name = report["day_name"]
+    date = report["date"]
+    user_name = report["user_name"]
+    user_email = report["user_email"]
+    # (müşteri, ziyaret) çiftleri
+    visited_customers = report["visited_customers"]
+    not_visited_customers = report["not_visited_customers"]
+    pending_customers = report["pending_customers"]
+    daily_note_text = report["daily_note_text"]
+    daily_km_record = report["daily_km_record"]
+    vehicle = report["vehicle"]
+    
+    # Calculate stats
+    total_count = len(visited_customers) + len(not_visited_customers) + len(pending_customers)
+    visited_count = len(visited_customers)
+    not_visited_count = len(not_visited_customers)
+    pending_count_stat = len(pending_customers)
+    visit_rate = round((visited_count / total_count * 100), 1) if total_count > 0 else 0
+    
+    # Calculate payment stats
+    total_payment = 0
+    payment_count = 0
+    for c, visit in visited_customers:
+        if visit.get("payment_collected"):
+            payment_count += 1
+            total_payment += visit.get("payment_amount", 0) or 0
+    
+    # Create PDF (DejaVu fontları ReportPDF tarafından eklenir)
+    pdf = ReportPDF()
+    
+    # =========================================================================
+    # SAYFA 1: YÖNETİCİ ÖZETİ
+    # =========================================================================
+    pdf.add_page()
+    
+    # Header
+    pdf.set_font("DejaVu", "B", 18)
+    pdf.set_text_color(15, 23, 42)
+    pdf.cell(0, 10, "GÜNLÜK ZİYARET RAPORU", ln=True, align="C")
+    
+    pdf.set_font("DejaVu", "", 12)
+    pdf.set_text_color(71, 85, 105)
+    pdf.cell(0, 7, f"{day_name}, {date}", ln=True, align="C")
+    
+    pdf.ln(3)
+    pdf.set_font("DejaVu", "B", 11)
+    pdf.set_text_color(0, 85, 255)
+    pdf.cell(0, 6, f"Satış Temsilcisi: {user_name}", ln=True, align="C")
+    if user_email:
+        pdf.set_font("DejaVu", "", 9)
+        pdf.set_text_color(100, 116, 139)
+        pdf.cell(0, 5, user_email, ln=True, align="C")
+    
+    pdf.ln(8)
+    
+    # Özet Kutusu
+    pdf.set_fill_color(248, 250, 252)
+    pdf.set_draw_color(226, 232, 240)
+    box_y = pdf.get_y()
+    pdf.rect(10, box_y, 190, 55, "DF")
+    
+    # Sol Kolon - Ziyaret Özeti
+    pdf.set_xy(15, box_y + 5)
+    pdf.set_font("DejaVu", "B", 11)
+    pdf.set_text_color(15, 23, 42)
+    pdf.cell(80, 6, "ZİYARET ÖZETİ")
+    
+    pdf.set_font("DejaVu", "", 10)
+    pdf.set_xy(15, box_y + 14)
+    pdf.set_text_color(71, 85, 105)
+    pdf.cell(50, 5, "Planlanan Ziyaret:")
+    pdf.set_font("DejaVu", "B", 10)
+    pdf.set_text_color(15, 23, 42)
+    pdf.cell(30, 5, str(total_count))
+    
+    pdf.set_font("DejaVu", "", 10)
+    pdf.set_xy(15, box_y + 22)
+    pdf.set_text_color(22, 163, 74)
+    pdf.cell(50, 5, "Ziyaret Edilen:")
+    pdf.set_font("DejaVu", "B", 10)
+    pdf.cell(30, 5, str(visited_count))
+    
+    pdf.set_font("DejaVu", "", 10)
+    pdf.set_xy(15, box_y + 30)
+    pdf.set_text_color(220, 38, 38)
+    pdf.cell(50, 5, "Ziyaret Edilmeyen:")
+    pdf.set_font("DejaVu", "B", 10)
+    pdf.cell(30, 5, str(not_visited_count))
+    
+    pdf.set_font("DejaVu", "", 10)
+    pdf.set_xy(15, box_y + 38)
+    pdf.set_text_color(100, 116, 139)
+    pdf.cell(50, 5, "Bekleyen:")
+    pdf.set_font("DejaVu", "B", 10)
+    pdf.set_text_color(15, 23, 42)
+    pdf.cell(30, 5, str(pending_count_stat))
+    
+    pdf.set_font("DejaVu", "B", 11)
+    pdf.set_xy(15, box_y + 46)
+    pdf.set_text_color(0, 85, 255)
+    pdf.cell(50, 5, "Ziyaret Oranı:")
+    pdf.cell(30, 5, f"%{visit_rate}")
+    
+    # Sağ Kolon - Tahsilat Özeti
+    pdf.set_xy(110, box_y + 5)
+    pdf.set_font("DejaVu", "B", 11)
+    pdf.set_text_color(15, 23, 42)
+    pdf.cell(80, 6, "TAHSİLAT ÖZETİ")
+    
+    pdf.set_font("DejaVu", "", 10)
+    pdf.set_xy(110, box_y + 14)
+    pdf.set_text_color(71, 85, 105)
+    pdf.cell(50, 5, "Tahsilat Yapılan:")
+    pdf.set_font("DejaVu", "B", 10)
+    pdf.set_text_color(22, 163, 74)
+    pdf.cell(30, 5, f"{payment_count} müşteri")
+    
+    pdf.set_font("DejaVu", "B", 12)
+    pdf.set_xy(110, box_y + 26)
+    pdf.set_text_color(0, 85, 255)
+    pdf.cell(50, 6, "Toplam Tahsilat:")
+    pdf.cell(40, 6, f"{total_payment:,.2f} TL")
+    
+    # Araç bilgisi (varsa)
+    if daily_km_record and vehicle:
+        pdf.set_font("DejaVu", "", 9)
+        pdf.set_xy(110, box_y + 38)
+        pdf.set_text_color(71, 85, 105)
+        daily_km = daily_km_record.get("daily_km")
+        daily_cost = daily_km_record.get("daily_cost")
+        pdf.cell(80, 5, f"Araç: {vehicle.get('name', '-')}")
+        if daily_km:
+            pdf.set_xy(110, box_y + 44)
+            pdf.cell(40, 5, f"Günlük: {daily_km:,.0f} km")
+            if daily_cost:
+                pdf.cell(40, 5, f"Maliyet: {daily_cost:,.2f} TL")
+    
+    pdf.set_y(box_y + 60)
+    
+    # Gün Sonu Notu (varsa)
+    if daily_note_text:
+        pdf.ln(5)
+        pdf.set_font("DejaVu", "B", 11)
+        pdf.set_text_color(113, 63, 18)
+        pdf.cell(0, 6, "GÜN SONU NOTU:", ln=True)
+        
+        pdf.set_fill_color(254, 252, 232)
+        pdf.set_draw_color(250, 204, 21)
+        note_y = pdf.get_y()
+        pdf.rect(10, note_y, 190, 20, "DF")
+        
+        pdf.set_font("DejaVu", "", 9)
+        pdf.set_text_color(113, 63, 18)
+        pdf.set_xy(15, note_y + 3)
+        pdf.multi_cell(180, 5, daily_note_text[:200])
+    
+    # =========================================================================
+    # SAYFA 2: ZİYARET EDİLENLER TABLOSU
+    # =========================================================================
+    if visited_customers:
+        pdf.add_page()
+        
+        pdf.set_font("DejaVu", "B", 14)
+        pdf.set_text_color(22, 163, 74)
+        pdf.cell(0, 10, f"ZİYARET EDİLEN MÜŞTERİLER ({len(visited_customers)})", ln=True)
+        pdf.ln(2)
+        
+        # Tablo başlığı
+        pdf.set_fill_color(220, 252, 231)
+        pdf.set_draw_color(134, 239, 172)
+        pdf.set_font("DejaVu", "B", 9)
+        pdf.set_text_color(22, 101, 52)
+        
+        pdf.cell(8, 8, "#", border=1, fill=True, align="C")
+        pdf.cell(52, 8, "Müşteri Adı", border=1, fill=True)
+        pdf.cell(28, 8, "Bölge", border=1, fill=True)
+        pdf.cell(35, 8, "Tahsilat", border=1, fill=True)
+        pdf.cell(67, 8, "Not / Talep", border=1, fill=True, ln=True)
+        
+        # Tablo satırları
+        pdf.set_font("DejaVu", "", 8)
+        for i, (customer, visit) in enumerate(visited_customers, 1):
+            # Sayfa kontrolü
+            if pdf.get_y() > 260:
+                pdf.add_page()
+                # Başlık tekrar
+                pdf.set_fill_color(220, 252, 231)
+                pdf.set_font("DejaVu", "B", 9)
+                pdf.set_text_color(22, 101, 52)
+                pdf.cell(8, 8, "#", border=1, fill=True, align="C")
+                pdf.cell(52, 8, "Müşteri Adı", border=1, fill=True)
+                pdf.cell(28, 8, "Bölge", border=1, fill=True)
+                pdf.cell(35, 8, "Tahsilat", border=1, fill=True)
+                pdf.cell(67, 8, "Not / Talep", border=1, fill=True, ln=True)
+                pdf.set_font("DejaVu", "", 8)
+            
+            pdf.set_fill_color(255, 255, 255)
+            pdf.set_text_color(15, 23, 42)
+            
+            pdf.cell(8, 7, str(i), border=1, align="C")
+            pdf.cell(52, 7, customer['name'][:28], border=1)
+            pdf.cell(28, 7, customer['region'][:15], border=1)
+            
+            # Tahsilat
+            if visit.get("payment_collected"):
+                amount = visit.get("payment_amount", 0) or 0
+                pdf.set_text_color(22, 163, 74)
+                pdf.cell(35, 7, f"{amount:,.0f} TL", border=1)
+            else:
+                pdf.set_text_color(234, 88, 12)
+                reason = visit.get("payment_skip_reason", "Yapılmadı")[:18]
+                pdf.cell(35, 7, reason, border=1)
+            
+            # Not
+            pdf.set_text_color(71, 85, 105)
+            note_text = visit.get("customer_request") or visit.get("note") or "-"
+            pdf.cell(67, 7, note_text[:35], border=1, ln=True)
+    
+    # =========================================================================
+    # SAYFA 3: ZİYARET EDİLMEYENLER TABLOSU
+    # =========================================================================
+    if not_visited_customers:
+        pdf.add_page()
+        
+        pdf.set_font("DejaVu", "B", 14)
+        pdf.set_text_color(220, 38, 38)
+        pdf.cell(0, 10, f"ZİYARET EDİLMEYEN MÜŞTERİLER ({len(not_visited_customers)})", ln=True)
+        pdf.ln(2)
+        
+        # Tablo başlığı
+        pdf.set_fill_color(254, 226, 226)
+        pdf.set_draw_color(252, 165, 165)
+        pdf.set_font("DejaVu", "B", 9)
+        pdf.set_text_color(153, 27, 27)
+        
+        pdf.cell(8, 8, "#", border=1, fill=True, align="C")
+        pdf.cell(60, 8, "Müşteri Adı", border=1, fill=True)
+        pdf.cell(35, 8, "Bölge", border=1, fill=True)
+        pdf.cell(87, 8, "Ziyaret Edilmeme Sebebi", border=1, fill=True, ln=True)
+        
+        # Tablo satırları
+        pdf.set_font("DejaVu", "", 8)
+        for i, (customer, visit) in enumerate(not_visited_customers, 1):
+            if pdf.get_y() > 260:
+                pdf.add_page()
+                pdf.set_fill_color(254, 226, 226)
+                pdf.set_font("DejaVu", "B", 9)
+                pdf.set_text_color(153, 27, 27)
+                pdf.cell(8, 8, "#", border=1, fill=True, align="C")
+                pdf.cell(60, 8, "Müşteri Adı", border=1, fill=True)
+                pdf.cell(35, 8, "Bölge", border=1, fill=True)
+                pdf.cell(87, 8, "Ziyaret Edilmeme Sebebi", border=1, fill=True, ln=True)
+                pdf.set_font("DejaVu", "", 8)
+            
+            pdf.set_fill_color(255, 255, 255)
+            pdf.set_text_color(15, 23, 42)
+            
+            pdf.cell(8, 7, str(i), border=1, align="C")
+            pdf.cell(60, 7, customer['name'][:32], border=1)
+            pdf.cell(35, 7, customer['region'][:18], border=1)
+            
+            pdf.set_text_color(220, 38, 38)
+            reason = visit.get("visit_skip_reason", "Belirtilmemiş")[:45]
+            pdf.cell(87, 7, reason, border=1, ln=True)
+    
+    # =========================================================================
+    # BEKLEYENLER (varsa kısa liste)
+    # =========================================================================
+    if pending_customers:
+        if pdf.get_y() > 200:
+            pdf.add_page()
+        else:
+            pdf.ln(10)
+        
+        pdf.set_font("DejaVu", "B", 12)
+        pdf.set_text_color(100, 116, 139)
+        pdf.cell(0, 8, f"BEKLEYEN MÜŞTERİLER ({len(pending_customers)})", ln=True)
+        
+        pdf.set_font("DejaVu", "", 8)
+        pdf.set_text_color(71, 85, 105)
+        
+        # Sadece isimlerini listele (kompakt)
+        pending_names = [c['name'][:25] for c, v in pending_customers]
+        pdf.multi_cell(0, 5, " • ".join(pending_names))
+    
+    # =========================================================================
+    # FOOTER
+    # =========================================================================
+    pdf.ln(10)
+    pdf.set_font("DejaVu", "", 7)
+    pdf.set_text_color(148, 163, 184)
+    report_date = datetime.now(timezone.utc).strftime('%d.%m.%Y %H:%M')
+    pdf.cell(0, 4, f"Rapor: {report_date} UTC | {user_name} | Satış Takip Sistemi", ln=True, align="C")
+    
+    return bytes(pdf.output())
+
+
+def render_period_report(report: dict) -> bytes:
+    """
+    Haftalık/aylık performans özet raporunu çiz.
+    report: generate_period_report_pdf tarafından hazırlanan snapshot
+    """
+    period_type = report["period_type"]
+    period_start = datetime.strptime(report["start_date"], "%Y-%m-%d").date()
+    period_end = datetime.strptime(report["end_date"], "%Y-%m-%d").date()
+    user_name = report["user_name"]
+    user_email = report["user_email"]
+    working_days = report["working_days"]
+    customers_count = report["customer_count"]
+    total_visits = report["total_visits"]
+    visited_count = report["visited_count"]
+    not_visited_count = report["not_visited_count"]
+    pending_count = report["pending_count"]
+    visit_rate = report["visit_rate"]
+    avg_daily_visits = report["avg_daily_visits"]
+    total_payment = report["total_payment"]
+    payment_count = report["payment_count"]
+    payment_by_type = report["payment_by_type"]
+    avg_daily_payment = report["avg_daily_payment"]
+    total_km = report["total_km"]
+    total_fuel_cost = report["total_fuel_cost"]
+    avg_km_cost = report["avg_km_cost"]
+    # {tarih: {"visited", "not_visited", "payment"}}
+    daily_data = report["daily_data"]
+    sorted_dates = sorted(daily_data.keys())
+    
+    # Create PDF
+    pdf = ReportPDF()
+    
+    # =========================================================================
+    # SAYFA 1: DÖNEM ÖZETİ
+    # =========================================================================
+    pdf.add_page()
+    
+    # Header
+    period_label = "HAFTALIK" if period_type == "weekly" else "AYLIK"
+    pdf.set_font("DejaVu", "B", 18)
+    pdf.set_text_color(15, 23, 42)
+    pdf.cell(0, 10, f"{period_label} PERFORMANS RAPORU", ln=True, align="C")
+    
+    pdf.set_font("DejaVu", "", 11)
+    pdf.set_text_color(71, 85, 105)
+    pdf.cell(0, 7, f"{period_start.strftime('%d.%m.%Y')} - {period_end.strftime('%d.%m.%Y')}", ln=True, align="C")
+    
+    pdf.ln(3)
+    pdf.set_font("DejaVu", "B", 11)
+    pdf.set_text_color(0, 85, 255)
+    pdf.cell(0, 6, f"Satış Temsilcisi: {user_name}", ln=True, align="C")
+    if user_email:
+        pdf.set_font("DejaVu", "", 9)
+        pdf.set_text_color(100, 116, 139)
+        pdf.cell(0, 5, user_email, ln=True, align="C")
+    
+    pdf.ln(8)
+    
+    # Çalışma Özeti
+    pdf.set_fill_color(248, 250, 252)
+    pdf.set_draw_color(226, 232, 240)
+    box_y = pdf.get_y()
+    pdf.rect(10, box_y, 190, 25, "DF")
+    
+    pdf.set_font("DejaVu", "B", 10)
+    pdf.set_text_color(15, 23, 42)
+    pdf.set_xy(15, box_y + 5)
+    pdf.cell(60, 6, f"Çalışılan Gün: {working_days}")
+    pdf.cell(60, 6, f"Toplam Müşteri: {customers_count}")
+    pdf.cell(60, 6, f"Toplam Ziyaret Kaydı: {total_visits}")
+    
+    pdf.set_y(box_y + 30)
+    
+    # ===== ZİYARET PERFORMANSI =====
+    pdf.set_font("DejaVu", "B", 12)
+    pdf.set_text_color(22, 163, 74)
+    pdf.cell(0, 8, "ZİYARET PERFORMANSI", ln=True)
+    
+    pdf.set_fill_color(220, 252, 231)
+    pdf.set_draw_color(134, 239, 172)
+    box_y = pdf.get_y()
+    pdf.rect(10, box_y, 190, 40, "DF")
+    
+    pdf.set_font("DejaVu", "", 10)
+    pdf.set_text_color(22, 101, 52)
+    
+    pdf.set_xy(15, box_y + 5)
+    pdf.cell(60, 6, f"Ziyaret Edilen: {visited_count}")
+    pdf.cell(60, 6, f"Ziyaret Edilmeyen: {not_visited_count}")
+    pdf.cell(60, 6, f"Bekleyen: {pending_count}")
+    
+    pdf.set_xy(15, box_y + 14)
+    pdf.set_font("DejaVu", "B", 11)
+    pdf.cell(60, 6, f"Ziyaret Oranı: %{visit_rate}")
+    pdf.set_font("DejaVu", "", 10)
+    pdf.cell(60, 6, f"Günlük Ort. Ziyaret: {avg_daily_visits}")
+    
+    pdf.set_y(box_y + 45)
+    
+    # ===== TAHSİLAT PERFORMANSI =====
+    pdf.set_font("DejaVu", "B", 12)
+    pdf.set_text_color(0, 85, 255)
+    pdf.cell(0, 8, "TAHSİLAT PERFORMANSI", ln=True)
+    
+    pdf.set_fill_color(219, 234, 254)
+    pdf.set_draw_color(147, 197, 253)
+    box_y = pdf.get_y()
+    pdf.rect(10, box_y, 190, 50, "DF")
+    
+    pdf.set_font("DejaVu", "", 10)
+    pdf.set_text_color(30, 64, 175)
+    
+    pdf.set_xy(15, box_y + 5)
+    pdf.cell(90, 6, f"Tahsilat Yapılan Müşteri: {payment_count}")
+    pdf.cell(90, 6, f"Günlük Ort. Tahsilat: {avg_daily_payment:,.2f} TL")
+    
+    pdf.set_xy(15, box_y + 14)
+    pdf.set_font("DejaVu", "B", 14)
+    pdf.cell(0, 8, f"TOPLAM TAHSİLAT: {total_payment:,.2f} TL", ln=True)
+    
+    # Payment breakdown
+    pdf.set_font("DejaVu", "", 9)
+    pdf.set_xy(15, box_y + 28)
+    col_x = 15
+    for ptype, amount in payment_by_type.items():
+        if amount > 0:
+            pdf.set_xy(col_x, box_y + 28)
+            pdf.cell(45, 5, f"{ptype}: {amount:,.0f} TL")
+            col_x += 45
+            if col_x > 160:
+                col_x = 15
+                pdf.ln(6)
+    
+    pdf.set_y(box_y + 55)
+    
+    # ===== ARAÇ/YAKIT ÖZETİ =====
+    if total_km > 0 or total_fuel_cost > 0:
+        pdf.set_font("DejaVu", "B", 12)
+        pdf.set_text_color(113, 63, 18)
+        pdf.cell(0, 8, "ARAÇ / YAKIT ÖZETİ", ln=True)
+        
+        pdf.set_fill_color(254, 252, 232)
+        pdf.set_draw_color(250, 204, 21)
+        box_y = pdf.get_y()
+        pdf.rect(10, box_y, 190, 25, "DF")
+        
+        pdf.set_font("DejaVu", "", 10)
+        pdf.set_text_color(113, 63, 18)
+        
+        pdf.set_xy(15, box_y + 5)
+        pdf.cell(60, 6, f"Toplam KM: {total_km:,.0f} km")
+        pdf.cell(60, 6, f"Toplam Yakıt: {total_fuel_cost:,.2f} TL")
+        pdf.cell(60, 6, f"Ort. KM Maliyeti: {avg_km_cost:.3f} TL/km")
+        
+        pdf.set_y(box_y + 30)
+    
+    # =========================================================================
+    # SAYFA 2: GÜNLÜK DETAY TABLOSU
+    # =========================================================================
+    if sorted_dates:
+        pdf.add_page()
+        
+        pdf.set_font("DejaVu", "B", 14)
+        pdf.set_text_color(15, 23, 42)
+        pdf.cell(0, 10, "GÜNLÜK PERFORMANS DETAYI", ln=True)
+        pdf.ln(2)
+        
+        # Tablo başlığı
+        pdf.set_fill_color(241, 245, 249)
+        pdf.set_draw_color(203, 213, 225)
+        pdf.set_font("DejaVu", "B", 9)
+        pdf.set_text_color(15, 23, 42)
+        
+        pdf.cell(30, 8, "Tarih", border=1, fill=True, align="C")
+        pdf.cell(25, 8, "Gün", border=1, fill=True, align="C")
+        pdf.cell(30, 8, "Ziyaret", border=1, fill=True, align="C")
+        pdf.cell(30, 8, "Edilmedi", border=1, fill=True, align="C")
+        pdf.cell(35, 8, "Oran", border=1, fill=True, align="C")
+        pdf.cell(40, 8, "Tahsilat", border=1, fill=True, align="C", ln=True)
+        
+        # Türkçe gün isimleri
+        gun_isimleri = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
+        
+        pdf.set_font("DejaVu", "", 8)
+        for date_str in sorted_dates:
+            if pdf.get_y() > 260:
+                pdf.add_page()
+                pdf.set_fill_color(241, 245, 249)
+                pdf.set_font("DejaVu", "B", 9)
+                pdf.cell(30, 8, "Tarih", border=1, fill=True, align="C")
+                pdf.cell(25, 8, "Gün", border=1, fill=True, align="C")
+                pdf.cell(30, 8, "Ziyaret", border=1, fill=True, align="C")
+                pdf.cell(30, 8, "Edilmedi", border=1, fill=True, align="C")
+                pdf.cell(35, 8, "Oran", border=1, fill=True, align="C")
+                pdf.cell(40, 8, "Tahsilat", border=1, fill=True, align="C", ln=True)
+                pdf.set_font("DejaVu", "", 8)
+            
+            data = daily_data[date_str]
+            date_obj = datetime.strptime(date_str, "%Y-%m-%d")
+            gun_adi = gun_isimleri[date_obj.weekday()]
+            
+            total_day = data["visited"] + data["not_visited"]
+            day_rate = round((data["visited"] / total_day * 100), 0) if total_day > 0 else 0
+            
+            pdf.set_fill_color(255, 255, 255)
+            pdf.set_text_color(15, 23, 42)
+            
+            pdf.cell(30, 7, date_obj.strftime("%d.%m"), border=1, align="C")
+            pdf.cell(25, 7, gun_adi[:3], border=1, align="C")
+            
+            pdf.set_text_color(22, 163, 74)
+            pdf.cell(30, 7, str(data["visited"]), border=1, align="C")
+            
+            pdf.set_text_color(220, 38, 38)
+            pdf.cell(30, 7, str(data["not_visited"]), border=1, align="C")
+            
+            pdf.set_text_color(0, 85, 255)
+            pdf.cell(35, 7, f"%{day_rate:.0f}", border=1, align="C")
+            
+            pdf.set_text_color(15, 23, 42)
+            pdf.cell(40, 7, f"{data['payment']:,.0f} TL", border=1, align="C", ln=True)
+        
+        # Toplam satırı
+        pdf.set_font("DejaVu", "B", 9)
+        pdf.set_fill_color(241, 245, 249)
+        pdf.cell(30, 8, "TOPLAM", border=1, fill=True, align="C")
+        pdf.cell(25, 8, f"{working_days} gün", border=1, fill=True, align="C")
+        pdf.set_text_color(22, 163, 74)
+        pdf.cell(30, 8, str(visited_count), border=1, fill=True, align="C")
+        pdf.set_text_color(220, 38, 38)
+        pdf.cell(30, 8, str(not_visited_count), border=1, fill=True, align="C")
+        pdf.set_text_color(0, 85, 255)
+        pdf.cell(35, 8, f"%{visit_rate}", border=1, fill=True, align="C")
+        pdf.set_text_color(15, 23, 42)
+        pdf.cell(40, 8, f"{total_payment:,.0f} TL", border=1, fill=True, align="C", ln=True)
+    
+    # Footer
+    pdf.ln(10)
+    pdf.set_font("DejaVu", "", 7)
+    pdf.set_text_color(148, 163, 184)
+    report_date = datetime.now(timezone.utc).strftime('%d.%m.%Y %H:%M')
+    pdf.cell(0, 4, f"Rapor: {report_date} UTC | {user_name} | Satış Takip Sistemi", ln=True, align="C")
+    
+    return bytes(pdf.output())
@@ -1,24 +1,37 @@
 from fastapi import FastAPI, APIRouter, HTTPException, UploadFile, File, Depends, Header, Query
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, Response, FileResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure, PyMongoError
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
+from pydantic import BaseModel, Field, ConfigDict, EmailStr, ValidationError
 from typing import List, Optional
 import uuid
 from datetime import datetime, timezone, timedelta
-from fpdf import FPDF
 import io
 from openpyxl import load_workbook
+from pdf_reports import render_daily_report, render_period_report, warm_up_fonts
+from image_variants import process_image, difference_hash
 from passlib.context import CryptContext
 import jwt
 import cloudinary
 import cloudinary.utils
 import time
+import asyncio
+import functools
+import hashlib
+import json
+import base64
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, BrokenExecutor
+import multiprocessing
+import tempfile
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -36,6 +49,270 @@ cloudinary.config(
     secure=True
 )
 
+# =============================================================================
+# Bloklayan işler için sınırlı iş havuzu
+# =============================================================================
+class BoundedExecutor:
+    """
+    CPU yoğun / bloklayan işleri (bcrypt, PDF üretimi vb.) event loop dışında çalıştırır.
+    Aynı anda en fazla `concurrency` iş çalışır, diğerleri sırada bekler.
+    Sıradaki iş sayısı `max_queue` değerine ulaşırsa yeni işler 503 ile reddedilir.
+    """
+    
+    def __init__(self, name: str, executor_factory, concurrency: int, max_queue: Optional[int] = None):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.max_queue = max_queue
+        self._executor_factory = executor_factory
+        self._executor = None
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        # Metrikler
+        self.queued = 0
+        self.running = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+    
+    @property
+    def executor(self):
+        # Havuz ilk kullanımda oluşturulur
+        if self._executor is None:
+            self._executor = self._executor_factory(self.concurrency)
+        return self._executor
+    
+    async def run(self, fn, *args, **kwargs):
+        """fn(*args, **kwargs) çağrısını havuzda çalıştır ve sonucunu döndür"""
+        if self.max_queue is not None and self.queued >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(status_code=503, detail="Sunucu yoğun, lütfen biraz sonra tekrar deneyin")
+        
+        self.queued += 1
+        self.peak_queued = max(self.peak_queued, self.queued)
+        enqueued_at = time.monotonic()
+        dequeued = False
+        try:
+            async with self._semaphore:
+                self.queued -= 1
+                dequeued = True
+                self.total_wait_seconds += time.monotonic() - enqueued_at
+                self.running += 1
+                started_at = time.monotonic()
+                try:
+                    loop = asyncio.get_running_loop()
+                    result = await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+                except BrokenExecutor:
+                    # Çöken bir worker havuzu kullanılamaz hale getirir; sonraki iş yenisini açar
+                    self.failed += 1
+                    self._executor = None
+                    raise
+                except Exception:
+                    self.failed += 1
+                    raise
+                finally:
+                    self.running -= 1
+                    self.total_run_seconds += time.monotonic() - started_at
+                self.completed += 1
+                return result
+        finally:
+            if not dequeued:
+                self.queued -= 1
+    
+    def stats(self) -> dict:
+        finished = self.completed + self.failed
+        return {
+            "concurrency": self.concurrency,
+            "max_queue": self.max_queue,
+            "queued": self.queued,
+            "running": self.running,
+            "peak_queued": self.peak_queued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.total_wait_seconds / finished * 1000, 1) if finished else 0,
+            "avg_run_ms": round(self.total_run_seconds / finished * 1000, 1) if finished else 0,
+        }
+    
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+# =============================================================================
+# Arka plan işleri (Mongo'da durum tutan iş kuyruğu)
+# =============================================================================
+class JobRunner:
+    """
+    Uzun süren işleri istekten ayırır: iş kaydı `collection` içine yazılır,
+    süreç içindeki `workers` adet asyncio işçisi sırayla çalıştırır.
+    İstemci iş kaydını sorgulayarak durumu takip eder.
+    
+    Durumlar: queued -> running -> done | failed
+    Her iş tipi için bir handler kaydedilir: `async handler(job) -> dict`
+    Dönen dict iş kaydının `result` alanına yazılır. HTTPException mesajı
+    kullanıcıya `error` olarak gösterilir.
+    
+    Çalışan işler `heartbeat_at` alanını günceller. Süreç düzgün kapanırsa
+    yarım kalan işler tekrar sıraya alınır; çökerse `stale_seconds` boyunca
+    heartbeat gelmeyen işler bir sonraki açılışta sıraya alınır. Handler'lar
+    kaldıkları yerden devam edebilmek için ilerlemelerini iş kaydına yazar.
+    """
+    
+    def __init__(self, name: str, collection_name: str, workers: int, ttl_seconds: int, stale_seconds: int):
+        self.name = name
+        self.collection_name = collection_name
+        self.workers = max(1, workers)
+        self.ttl_seconds = ttl_seconds
+        # Bu süreden uzun "running" kalan iş, çöken bir süreçten kalmış sayılır
+        self.stale_seconds = stale_seconds
+        self._handlers = {}
+        self._queue = None
+        self._pending = []  # kuyruktaki iş id'leri, sırasıyla (queue_position için)
+        self._tasks = []
+        self._running = set()  # bu süreçte çalışan iş id'leri
+        # Metrikler
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.recovered = 0
+    
+    @property
+    def collection(self):
+        return db[self.collection_name]
+    
+    def register(self, job_type: str, handler):
+        self._handlers[job_type] = handler
+    
+    async def submit(self, user_id: str, job_type: str, params: dict, **fields) -> dict:
+        """İşi kaydet ve sıraya al; `fields` iş kaydına eklenecek ek alanlar (ör. ilerleme)"""
+        now = datetime.now(timezone.utc)
+        job = {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "type": job_type,
+            "params": params,
+            "status": "queued",
+            "result": None,
+            "error": None,
+            "created_at": now.isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "heartbeat_at": None,
+            # TTL indeksi bu alan üzerinden eski işleri siler (BSON tarih olmalı)
+            "expires_at": now + timedelta(seconds=self.ttl_seconds),
+            **fields
+        }
+        await self.collection.insert_one(job)
+        job.pop("_id", None)
+        self.submitted += 1
+        self._enqueue(job["id"])
+        return job
+    
+    def _enqueue(self, job_id: str):
+        self._pending.append(job_id)
+        self._queue.put_nowait(job_id)
+    
+    async def get(self, job_id: str, user_id: str) -> Optional[dict]:
+        return await self.collection.find_one({"id": job_id, "user_id": user_id}, {"_id": 0, "expires_at": 0})
+    
+    async def update(self, job_id: str, **fields):
+        """Çalışan işin ara durumunu kaydet (ilerleme vb.)"""
+        fields["heartbeat_at"] = datetime.now(timezone.utc).isoformat()
+        await self.collection.update_one({"id": job_id}, {"$set": fields})
+    
+    async def _run(self, job_id: str):
+        # Kaydı atomik olarak sahiplen: aynı iş iki kez çalışmasın
+        now = datetime.now(timezone.utc).isoformat()
+        job = await self.collection.find_one_and_update(
+            {"id": job_id, "status": "queued"},
+            {"$set": {"status": "running", "started_at": now, "heartbeat_at": now}},
+            projection={"_id": 0}
+        )
+        if not job:
+            return
+        
+        self._running.add(job_id)
+        update = {}
+        try:
+            handler = self._handlers[job["type"]]
+            update.update({"status": "done", "result": await handler(job)})
+            self.completed += 1
+        except HTTPException as e:
+            update.update({"status": "failed", "error": e.detail})
+            self.failed += 1
+        except Exception as e:
+            logger.exception(f"{self.name} işi başarısız ({job_id}): {e}")
+            update.update({"status": "failed", "error": "İş tamamlanamadı"})
+            self.failed += 1
+        finally:
+            self._running.discard(job_id)
+        update["finished_at"] = datetime.now(timezone.utc).isoformat()
+        await self.collection.update_one({"id": job_id}, {"$set": update})
+    
+    async def _work(self):
+        while True:
+            job_id = await self._queue.get()
+            self._pending.remove(job_id)
+            try:
+                await self._run(job_id)
+            except PyMongoError as e:
+                logger.error(f"{self.name} iş kaydı güncellenemedi ({job_id}): {e}")
+            finally:
+                self._queue.task_done()
+    
+    async def start(self):
+        """İşçileri başlat; yarım kalan ve sırada bekleyen işleri kuyruğa geri al"""
+        self._queue = asyncio.Queue()
+        self._pending = []
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        
+        stale_before = (datetime.now(timezone.utc) - timedelta(seconds=self.stale_seconds)).isoformat()
+        try:
+            result = await self.collection.update_many(
+                {"status": "running", "heartbeat_at": {"$lt": stale_before}},
+                {"$set": {"status": "queued", "started_at": None}}
+            )
+            self.recovered += result.modified_count
+            async for job in self.collection.find({"status": "queued"}, {"_id": 0, "id": 1}).sort("created_at", 1):
+                self._enqueue(job["id"])
+        except PyMongoError as e:
+            logger.error(f"{self.name} bekleyen işler yüklenemedi: {e}")
+    
+    async def stop(self):
+        interrupted = list(self._running)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if interrupted:
+            # Bir sonraki açılışta kaydedilen ilerlemeden devam edilir
+            try:
+                await self.collection.update_many(
+                    {"id": {"$in": interrupted}, "status": "running"},
+                    {"$set": {"status": "queued", "started_at": None}}
+                )
+            except PyMongoError as e:
+                logger.error(f"{self.name} yarım kalan işler sıraya alınamadı: {e}")
+    
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """Süreç içi kuyruktaki sıra (1 = sıradaki); kuyrukta değilse None"""
+        try:
+            return self._pending.index(job_id) + 1
+        except ValueError:
+            return None
+    
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "recovered": self.recovered,
+        }
+
 # Create the main app without a prefix
 app = FastAPI()
 
@@ -59,6 +336,24 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+# bcrypt her çağrıda yüzlerce milisaniye CPU harcar; event loop'u bloklamaması için
+# ayrı bir thread havuzunda çalıştırılır (bcrypt hesaplama sırasında GIL'i bırakır)
+PASSWORD_HASH_CONCURRENCY = int(os.environ.get("PASSWORD_HASH_CONCURRENCY", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_QUEUE = int(os.environ.get("PASSWORD_HASH_MAX_QUEUE", "256"))
+
+password_pool = BoundedExecutor(
+    "password",
+    lambda workers: ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password"),
+    PASSWORD_HASH_CONCURRENCY,
+    PASSWORD_HASH_MAX_QUEUE
+)
+
+async def hash_password_async(password: str) -> str:
+    return await password_pool.run(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
 def create_access_token(user_id: str, email: str) -> str:
     expire = datetime.now(timezone.utc) + timedelta(hours=JWT_EXPIRATION_HOURS)
     payload = {
@@ -68,6 +363,82 @@ def create_access_token(user_id: str, email: str) -> str:
     }
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
+# Kullanıcı profili önbelleği (require_auth her istekte users koleksiyonuna gitmesin)
+USER_CACHE_TTL_SECONDS = float(os.environ.get("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_SIZE = int(os.environ.get("USER_CACHE_MAX_SIZE", "1000"))
+
+class UserCache:
+    """
+    Kullanıcı profilleri için süreli (TTL) ve boyutu sınırlı (LRU) önbellek.
+    Süreç içidir; birden fazla worker varsa diğer worker'lardaki kayıtlar en geç
+    TTL sonunda tazelenir.
+    """
+    
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # user_id -> (expires_at, profile)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def get(self, user_id: str) -> Optional[dict]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, profile = entry
+        if expires_at < time.monotonic():
+            del self._entries[user_id]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        # Handler'lar ortak kaydı değiştiremesin diye kopya döndür
+        return dict(profile)
+    
+    def set(self, user_id: str, profile: dict):
+        if self.max_size <= 0:
+            return
+        self._entries[user_id] = (time.monotonic() + self.ttl_seconds, dict(profile))
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def invalidate(self, user_id: str):
+        if self._entries.pop(user_id, None) is not None:
+            self.invalidations += 1
+    
+    def clear(self):
+        self._entries.clear()
+    
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+user_cache = UserCache(USER_CACHE_MAX_SIZE, USER_CACHE_TTL_SECONDS)
+
+async def load_user(user_id: str) -> Optional[dict]:
+    """Kullanıcı profilini önbellekten, yoksa veritabanından getir (password_hash hariç)"""
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+    user = await db.users.find_one({"id": user_id}, {"_id": 0, "password_hash": 0})
+    if user:
+        user_cache.set(user_id, user)
+    return user
+
 def decode_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
@@ -83,7 +454,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         return None
     try:
         payload = decode_token(credentials.credentials)
-        user = await db.users.find_one({"id": payload["sub"]}, {"_id": 0, "password_hash": 0})
+        user = await load_user(payload["sub"])
         return user
     except:
         return None
@@ -94,7 +465,7 @@ async def require_auth(credentials: HTTPAuthorizationCredentials = Depends(secur
         raise HTTPException(status_code=401, detail="Giriş yapmanız gerekiyor")
     try:
         payload = decode_token(credentials.credentials)
-        user = await db.users.find_one({"id": payload["sub"]}, {"_id": 0, "password_hash": 0})
+        user = await load_user(payload["sub"])
         if not user:
             raise HTTPException(status_code=401, detail="Kullanıcı bulunamadı")
         return user
@@ -103,6 +474,15 @@ async def require_auth(credentials: HTTPAuthorizationCredentials = Depends(secur
     except:
         raise HTTPException(status_code=401, detail="Geçersiz oturum")
 
+# Tüm temsilcilerin verisini görebilen roller
+MANAGER_ROLES = {"admin", "manager"}
+
+async def require_manager(current_user: dict = Depends(require_auth)) -> dict:
+    """Yönetici yetkisi zorunlu - temsilciler 403 alır"""
+    if current_user.get("role") not in MANAGER_ROLES:
+        raise HTTPException(status_code=403, detail="Bu işlem için yönetici yetkisi gerekiyor")
+    return current_user
+
 # =============================================================================
 # FAZ 3.0: User Model
 # =============================================================================
@@ -113,7 +493,7 @@ class User(BaseModel):
     email: str
     password_hash: str
     name: str
-    role: str = "representative"  # representative, admin (ileride)
+    role: str = "representative"  # representative, manager, admin
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class UserRegister(BaseModel):
@@ -405,6 +785,8 @@ class Product(BaseModel):
     base_price: float = 0  # Sabit fiyat
     unit: str = "Adet"  # Birim
     images: List[str] = []  # Cloudinary URL'leri
+    # images ile aynı sırada: [{"url": orijinal, "variants": [{"size", "format", "width", "height", "url"}]}]
+    image_variants: List[dict] = []
     is_active: bool = True
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
@@ -451,7 +833,7 @@ async def register(input: UserRegister):
     # Kullanıcı oluştur
     user = User(
         email=input.email.lower(),
-        password_hash=hash_password(input.password),
+        password_hash=await hash_password_async(input.password),
         name=input.name,
         role="representative"
     )
@@ -476,6 +858,7 @@ async def register(input: UserRegister):
             {"user_id": None},
             {"$set": {"user_id": user.id}}
         )
+        await touch_report_versions(user.id)
         logging.info(f"İlk kullanıcı kaydı: Mevcut veriler {user.id} kullanıcısına atandı")
     
     # Token oluştur
@@ -499,7 +882,7 @@ async def login(input: UserLogin):
     if not user:
         raise HTTPException(status_code=401, detail="E-posta veya şifre hatalı")
     
-    if not verify_password(input.password, user["password_hash"]):
+    if not await verify_password_async(input.password, user["password_hash"]):
         raise HTTPException(status_code=401, detail="E-posta veya şifre hatalı")
     
     # Token oluştur
@@ -583,11 +966,12 @@ async def reset_password(input: ResetPasswordRequest):
         raise HTTPException(status_code=400, detail="Şifre en az 6 karakter olmalı")
     
     # Şifreyi güncelle
-    new_hash = hash_password(input.new_password)
+    new_hash = await hash_password_async(input.new_password)
     await db.users.update_one(
         {"id": reset_record["user_id"]},
         {"$set": {"password_hash": new_hash}}
     )
+    user_cache.invalidate(reset_record["user_id"])
     
     # Token'ı kullanılmış olarak işaretle
     await db.password_resets.update_one(
@@ -597,6 +981,29 @@ async def reset_password(input: ResetPasswordRequest):
     
     return {"message": "Şifreniz başarıyla güncellendi"}
 
+# =============================================================================
+# Rapor sürümleri - PDF önbelleğinin geçersiz kılınması
+# =============================================================================
+# Her kullanıcı için gün bazında (scope="YYYY-MM-DD") ve tüm raporları etkileyen
+# değişiklikler için (scope="*") bir sayaç tutulur. Raporun sürüm damgası bu
+# sayaçlardan türetilir; ilgili bir belge değişince damga ve önbellek anahtarı değişir.
+async def touch_report_versions(user_id: str, *dates: Optional[str]):
+    """Verilen günlerin rapor sürümünü artır. Gün verilmezse tüm raporlar etkilenir."""
+    scopes = {d for d in dates if d} or {"*"}
+    await db.report_versions.bulk_write([
+        UpdateOne({"user_id": user_id, "scope": scope}, {"$inc": {"rev": 1}}, upsert=True)
+        for scope in sorted(scopes)
+    ], ordered=False)
+
+async def get_report_version(user_id: str, start: str, end: str) -> str:
+    """[start, end] aralığındaki raporların sürüm damgası"""
+    versions = await db.report_versions.find(
+        {"user_id": user_id, "$or": [{"scope": "*"}, {"scope": {"$gte": start, "$lte": end}}]},
+        {"_id": 0, "scope": 1, "rev": 1}
+    ).to_list(None)
+    stamp = sorted((v["scope"], v["rev"]) for v in versions)
+    return hashlib.sha256(json.dumps(stamp).encode()).hexdigest()[:16]
+
 # =============================================================================
 # Customer endpoints (Mevcut - değiştirilmedi)
 # =============================================================================
@@ -640,7 +1047,11 @@ async def create_region(input: RegionCreate, current_user: dict = Depends(requir
     region_obj = Region(**input.model_dump(), user_id=current_user["id"])
     doc = region_obj.model_dump()
     doc['created_at'] = doc['created_at'].isoformat()
-    await db.regions.insert_one(doc)
+    try:
+        await db.regions.insert_one(doc)
+    except DuplicateKeyError:
+        # Eşzamanlı bir istek aynı bölgeyi oluşturdu (user_id, name unique indeksi)
+        raise HTTPException(status_code=400, detail="Bu isimde bir bölge zaten var")
     return region_obj
 
 @api_router.put("/regions/{region_id}", response_model=Region)
@@ -660,7 +1071,10 @@ async def update_region(region_id: str, input: RegionUpdate, current_user: dict
             raise HTTPException(status_code=400, detail="Bu isimde bir bölge zaten var")
     
     if update_data:
-        await db.regions.update_one({"id": region_id, "user_id": current_user["id"]}, {"$set": update_data})
+        try:
+            await db.regions.update_one({"id": region_id, "user_id": current_user["id"]}, {"$set": update_data})
+        except DuplicateKeyError:
+            raise HTTPException(status_code=400, detail="Bu isimde bir bölge zaten var")
         
         # Update customer regions if name changed (only user's customers)
         if "name" in update_data and update_data["name"] != old_name:
@@ -668,6 +1082,7 @@ async def update_region(region_id: str, input: RegionUpdate, current_user: dict
                 {"region": old_name, "user_id": current_user["id"]},
                 {"$set": {"region": update_data["name"]}}
             )
+            await touch_report_versions(current_user["id"])
     
     updated = await db.regions.find_one({"id": region_id, "user_id": current_user["id"]}, {"_id": 0})
     if isinstance(updated.get('created_at'), str):
@@ -706,14 +1121,115 @@ async def get_region_customers(region_id: str, current_user: dict = Depends(requ
     return customers
 
 # Customer endpoints - FAZ 3.2: user_id filtresi eklendi
-@api_router.get("/customers", response_model=List[Customer])
-async def get_customers(current_user: dict = Depends(require_auth)):
-    """Kullanıcının müşterilerini listele"""
-    customers = await db.customers.find({"user_id": current_user["id"]}, {"_id": 0}).to_list(1000)
-    for c in customers:
-        if isinstance(c.get('created_at'), str):
-            c['created_at'] = datetime.fromisoformat(c['created_at'])
-    return customers
+# ===== Keyset Sayfalama =====
+# skip() derin sayfalarda atlanan tüm belgeleri tarar; bunun yerine sıralama
+# anahtarının son değerinden devam edilir. İstemciye giden imleç (cursor) son
+# kaydın sıralama alanlarının base64 kodlu JSON'udur, içeriği opak kabul edilir.
+def encode_cursor(values: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """İmleci çöz; bozuk veya farklı uzunlukta imleçler 400 döner"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Geçersiz sayfa imleci")
+    return values
+
+def keyset_filter(sort: list, values: list) -> dict:
+    """
+    (f1, f2, ...) sıralamasında values'tan sonraki kayıtlar için filtre:
+    f1 > v1 veya (f1 = v1 ve f2 > v2) ... Azalan alanlarda $lt kullanılır.
+    """
+    branches = []
+    for i, (field, direction) in enumerate(sort):
+        branch = {f: v for (f, _), v in zip(sort[:i], values[:i])}
+        branch[field] = {"$gt" if direction == 1 else "$lt": values[i]}
+        branches.append(branch)
+    return {"$or": branches}
+
+async def keyset_page(collection, query: dict, sort: list, limit: int, cursor: Optional[str], projection: dict) -> tuple:
+    """Bir sayfa kayıt ve sonraki sayfanın imlecini (son sayfada None) döndür"""
+    if cursor:
+        query = {"$and": [query, keyset_filter(sort, decode_cursor(cursor, len(sort)))]}
+    docs = await collection.find(query, projection).sort(sort).limit(limit + 1).to_list(limit + 1)
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor([docs[-1].get(field) for field, _ in sort])
+    return docs, next_cursor
+
+async def skip_page(collection, query: dict, sort: list, skip: int, limit: int) -> tuple:
+    """skip ile sayfa (eski istemciler); sonraki sayfa için yine keyset imleci döndürür"""
+    docs = await collection.find(query, {"_id": 0}).sort(sort).skip(skip).limit(limit + 1).to_list(limit + 1)
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor([docs[-1].get(field) for field, _ in sort])
+    return docs, next_cursor
+
+# Müşteri listesi (user_id, name, id) indeksi üzerinden sıralanır
+CUSTOMER_SORT = [("name", 1), ("id", 1)]
+CUSTOMER_PAGE_MAX = 500
+CUSTOMER_STREAM_BATCH_SIZE = 500
+
+async def stream_customers(user_id: str, ndjson: bool):
+    """
+    Tüm müşterileri imleçten gruplar halinde okuyup JSON dizisi / NDJSON olarak üret.
+    Yanıt başlığı gönderildikten sonra hata verilemeyeceği için şemaya uymayan
+    (eski) kayıtlar loglanıp atlanır; dizi her zaman kapanır.
+    """
+    cursor = db.customers.find({"user_id": user_id}, {"_id": 0}).sort(CUSTOMER_SORT).batch_size(CUSTOMER_STREAM_BATCH_SIZE)
+    first = True
+    if not ndjson:
+        yield "["
+    async for doc in cursor:
+        try:
+            item = Customer.model_validate(doc).model_dump_json()
+        except ValidationError as e:
+            logger.warning(f"Geçersiz müşteri kaydı atlandı ({doc.get('id')}): {e.error_count()} hata")
+            continue
+        if ndjson:
+            yield item + "\n"
+        else:
+            yield item if first else "," + item
+        first = False
+    if not ndjson:
+        yield "]"
+
+@api_router.get("/customers")
+async def get_customers(
+    limit: Optional[int] = Query(None, ge=1, le=CUSTOMER_PAGE_MAX),
+    cursor: Optional[str] = None,
+    format: Optional[str] = Query(None, pattern="^(json|ndjson)$"),
+    current_user: dict = Depends(require_auth)
+):
+    """
+    Kullanıcının müşterilerini isim sırasıyla listele.
+    - limit (ve önceki yanıttaki next_cursor): {"customers", "next_cursor"} sayfası
+    - format=ndjson: tüm müşteriler, satır başına bir JSON (dışa aktarma)
+    - parametresiz: tüm müşteriler JSON dizisi olarak akıtılır (eski istemciler)
+    """
+    if limit is not None:
+        docs, next_cursor = await keyset_page(
+            db.customers, {"user_id": current_user["id"]}, CUSTOMER_SORT, limit, cursor, {"_id": 0}
+        )
+        return {
+            "customers": [Customer.model_validate(doc).model_dump(mode="json") for doc in docs],
+            "next_cursor": next_cursor
+        }
+    if cursor:
+        raise HTTPException(status_code=400, detail="cursor için limit gerekli")
+    
+    if format == "ndjson":
+        return StreamingResponse(
+            stream_customers(current_user["id"], ndjson=True),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": "attachment; filename=musteriler.ndjson"}
+        )
+    return StreamingResponse(stream_customers(current_user["id"], ndjson=False), media_type="application/json")
 
 # Download sample Excel template - MUST be before /{customer_id} route
 @api_router.get("/customers/template")
@@ -774,6 +1290,8 @@ async def create_customer(input: CustomerCreate, current_user: dict = Depends(re
     doc = customer_obj.model_dump()
     doc['created_at'] = doc['created_at'].isoformat()
     await db.customers.insert_one(doc)
+    await touch_report_versions(current_user["id"])
+    await touch_analytics(current_user["id"])
     return customer_obj
 
 @api_router.put("/customers/{customer_id}", response_model=Customer)
@@ -786,6 +1304,12 @@ async def update_customer(customer_id: str, input: CustomerUpdate, current_user:
     update_data = {k: v for k, v in input.model_dump().items() if v is not None}
     if update_data:
         await db.customers.update_one({"id": customer_id, "user_id": current_user["id"]}, {"$set": update_data})
+        await touch_report_versions(current_user["id"])
+        # Fiyat statüsü analizlerde gün bazında iskontolu/standart ayrımına girer
+        stat_days = []
+        if "price_status" in update_data and update_data["price_status"] != customer.get("price_status"):
+            stat_days = await customer_stat_days(current_user["id"], customer_id)
+        await touch_analytics(current_user["id"], *stat_days)
     
     updated = await db.customers.find_one({"id": customer_id, "user_id": current_user["id"]}, {"_id": 0})
     if isinstance(updated.get('created_at'), str):
@@ -800,13 +1324,23 @@ async def delete_customer(customer_id: str, current_user: dict = Depends(require
     if not customer:
         raise HTTPException(status_code=404, detail="Müşteri bulunamadı")
     
+    stat_days = await customer_stat_days(current_user["id"], customer_id)
     await db.customers.delete_one({"id": customer_id, "user_id": current_user["id"]})
     # Delete related visits and follow-ups (only user's data)
     await db.visits.delete_many({"customer_id": customer_id, "user_id": current_user["id"]})
     await db.follow_ups.delete_many({"customer_id": customer_id, "user_id": current_user["id"]})
+    await touch_report_versions(current_user["id"])
+    await touch_analytics(current_user["id"], *stat_days)
     return {"message": "Müşteri silindi"}
 
 # Follow-Up endpoints - FAZ 3.2: user_id filtresi eklendi
+async def mark_late_follow_ups(user_id: str, today: str):
+    """Vadesi geçmiş bekleyen takipleri tek sorguda "late" olarak işaretle"""
+    await db.follow_ups.update_many(
+        {"user_id": user_id, "status": "pending", "due_date": {"$lt": today}},
+        {"$set": {"status": "late"}}
+    )
+
 @api_router.get("/follow-ups")
 async def get_follow_ups(
     date: Optional[str] = None, 
@@ -823,15 +1357,11 @@ async def get_follow_ups(
     if status:
         query["status"] = status
     
-    follow_ups = await db.follow_ups.find(query, {"_id": 0}).to_list(1000)
-    
-    # Update late status for overdue follow-ups
+    # Update late status for overdue follow-ups (okumadan önce, tek yazma)
     today = datetime.now(timezone.utc).date().isoformat()
-    for fu in follow_ups:
-        if fu.get("status") == "pending" and fu.get("due_date") < today:
-            fu["status"] = "late"
-            await db.follow_ups.update_one({"id": fu["id"]}, {"$set": {"status": "late"}})
+    await mark_late_follow_ups(current_user["id"], today)
     
+    follow_ups = await db.follow_ups.find(query, {"_id": 0}).to_list(1000)
     return follow_ups
 
 @api_router.get("/follow-ups/today")
@@ -839,6 +1369,9 @@ async def get_today_follow_ups(current_user: dict = Depends(require_auth)):
     """Bugünkü ve gecikmiş takipleri getir"""
     today = datetime.now(timezone.utc).date().isoformat()
     
+    # Update late status
+    await mark_late_follow_ups(current_user["id"], today)
+    
     # Get today's and overdue follow-ups (only user's)
     follow_ups = await db.follow_ups.find({
         "user_id": current_user["id"],
@@ -848,21 +1381,22 @@ async def get_today_follow_ups(current_user: dict = Depends(require_auth)):
         ]
     }, {"_id": 0}).to_list(1000)
     
-    # Update late status
-    for fu in follow_ups:
-        if fu.get("status") == "pending" and fu.get("due_date") < today:
-            fu["status"] = "late"
-            await db.follow_ups.update_one({"id": fu["id"]}, {"$set": {"status": "late"}})
+    # Get customer info for all follow-ups in one query (only user's customers)
+    customer_ids = list({fu["customer_id"] for fu in follow_ups})
+    customers_by_id = {}
+    if customer_ids:
+        customers = await db.customers.find(
+            {"user_id": current_user["id"], "id": {"$in": customer_ids}},
+            {"_id": 0, "id": 1, "name": 1, "region": 1}
+        ).to_list(None)
+        customers_by_id = {c["id"]: c for c in customers}
     
-    # Get customer info for each follow-up (only user's customers)
-    result = []
     for fu in follow_ups:
-        customer = await db.customers.find_one({"id": fu["customer_id"], "user_id": current_user["id"]}, {"_id": 0})
+        customer = customers_by_id.get(fu["customer_id"])
         if customer:
             fu["customer"] = {"name": customer["name"], "region": customer["region"]}
-        result.append(fu)
     
-    return result
+    return follow_ups
 
 @api_router.get("/follow-ups/{follow_up_id}")
 async def get_follow_up(follow_up_id: str, current_user: dict = Depends(require_auth)):
@@ -884,6 +1418,7 @@ async def create_follow_up(input: FollowUpCreate, current_user: dict = Depends(r
     doc = fu_obj.model_dump()
     doc['created_at'] = doc['created_at'].isoformat()
     await db.follow_ups.insert_one(doc)
+    await touch_analytics(current_user["id"], input.due_date)
     return fu_obj
 
 @api_router.put("/follow-ups/{follow_up_id}")
@@ -901,6 +1436,7 @@ async def update_follow_up(follow_up_id: str, input: FollowUpUpdate, current_use
     
     if update_data:
         await db.follow_ups.update_one({"id": follow_up_id, "user_id": current_user["id"]}, {"$set": update_data})
+        await touch_analytics(current_user["id"], fu.get("due_date"), update_data.get("due_date"))
     
     updated = await db.follow_ups.find_one({"id": follow_up_id, "user_id": current_user["id"]}, {"_id": 0})
     return updated
@@ -914,6 +1450,7 @@ async def delete_follow_up(follow_up_id: str, current_user: dict = Depends(requi
         raise HTTPException(status_code=404, detail="Takip bulunamadı")
     
     await db.follow_ups.delete_one({"id": follow_up_id, "user_id": current_user["id"]})
+    await touch_analytics(current_user["id"], fu.get("due_date"))
     return {"message": "Takip silindi"}
 
 @api_router.post("/follow-ups/{follow_up_id}/complete")
@@ -927,6 +1464,7 @@ async def complete_follow_up(follow_up_id: str, current_user: dict = Depends(req
         {"id": follow_up_id, "user_id": current_user["id"]}, 
         {"$set": {"status": "done", "completed_at": datetime.now(timezone.utc).isoformat()}}
     )
+    await touch_analytics(current_user["id"], fu.get("due_date"))
     return {"message": "Takip tamamlandı"}
 
 # Get customers for today based on visit_days - FAZ 3.2: user_id filtresi eklendi
@@ -992,6 +1530,16 @@ async def get_visit(visit_id: str, current_user: dict = Depends(require_auth)):
         visit['completed_at'] = datetime.fromisoformat(visit['completed_at'])
     return visit
 
+def existing_visit_response(existing: dict) -> dict:
+    """Kayıtlı ziyareti Visit yanıtına hazırla"""
+    # Geriye uyumluluk: status alanı ekle
+    migrate_visit_status(existing)
+    if isinstance(existing.get('created_at'), str):
+        existing['created_at'] = datetime.fromisoformat(existing['created_at'])
+    if isinstance(existing.get('completed_at'), str):
+        existing['completed_at'] = datetime.fromisoformat(existing['completed_at'])
+    return existing
+
 @api_router.post("/visits", response_model=Visit)
 async def create_or_get_visit(customer_id: str, date: str, current_user: dict = Depends(require_auth)):
     """Ziyaret oluştur veya mevcut ziyareti getir"""
@@ -1001,19 +1549,10 @@ async def create_or_get_visit(customer_id: str, date: str, current_user: dict =
         raise HTTPException(status_code=404, detail="Müşteri bulunamadı")
     
     # Check if visit already exists for this user
-    existing = await db.visits.find_one({
-        "customer_id": customer_id, 
-        "date": date, 
-        "user_id": current_user["id"]
-    }, {"_id": 0})
+    query = {"customer_id": customer_id, "date": date, "user_id": current_user["id"]}
+    existing = await db.visits.find_one(query, {"_id": 0})
     if existing:
-        # Geriye uyumluluk: status alanı ekle
-        migrate_visit_status(existing)
-        if isinstance(existing.get('created_at'), str):
-            existing['created_at'] = datetime.fromisoformat(existing['created_at'])
-        if isinstance(existing.get('completed_at'), str):
-            existing['completed_at'] = datetime.fromisoformat(existing['completed_at'])
-        return existing
+        return existing_visit_response(existing)
     
     # Create new visit with status=pending
     visit_obj = Visit(customer_id=customer_id, date=date, user_id=current_user["id"], status="pending")
@@ -1021,7 +1560,13 @@ async def create_or_get_visit(customer_id: str, date: str, current_user: dict =
     doc['created_at'] = doc['created_at'].isoformat()
     if doc.get('completed_at'):
         doc['completed_at'] = doc['completed_at'].isoformat()
-    await db.visits.insert_one(doc)
+    try:
+        await db.visits.insert_one(doc)
+    except DuplicateKeyError:
+        # Aynı müşteri / gün için eşzamanlı ilk istek ziyareti oluşturdu
+        return existing_visit_response(await db.visits.find_one(query, {"_id": 0}))
+    await touch_report_versions(current_user["id"], date)
+    await touch_analytics(current_user["id"], date)
     return visit_obj
 
 @api_router.put("/visits/{visit_id}", response_model=Visit)
@@ -1072,6 +1617,8 @@ async def update_visit(visit_id: str, input: VisitUpdate, current_user: dict = D
     
     if update_data:
         await db.visits.update_one({"id": visit_id, "user_id": current_user["id"]}, {"$set": update_data})
+        await touch_report_versions(current_user["id"], visit.get("date"))
+        await touch_analytics(current_user["id"], visit.get("date"))
     
     updated = await db.visits.find_one({"id": visit_id, "user_id": current_user["id"]}, {"_id": 0})
     # Geriye uyumluluk: status alanı ekle
@@ -1133,6 +1680,7 @@ async def end_visit(visit_id: str, current_user: dict = Depends(require_auth)):
             "duration_minutes": duration
         }}
     )
+    await touch_analytics(current_user["id"], visit.get("date"))
     
     return {
         "message": "Ziyaret tamamlandı", 
@@ -1170,145 +1718,645 @@ async def save_daily_note(date: str, input: DailyReportNoteUpdate, current_user:
         doc['user_id'] = current_user["id"]
         doc['created_at'] = doc['created_at'].isoformat()
         await db.daily_notes.insert_one(doc)
+    await touch_report_versions(current_user["id"], date)
     return {"message": "Not kaydedildi", "date": date}
 
+# =============================================================================
+# Excel okuma - geçici dosya + read_only akış
+# =============================================================================
+# Yüklenen dosya önce diske yazılır, sonra openpyxl read_only modunda worker
+# thread'inde satır grupları halinde okunur. Hücre nesneleri hiçbir zaman
+# tamamı bellekte tutulmaz ve event loop parse sırasında bloklanmaz.
+EXCEL_READ_BATCH_SIZE = int(os.environ.get("EXCEL_READ_BATCH_SIZE", "1000"))
+EXCEL_SPOOL_CHUNK_BYTES = 1024 * 1024
+
+async def spool_upload(file: UploadFile, directory: Optional[Path] = None) -> str:
+    """Yüklenen dosyayı parça parça geçici dosyaya yaz ve yolunu döndür"""
+    fd, path = tempfile.mkstemp(prefix="upload_", suffix=".xlsx", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await file.read(EXCEL_SPOOL_CHUNK_BYTES)
+                if not chunk:
+                    break
+                out.write(chunk)
+    except Exception:
+        os.remove(path)
+        raise
+    return path
+
+class ExcelRowReader:
+    """
+    Aktif sayfanın satırlarını gruplar halinde okur.
+    Her grup [(satır_no, değerler), ...] biçimindedir; satırlar başlık
+    genişliğine tamamlanır (read_only modda sondaki boş hücreler gelmeyebilir).
+    """
+    
+    def __init__(self, path: str, batch_size: int = EXCEL_READ_BATCH_SIZE, start_row: int = 2):
+        self.path = path
+        self.batch_size = batch_size
+        self.start_row = start_row
+        self._workbook = None
+        self._rows = None
+        self._width = 0
+        # Başlık hariç satır sayısı; sayfa boyut bilgisi yoksa None
+        self.total_rows = None
+    
+    def _open(self) -> list:
+        self._workbook = load_workbook(filename=self.path, read_only=True)
+        ws = self._workbook.active
+        headers = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
+        self._width = len(headers)
+        if ws.max_row:
+            self.total_rows = max(ws.max_row - 1, 0)
+        self._rows = enumerate(ws.iter_rows(min_row=self.start_row, values_only=True), start=self.start_row)
+        return list(headers)
+    
+    def _next_batch(self) -> list:
+        batch = []
+        for row_idx, row in self._rows:
+            if len(row) < self._width:
+                row = tuple(row) + (None,) * (self._width - len(row))
+            batch.append((row_idx, row))
+            if len(batch) >= self.batch_size:
+                break
+        return batch
+    
+    async def open(self) -> list:
+        """Dosyayı aç ve başlık satırının değerlerini döndür"""
+        return await asyncio.to_thread(self._open)
+    
+    async def batches(self):
+        while True:
+            batch = await asyncio.to_thread(self._next_batch)
+            if not batch:
+                return
+            yield batch
+    
+    async def close(self):
+        if self._workbook is not None:
+            await asyncio.to_thread(self._workbook.close)
+            self._workbook = None
+
+# Map column names (Turkish to English)
+CUSTOMER_COLUMN_MAP = {
+    'müşteri adı': 'name',
+    'musteri adi': 'name',
+    'ad': 'name',
+    'isim': 'name',
+    'name': 'name',
+    'bölge': 'region',
+    'bolge': 'region',
+    'region': 'region',
+    'telefon': 'phone',
+    'tel': 'phone',
+    'phone': 'phone',
+    'adres': 'address',
+    'address': 'address',
+    'fiyat statüsü': 'price_status',
+    'fiyat statusu': 'price_status',
+    'fiyat': 'price_status',
+    'statü': 'price_status',
+    'price_status': 'price_status',
+    'ziyaret günleri': 'visit_days',
+    'ziyaret gunleri': 'visit_days',
+    'günler': 'visit_days',
+    'visit_days': 'visit_days',
+}
+
+def map_customer_columns(header_values: list) -> dict:
+    """Başlık satırından sütun indekslerini bul, zorunlu sütunları doğrula"""
+    headers = [str(value).strip().lower() if value else "" for value in header_values]
+    
+    # Find column indices
+    col_indices = {}
+    for i, header in enumerate(headers):
+        mapped = CUSTOMER_COLUMN_MAP.get(header)
+        if mapped:
+            col_indices[mapped] = i
+    
+    # Check required columns
+    if 'name' not in col_indices:
+        raise HTTPException(status_code=400, detail="'Müşteri Adı' sütunu bulunamadı")
+    if 'region' not in col_indices:
+        raise HTTPException(status_code=400, detail="'Bölge' sütunu bulunamadı")
+    return col_indices
+
+def parse_customer_row(row: tuple, col_indices: dict, user_id: str) -> dict:
+    """Excel satırını müşteri dokümanına çevir; ad veya bölge boşsa ValueError"""
+    name = str(row[col_indices['name']]).strip() if row[col_indices['name']] else ""
+    region = str(row[col_indices['region']]).strip() if row[col_indices['region']] else ""
+    
+    if not name or not region:
+        raise ValueError("Müşteri adı veya bölge boş")
+    
+    customer = {
+        "id": str(uuid.uuid4()),
+        "name": name,
+        "region": region,
+        "phone": str(row[col_indices.get('phone', -1)]).strip() if col_indices.get('phone') is not None and row[col_indices['phone']] else None,
+        "address": str(row[col_indices.get('address', -1)]).strip() if col_indices.get('address') is not None and row[col_indices['address']] else None,
+        "price_status": "Standart",
+        "visit_days": [],
+        "alerts": [],
+        "user_id": user_id,  # FAZ 3.2: user_id eklendi
+        "created_at": datetime.now(timezone.utc).isoformat()
+    }
+    
+    # Handle price_status
+    if 'price_status' in col_indices and row[col_indices['price_status']]:
+        ps = str(row[col_indices['price_status']]).strip()
+        ps_lower = ps.lower().replace('i̇', 'i').replace('İ', 'i')
+        if ps_lower in ['iskontolu', 'iskonto', 'indirimli', 'özel'] or ps == "İskontolu":
+            customer['price_status'] = "İskontolu"
+    
+    # Handle visit_days
+    if 'visit_days' in col_indices and row[col_indices['visit_days']]:
+        days_str = str(row[col_indices['visit_days']]).strip()
+        valid_days = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
+        customer['visit_days'] = [d.strip() for d in days_str.split(',') if d.strip() in valid_days]
+    
+    return customer
+
 # Excel Upload endpoint - FAZ 3.2: user_id filtresi eklendi
 @api_router.post("/customers/upload")
 async def upload_customers_excel(file: UploadFile = File(...), current_user: dict = Depends(require_auth)):
     """
-    Excel dosyasından toplu müşteri yükleme.
+    Excel dosyasından toplu müşteri yükleme (arka plan işi).
     Gerekli sütunlar: Müşteri Adı, Bölge
     Opsiyonel sütunlar: Telefon, Adres, Fiyat Statüsü, Ziyaret Günleri
+    Yanıttaki iş id'si ile /api/import/jobs/{job_id} sorgulanır.
     """
     if not file.filename.endswith(('.xlsx', '.xls')):
         raise HTTPException(status_code=400, detail="Sadece Excel dosyaları (.xlsx, .xls) kabul edilir")
     
+    return await start_import_job(file, "customers", current_user)
+
+async def import_customer_rows(job: dict, path: str, progress: dict) -> dict:
+    """Müşteri içe aktarma işi: satır grupları halinde yaz, her gruptan sonra ilerlemeyi kaydet"""
+    reader = ExcelRowReader(path, batch_size=IMPORT_BATCH_SIZE, start_row=progress["next_row"])
+    job_uuid = uuid.UUID(job["id"])
     try:
-        contents = await file.read()
-        wb = load_workbook(filename=io.BytesIO(contents))
-        ws = wb.active
-        
-        # Get headers from first row
-        headers = []
-        for cell in ws[1]:
-            headers.append(str(cell.value).strip().lower() if cell.value else "")
-        
-        # Map column names (Turkish to English)
-        column_map = {
-            'müşteri adı': 'name',
-            'musteri adi': 'name',
-            'ad': 'name',
-            'isim': 'name',
-            'name': 'name',
-            'bölge': 'region',
-            'bolge': 'region',
-            'region': 'region',
-            'telefon': 'phone',
-            'tel': 'phone',
-            'phone': 'phone',
-            'adres': 'address',
-            'address': 'address',
-            'fiyat statüsü': 'price_status',
-            'fiyat statusu': 'price_status',
-            'fiyat': 'price_status',
-            'statü': 'price_status',
-            'price_status': 'price_status',
-            'ziyaret günleri': 'visit_days',
-            'ziyaret gunleri': 'visit_days',
-            'günler': 'visit_days',
-            'visit_days': 'visit_days',
-        }
+        col_indices = map_customer_columns(await reader.open())
+        start_import_progress(progress, reader)
         
-        # Find column indices
-        col_indices = {}
-        for i, header in enumerate(headers):
-            mapped = column_map.get(header)
-            if mapped:
-                col_indices[mapped] = i
-        
-        # Check required columns
-        if 'name' not in col_indices:
-            raise HTTPException(status_code=400, detail="'Müşteri Adı' sütunu bulunamadı")
-        if 'region' not in col_indices:
-            raise HTTPException(status_code=400, detail="'Bölge' sütunu bulunamadı")
-        
-        customers_to_add = []
-        errors = []
-        row_num = 1
-        
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            row_num += 1
-            
-            # Skip empty rows
-            if not any(row):
-                continue
-            
-            name = str(row[col_indices['name']]).strip() if row[col_indices['name']] else ""
-            region = str(row[col_indices['region']]).strip() if row[col_indices['region']] else ""
-            
-            if not name or not region:
-                errors.append(f"Satır {row_num}: Müşteri adı veya bölge boş")
-                continue
-            
-            customer = {
-                "id": str(uuid.uuid4()),
-                "name": name,
-                "region": region,
-                "phone": str(row[col_indices.get('phone', -1)]).strip() if col_indices.get('phone') is not None and row[col_indices['phone']] else None,
-                "address": str(row[col_indices.get('address', -1)]).strip() if col_indices.get('address') is not None and row[col_indices['address']] else None,
-                "price_status": "Standart",
-                "visit_days": [],
-                "alerts": [],
-                "user_id": current_user["id"],  # FAZ 3.2: user_id eklendi
-                "created_at": datetime.now(timezone.utc).isoformat()
-            }
-            
-            # Handle price_status
-            if 'price_status' in col_indices and row[col_indices['price_status']]:
-                ps = str(row[col_indices['price_status']]).strip()
-                ps_lower = ps.lower().replace('i̇', 'i').replace('İ', 'i')
-                if ps_lower in ['iskontolu', 'iskonto', 'indirimli', 'özel'] or ps == "İskontolu":
-                    customer['price_status'] = "İskontolu"
-            
-            # Handle visit_days
-            if 'visit_days' in col_indices and row[col_indices['visit_days']]:
-                days_str = str(row[col_indices['visit_days']]).strip()
-                valid_days = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
-                customer['visit_days'] = [d.strip() for d in days_str.split(',') if d.strip() in valid_days]
+        async for batch in reader.batches():
+            operations = []
+            for row_num, row in batch:
+                # Skip empty rows
+                if not any(row):
+                    continue
+                try:
+                    customer = parse_customer_row(row, col_indices, job["user_id"])
+                except ValueError as e:
+                    progress["failed"] += 1
+                    if len(progress["errors"]) < 10:  # Return first 10 errors
+                        progress["errors"].append(f"Satır {row_num}: {e}")
+                    continue
+                # Satır başına sabit id: yarım kalan grup tekrar işlenirse kayıt çoğalmaz
+                customer["id"] = str(uuid.uuid5(job_uuid, f"row-{row_num}"))
+                operations.append(UpdateOne({"id": customer["id"]}, {"$setOnInsert": customer}, upsert=True))
             
-            customers_to_add.append(customer)
-        
-        if not customers_to_add:
-            raise HTTPException(status_code=400, detail="Yüklenecek geçerli müşteri bulunamadı")
-        
-        # Insert customers
-        await db.customers.insert_many(customers_to_add)
-        
-        return {
-            "message": f"{len(customers_to_add)} müşteri başarıyla yüklendi",
-            "added_count": len(customers_to_add),
-            "errors": errors[:10] if errors else []  # Return first 10 errors
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Dosya işlenirken hata: {str(e)}")
+            if operations:
+                result = await db.customers.bulk_write(operations, ordered=False)
+                # Tekrar işlenen grupta var olan kayıtlar eşleşir, yalnızca yeni eklenenler sayılır
+                progress["created"] += result.upserted_count
+                # Sonraki bir grup hata verse de yazılan müşteriler önbellekleri geçersiz kılar
+                await touch_report_versions(job["user_id"])
+                await touch_analytics(job["user_id"])
+            await save_import_progress(job, progress, batch)
+    finally:
+        await reader.close()
+    
+    added_count = progress["created"]
+    if not added_count:
+        raise HTTPException(status_code=400, detail="Yüklenecek geçerli müşteri bulunamadı")
+    
+    return {
+        "message": f"{added_count} müşteri başarıyla yüklendi",
+        "added_count": added_count,
+        "errors": progress["errors"]
+    }
 
 # Analytics endpoints - FAZ 3.2: user_id filtresi eklendi
-@api_router.get("/analytics/performance")
-async def get_performance_analytics(
-    period: str = "weekly", 
-    start_date: str = None, 
-    end_date: str = None,
-    current_user: dict = Depends(require_auth)
-):
+# =============================================================================
+# Günlük istatistik özetleri (daily_stats)
+# =============================================================================
+# Performans analizi ve dönem raporu ham ziyaret / takip / km / yakıt
+# kayıtlarını her istekte taramaz; her (user_id, date) için tek bir özet belge
+# okunur ve dönem toplamı bu belgelerin toplamıdır. Bir günü etkileyen her
+# yazma o günün belgesini kaynak koleksiyonlardan yeniden hesaplar
+# (refresh_daily_stats). Belgesi olmayan günler (özet tutulmadan önceki
+# veriler, DAILY_STATS_VERSION değişikliği) ilk okumada toplu doldurulur.
+#
+# Eşzamanlı hesaplamalar (iki yazma veya yazma + ilk okuma doldurması) sırası
+# karışık bitebilir. Her yazma günün revizyonunu (daily_stat_revisions) artırır;
+# özet, hesaplamaya başlarken okunan revizyonla (rev) yazılır ve daha yeni
+# revizyonlu bir belgenin üzerine yazılmaz. Okumada revizyonu geride kalan
+# günler (ör. artırma sonrası hesaplama yarım kaldıysa) yeniden hesaplanır.
+DAILY_STATS_VERSION = 1
+ANALYTICS_ISKONTOLU = "İskontolu"
+QUALITY_RATINGS = [1, 2, 3, 4, 5]
+# Özel tarih aralıklı analiz ve raporlarda izin verilen en uzun dönem (gün).
+# Eksik günlerin özeti okumada yazıldığı için sınırsız aralık tek istekte
+# binlerce belge oluşturabilir.
+REPORT_MAX_DAYS = int(os.environ.get("REPORT_MAX_DAYS", "366"))
+
+def _truthy_string(field: str) -> dict:
+    """Alan boş olmayan bir değer mi (Python'daki `if v.get(field)` karşılığı)"""
+    return {field: {"$nin": [None, ""]}}
+
+def parse_report_range(start: str, end: str) -> tuple:
     """
-    Get performance analytics for a given period.
-    period: 'weekly' or 'monthly'
+    İstemciden gelen dönemi (başlangıç, bitiş) tarihleri olarak doğrula.
+    Hatalı biçim, ters sıra veya REPORT_MAX_DAYS'i aşan aralık 400 döner.
     """
-    from datetime import timedelta
-    
+    try:
+        start_day = datetime.strptime(start, "%Y-%m-%d").date()
+        end_day = datetime.strptime(end, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Geçersiz tarih formatı (YYYY-MM-DD)")
+    if start_day > end_day:
+        raise HTTPException(status_code=400, detail="Başlangıç tarihi bitiş tarihinden sonra olamaz")
+    if (end_day - start_day).days + 1 > REPORT_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Tarih aralığı en fazla {REPORT_MAX_DAYS} gün olabilir")
+    return start_day, end_day
+
+def report_days(start: str, end: str) -> list:
+    """[start, end] aralığındaki günler (YYYY-MM-DD)"""
+    day = datetime.fromisoformat(start).date()
+    last_day = datetime.fromisoformat(end).date()
+    days = []
+    while day <= last_day:
+        days.append(day.isoformat())
+        day += timedelta(days=1)
+    return days
+
+def empty_daily_stats(user_id: str, day: str) -> dict:
+    """Kaydı olmayan bir günün özeti"""
+    empty_price = {"visits": 0, "completed": 0, "payment": 0}
+    return {
+        "user_id": user_id,
+        "date": day,
+        "v": DAILY_STATS_VERSION,
+        "visits": 0,
+        "visited": 0,
+        "not_visited": 0,
+        "completed": 0,
+        "payment_count": 0,
+        "payment_total": 0,
+        "payment_by_type": [],
+        "duration_count": 0,
+        "duration_sum": 0,
+        "short_visits": 0,
+        "long_visits": 0,
+        "quality_count": 0,
+        "quality_sum": 0,
+        "quality": [],
+        "visit_skip_reasons": [],
+        "payment_skip_reasons": [],
+        "price": {"iskontolu": dict(empty_price), "standart": dict(empty_price)},
+        "follow_ups_planned": 0,
+        "follow_ups_completed": 0,
+        "km": 0,
+        "fuel_cost": 0,
+    }
+
+async def aggregate_visit_days(user_id: str, days: list) -> dict:
+    """Verilen günlerin ziyaretlerinden gün bazında sayılar: {date: {...}}"""
+    completed = {"$cond": [{"$eq": ["$completed", True]}, 1, 0]}
+    collected = {"$eq": ["$payment_collected", True]}
+    payment = {"$cond": [collected, {"$ifNull": ["$payment_amount", 0]}, 0]}
+    has_duration = {"$ne": [{"$ifNull": ["$duration_minutes", None]}, None]}
+    has_quality = {"$ne": [{"$ifNull": ["$quality_rating", None]}, None]}
+    # migrate_visit_status ile aynı kural: status yoksa completed / visit_skip_reason'dan türet
+    status = {"$cond": [
+        {"$ne": [{"$ifNull": ["$status", None]}, None]},
+        "$status",
+        {"$cond": [
+            {"$eq": ["$completed", True]},
+            "visited",
+            {"$cond": [{"$in": [{"$ifNull": ["$visit_skip_reason", None]}, [None, ""]]}, "pending", "not_visited"]}
+        ]}
+    ]}
+    
+    pipeline = [
+        {"$match": {"user_id": user_id, "date": {"$in": days}}},
+        {"$addFields": {"_status": status}},
+        {"$facet": {
+            "totals": [{"$group": {
+                "_id": "$date",
+                "visits": {"$sum": 1},
+                "visited": {"$sum": {"$cond": [{"$eq": ["$_status", "visited"]}, 1, 0]}},
+                "not_visited": {"$sum": {"$cond": [{"$eq": ["$_status", "not_visited"]}, 1, 0]}},
+                "completed": {"$sum": completed},
+                "payment_count": {"$sum": {"$cond": [collected, 1, 0]}},
+                "payment_total": {"$sum": payment},
+                "duration_count": {"$sum": {"$cond": [has_duration, 1, 0]}},
+                "duration_sum": {"$sum": {"$cond": [has_duration, "$duration_minutes", 0]}},
+                "short_visits": {"$sum": {"$cond": [{"$and": [has_duration, {"$lt": ["$duration_minutes", 5]}]}, 1, 0]}},
+                "long_visits": {"$sum": {"$cond": [{"$and": [has_duration, {"$gt": ["$duration_minutes", 60]}]}, 1, 0]}},
+                "quality_count": {"$sum": {"$cond": [has_quality, 1, 0]}},
+                "quality_sum": {"$sum": {"$cond": [has_quality, "$quality_rating", 0]}}
+            }}],
+            "payment_by_type": [
+                {"$match": {"payment_collected": True}},
+                {"$group": {
+                    "_id": {"date": "$date", "type": {"$ifNull": ["$payment_type", "Diğer"]}},
+                    "amount": {"$sum": {"$ifNull": ["$payment_amount", 0]}}
+                }}
+            ],
+            "visit_skip_reasons": [
+                {"$match": {"completed": {"$ne": True}, **_truthy_string("visit_skip_reason")}},
+                {"$group": {"_id": {"date": "$date", "reason": "$visit_skip_reason"}, "count": {"$sum": 1}}}
+            ],
+            "payment_skip_reasons": [
+                {"$match": {"payment_collected": {"$ne": True}, **_truthy_string("payment_skip_reason")}},
+                {"$group": {"_id": {"date": "$date", "reason": "$payment_skip_reason"}, "count": {"$sum": 1}}}
+            ],
+            # Kalite dağılımı ve kalite-tahsilat ilişkisi için puan başına sayılar
+            "quality": [
+                {"$match": {"quality_rating": {"$in": QUALITY_RATINGS}}},
+                {"$group": {
+                    "_id": {"date": "$date", "rating": "$quality_rating"},
+                    "count": {"$sum": 1},
+                    "paid_count": {"$sum": {"$cond": [collected, 1, 0]}},
+                    "paid_sum": {"$sum": payment}
+                }}
+            ],
+            # Fiyat statüsü: önce gün + müşteri başına topla, sonra yalnızca
+            # farklı müşteriler için customers'a bak
+            "price": [
+                {"$group": {
+                    "_id": {"date": "$date", "customer_id": "$customer_id"},
+                    "visits": {"$sum": 1},
+                    "completed": {"$sum": completed},
+                    "payment": {"$sum": payment}
+                }},
+                {"$lookup": {"from": "customers", "localField": "_id.customer_id", "foreignField": "id", "as": "customer"}},
+                {"$group": {
+                    "_id": {
+                        "date": "$_id.date",
+                        "iskontolu": {"$eq": [{"$arrayElemAt": ["$customer.price_status", 0]}, ANALYTICS_ISKONTOLU]}
+                    },
+                    "visits": {"$sum": "$visits"},
+                    "completed": {"$sum": "$completed"},
+                    "payment": {"$sum": "$payment"}
+                }}
+            ]
+        }}
+    ]
+    facets = (await db.visits.aggregate(pipeline).to_list(1))[0]
+    
+    result = {}
+    for row in facets["totals"]:
+        stats = result[row.pop("_id")] = row
+        stats.update(payment_by_type=[], visit_skip_reasons=[], payment_skip_reasons=[], quality=[])
+        stats["price"] = {
+            "iskontolu": {"visits": 0, "completed": 0, "payment": 0},
+            "standart": {"visits": 0, "completed": 0, "payment": 0}
+        }
+    for row in facets["payment_by_type"]:
+        result[row["_id"]["date"]]["payment_by_type"].append({"type": row["_id"]["type"], "amount": row["amount"]})
+    for key in ("visit_skip_reasons", "payment_skip_reasons"):
+        for row in facets[key]:
+            result[row["_id"]["date"]][key].append({"reason": row["_id"]["reason"], "count": row["count"]})
+    for row in facets["quality"]:
+        result[row["_id"]["date"]]["quality"].append({
+            "rating": int(row["_id"]["rating"]),
+            "count": row["count"],
+            "paid_count": row["paid_count"],
+            "paid_sum": row["paid_sum"]
+        })
+    for row in facets["price"]:
+        bucket = "iskontolu" if row["_id"]["iskontolu"] else "standart"
+        result[row["_id"]["date"]]["price"][bucket] = {
+            "visits": row["visits"], "completed": row["completed"], "payment": row["payment"]
+        }
+    return result
+
+async def aggregate_follow_up_days(user_id: str, days: list) -> dict:
+    """Verilen günlerin takip sayıları: due_date -> {"planned", "completed"}"""
+    rows = await db.follow_ups.aggregate([
+        {"$match": {"user_id": user_id, "due_date": {"$in": days}}},
+        {"$group": {
+            "_id": "$due_date",
+            "planned": {"$sum": 1},
+            "completed": {"$sum": {"$cond": [{"$eq": ["$status", "done"]}, 1, 0]}}
+        }}
+    ]).to_list(None)
+    return {row["_id"]: {"planned": row["planned"], "completed": row["completed"]} for row in rows}
+
+async def aggregate_day_totals(collection, user_id: str, days: list, field: str) -> dict:
+    """Verilen günlerde bir alanın toplamı (günlük km, yakıt tutarı): {date: toplam}"""
+    rows = await collection.aggregate([
+        {"$match": {"user_id": user_id, "date": {"$in": days}}},
+        {"$group": {"_id": "$date", "total": {"$sum": {"$ifNull": [f"${field}", 0]}}}}
+    ]).to_list(None)
+    return {row["_id"]: row["total"] for row in rows}
+
+async def compute_daily_stats(user_id: str, days: list) -> list:
+    """Verilen günlerin özet belgelerini kaynak koleksiyonlardan hesapla"""
+    visit_days, follow_up_days, km_days, fuel_days = await asyncio.gather(
+        aggregate_visit_days(user_id, days),
+        aggregate_follow_up_days(user_id, days),
+        aggregate_day_totals(db.daily_km_records, user_id, days, "daily_km"),
+        aggregate_day_totals(db.fuel_records, user_id, days, "amount")
+    )
+    docs = []
+    for day in days:
+        doc = empty_daily_stats(user_id, day)
+        doc.update(visit_days.get(day, {}))
+        follow_ups = follow_up_days.get(day, {"planned": 0, "completed": 0})
+        doc["follow_ups_planned"] = follow_ups["planned"]
+        doc["follow_ups_completed"] = follow_ups["completed"]
+        doc["km"] = km_days.get(day, 0)
+        doc["fuel_cost"] = fuel_days.get(day, 0)
+        docs.append(doc)
+    return docs
+
+async def daily_stat_revisions(user_id: str, query: dict) -> dict:
+    """Kullanıcının günlük revizyonları: {date: rev}"""
+    rows = await db.daily_stat_revisions.find(
+        {"user_id": user_id, "date": query}, {"_id": 0, "date": 1, "rev": 1}
+    ).to_list(None)
+    return {row["date"]: row["rev"] for row in rows}
+
+def daily_stats_current(doc: dict, revisions: dict) -> bool:
+    """Özet, gününün son revizyonuyla mı hesaplanmış ({date: rev} sözlüğüne göre)"""
+    return doc.get("rev", 0) >= revisions.get(doc["date"], 0)
+
+async def store_daily_stats(user_id: str, days: list) -> list:
+    """
+    Günlerin özetini mevcut revizyonlarıyla hesaplayıp yaz. Daha yeni revizyonla
+    yazılmış bir belge korunur ve döndürülen listede o belge yer alır.
+    """
+    revisions = await daily_stat_revisions(user_id, {"$in": days})
+    docs = await compute_daily_stats(user_id, days)
+    for doc in docs:
+        doc["rev"] = revisions.get(doc["date"], 0)
+    try:
+        await db.daily_stats.bulk_write([
+            # rev'i büyük olan belge eşleşmez; upsert unique indekse takılır
+            ReplaceOne({"user_id": user_id, "date": doc["date"], "rev": {"$not": {"$gt": doc["rev"]}}}, doc, upsert=True)
+            for doc in docs
+        ], ordered=False)
+    except BulkWriteError as e:
+        superseded = []
+        for err in e.details.get("writeErrors", []):
+            if err.get("code") != 11000:
+                raise
+            superseded.append(docs[err["index"]]["date"])
+        newer = await db.daily_stats.find(
+            {"user_id": user_id, "date": {"$in": superseded}}, {"_id": 0}
+        ).to_list(None)
+        newer_by_day = {doc["date"]: doc for doc in newer}
+        docs = [newer_by_day.get(doc["date"], doc) for doc in docs]
+    return docs
+
+async def refresh_daily_stats(user_id: str, *dates: Optional[str]) -> list:
+    """
+    Kaynak kayıtları değişen günlerin revizyonunu artır, özetini yeniden
+    hesaplayıp yaz; yazılan belgeleri döndürür. Kaynak yazmadan sonra çağrılmalı.
+    """
+    days = sorted({d for d in dates if d})
+    if not days:
+        return []
+    await db.daily_stat_revisions.bulk_write([
+        UpdateOne({"user_id": user_id, "date": day}, {"$inc": {"rev": 1}}, upsert=True)
+        for day in days
+    ], ordered=False)
+    return await store_daily_stats(user_id, days)
+
+async def touch_analytics(user_id: str, *dates: Optional[str]):
+    """
+    Ziyaret / takip / müşteri yazmalarından sonra çağrılır: verilen günlerin
+    özetini yenile ve kullanıcının analiz önbelleği neslini artır.
+    """
+    await refresh_daily_stats(user_id, *dates)
+    await db.analytics_versions.update_one({"user_id": user_id}, {"$inc": {"rev": 1}}, upsert=True)
+
+async def customer_stat_days(user_id: str, customer_id: str) -> list:
+    """
+    Müşterinin ziyaret ve takiplerinin düştüğü günler. Fiyat statüsü değişen
+    veya silinen müşteri bu günlerin özetini etkiler; silmede günler kayıtlar
+    silinmeden önce toplanır.
+    """
+    visit_days, follow_up_days = await asyncio.gather(
+        db.visits.distinct("date", {"user_id": user_id, "customer_id": customer_id}),
+        db.follow_ups.distinct("due_date", {"user_id": user_id, "customer_id": customer_id})
+    )
+    return sorted(set(visit_days) | set(follow_up_days))
+
+async def load_daily_stats(user_id: str, start: str, end: str) -> list:
+    """[start, end] günlerinin özetleri, tarih sırasıyla; eksik veya eskimiş günler hesaplanıp yazılır"""
+    docs, revisions = await asyncio.gather(
+        db.daily_stats.find(
+            {"user_id": user_id, "date": {"$gte": start, "$lte": end}, "v": DAILY_STATS_VERSION},
+            {"_id": 0}
+        ).to_list(None),
+        daily_stat_revisions(user_id, {"$gte": start, "$lte": end})
+    )
+    docs = [doc for doc in docs if daily_stats_current(doc, revisions)]
+    found = {doc["date"] for doc in docs}
+    missing = [day for day in report_days(start, end) if day not in found]
+    if missing:
+        docs.extend(await store_daily_stats(user_id, missing))
+    docs.sort(key=lambda doc: doc["date"])
+    return docs
+
+def sum_daily_stats(docs: list) -> dict:
+    """Günlük özetlerin dönem toplamı; liste alanları sözlüğe çevrilir"""
+    keys = [
+        "visits", "visited", "not_visited", "completed", "payment_count", "payment_total",
+        "duration_count", "duration_sum", "short_visits", "long_visits", "quality_count", "quality_sum",
+        "follow_ups_planned", "follow_ups_completed", "km", "fuel_cost"
+    ]
+    total = {key: 0 for key in keys}
+    total.update(
+        working_days=0,
+        payment_by_type={},
+        visit_skip_reasons={},
+        payment_skip_reasons={},
+        quality={rating: {"count": 0, "paid_count": 0, "paid_sum": 0} for rating in QUALITY_RATINGS},
+        price={bucket: {"visits": 0, "completed": 0, "payment": 0} for bucket in ("iskontolu", "standart")}
+    )
+    for doc in docs:
+        for key in keys:
+            total[key] += doc[key]
+        if doc["visits"]:
+            total["working_days"] += 1
+        for row in doc["payment_by_type"]:
+            total["payment_by_type"][row["type"]] = total["payment_by_type"].get(row["type"], 0) + row["amount"]
+        for key in ("visit_skip_reasons", "payment_skip_reasons"):
+            for row in doc[key]:
+                total[key][row["reason"]] = total[key].get(row["reason"], 0) + row["count"]
+        for row in doc["quality"]:
+            bucket = total["quality"][row["rating"]]
+            for field in ("count", "paid_count", "paid_sum"):
+                bucket[field] += row[field]
+        for name, price in doc["price"].items():
+            for field in ("visits", "completed", "payment"):
+                total["price"][name][field] += price[field]
+    return total
+
+async def aggregate_customer_stats(user_id: str, start: str, end: str) -> dict:
+    """Fiyat statüsüne göre müşteri sayıları ve dönemde eklenen müşteriler"""
+    # created_at ISO metni olarak saklanır; [start, end] günleri = [start, end + 1 gün)
+    end_exclusive = (datetime.fromisoformat(end).date() + timedelta(days=1)).isoformat()
+    facets = (await db.customers.aggregate([
+        {"$match": {"user_id": user_id}},
+        {"$facet": {
+            "price_status": [
+                {"$group": {"_id": {"$eq": ["$price_status", ANALYTICS_ISKONTOLU]}, "count": {"$sum": 1}}}
+            ],
+            "new_customers": [
+                {"$match": {"created_at": {"$gte": start, "$lt": end_exclusive}}},
+                {"$project": {"_id": 0, "name": 1, "region": 1, "price_status": {"$ifNull": ["$price_status", "Standart"]}}}
+            ]
+        }}
+    ]).to_list(1))[0]
+    counts = {bool(row["_id"]): row["count"] for row in facets["price_status"]}
+    return {
+        "iskontolu_count": counts.get(True, 0),
+        "standart_count": counts.get(False, 0),
+        "new_customers": facets["new_customers"]
+    }
+
+# Performans analizi sonuç önbelleği: (user_id, nesil, dönem, başlangıç, bitiş).
+# Nesil analytics_versions'ta tutulur ve touch_analytics ile artar; eski
+# nesildeki kayıtlara bir daha bakılmaz, TTL ve LRU ile düşer.
+ANALYTICS_CACHE_TTL_SECONDS = float(os.environ.get("ANALYTICS_CACHE_TTL_SECONDS", "60"))
+ANALYTICS_CACHE_MAX_SIZE = int(os.environ.get("ANALYTICS_CACHE_MAX_SIZE", "2000"))
+
+analytics_cache = UserCache(ANALYTICS_CACHE_MAX_SIZE, ANALYTICS_CACHE_TTL_SECONDS)
+# Hesaplamaya harcanan ve önbellekten dönülerek kazanılan toplam süre
+analytics_cache_savings = {"compute_seconds": 0.0, "saved_seconds": 0.0}
+
+def build_daily_breakdown(start: str, end: str, follow_up_days: dict, daily_payment: dict) -> list:
+    """
+    Grafik için gün gün liste. Girdiler tarihe göre gruplanmış olduğundan
+    her gün tek sözlük erişimidir: maliyet O(gün + kayıt grubu), aralık
+    uzunluğu ile kayıt sayısının çarpımı değil.
+    """
+    daily_data = []
+    day = datetime.fromisoformat(start).date()
+    last_day = datetime.fromisoformat(end).date()
+    while day <= last_day:
+        date_str = day.isoformat()
+        day_followups = follow_up_days.get(date_str, {"planned": 0, "completed": 0})
+        daily_data.append({
+            "date": date_str,
+            "day": day.strftime("%a"),
+            "planned": day_followups["planned"],  # Planlanan = O günkü takipler
+            "completed": day_followups["completed"],  # Tamamlanan = O günkü tamamlanan takipler
+            "payment": daily_payment.get(date_str, 0)
+        })
+        day += timedelta(days=1)
+    return daily_data
+
+def resolve_analytics_period(period: str, start_date: Optional[str], end_date: Optional[str]) -> tuple:
+    """Analiz dönemini (start, end) YYYY-MM-DD olarak hesapla; verilen tarihler önceliklidir"""
     today = datetime.now(timezone.utc).date()
     
     if period == "weekly":
@@ -1333,149 +2381,75 @@ async def get_performance_analytics(
         start = start_date
     if end_date:
         end = end_date
+    start_day, end_day = parse_report_range(start, end)
+    return start_day.isoformat(), end_day.isoformat()
+
+@api_router.get("/analytics/performance")
+async def get_performance_analytics(
+    period: str = "weekly", 
+    start_date: str = None, 
+    end_date: str = None,
+    current_user: dict = Depends(require_auth)
+):
+    """
+    Get performance analytics for a given period.
+    period: 'weekly' or 'monthly'
+    """
+    start, end = resolve_analytics_period(period, start_date, end_date)
+    
+    # Aynı dönem kısa süre içinde tekrar istenirse (haftalık/aylık geçişleri)
+    # veri değişmediği sürece önceki sonuç döner
+    version = await db.analytics_versions.find_one({"user_id": current_user["id"]}, {"_id": 0, "rev": 1})
+    cache_key = (current_user["id"], version["rev"] if version else 0, period, start, end)
+    cached = analytics_cache.get(cache_key)
+    if cached is not None:
+        analytics_cache_savings["saved_seconds"] += cached["compute_seconds"]
+        return cached["result"]
+    
+    started = time.perf_counter()
+    result = await build_performance_analytics(current_user["id"], period, start, end)
+    elapsed = time.perf_counter() - started
+    analytics_cache_savings["compute_seconds"] += elapsed
+    analytics_cache.set(cache_key, {"result": result, "compute_seconds": elapsed})
+    return result
+
+async def build_performance_analytics(user_id: str, period: str, start: str, end: str) -> dict:
+    """Performans analizi yanıtını günlük özetlerden ve müşteri aggregation'ından hesapla"""
+    # Ziyaret / takip metrikleri günlük özetlerin toplamıdır
+    stats_docs, customer_stats = await asyncio.gather(
+        load_daily_stats(user_id, start, end),
+        aggregate_customer_stats(user_id, start, end)
+    )
+    summary = sum_daily_stats(stats_docs)
     
-    # Get all customers (only user's customers)
-    all_customers = await db.customers.find({"user_id": current_user["id"]}, {"_id": 0}).to_list(1000)
-    
-    # Get visits in date range (only user's visits)
-    visits = await db.visits.find({
-        "user_id": current_user["id"],
-        "date": {"$gte": start, "$lte": end}
-    }, {"_id": 0}).to_list(10000)
-    
-    # Get follow-ups in date range for planned visit calculation (only user's)
-    follow_ups = await db.follow_ups.find({
-        "user_id": current_user["id"],
-        "due_date": {"$gte": start, "$lte": end}
-    }, {"_id": 0}).to_list(10000)
-    
-    # Calculate metrics based on follow-ups
-    total_planned = len(follow_ups)  # Planlanan ziyaret = Toplam takip sayısı
-    total_completed = sum(1 for fu in follow_ups if fu.get("status") == "done")  # Tamamlanan takipler
-    
-    total_payment = 0
-    payment_count = 0
-    payment_skip_reasons = {}
-    visit_skip_reasons = {}
-    
-    end_dt = datetime.fromisoformat(end)
-    
-    # Process visits for payment data
-    visits_by_customer = {}
-    visit_completed_count = 0  # Ziyaret tamamlama sayısı (ödeme oranı için)
-    
-    # FAZ 2: Ziyaret süresi ve kalite metrikleri
-    duration_values = []
-    quality_values = []
-    quality_payment_data = []  # (kalite, tahsilat) tuple'ları
-    
-    for v in visits:
-        cid = v.get("customer_id")
-        if cid not in visits_by_customer:
-            visits_by_customer[cid] = []
-        visits_by_customer[cid].append(v)
-        
-        if v.get("completed"):
-            visit_completed_count += 1
-        elif v.get("visit_skip_reason"):
-            reason = v.get("visit_skip_reason", "Belirtilmemiş")
-            visit_skip_reasons[reason] = visit_skip_reasons.get(reason, 0) + 1
-        
-        if v.get("payment_collected"):
-            payment_count += 1
-            payment_amount = v.get("payment_amount", 0) or 0
-            total_payment += payment_amount
-            
-            # Kalite-Tahsilat ilişkisi için veri topla
-            if v.get("quality_rating"):
-                quality_payment_data.append((v.get("quality_rating"), payment_amount))
-        elif v.get("payment_skip_reason"):
-            reason = v.get("payment_skip_reason", "Belirtilmemiş")
-            payment_skip_reasons[reason] = payment_skip_reasons.get(reason, 0) + 1
-        
-        # FAZ 2: Süre ve kalite verilerini topla
-        if v.get("duration_minutes") is not None:
-            duration_values.append(v.get("duration_minutes"))
-        if v.get("quality_rating") is not None:
-            quality_values.append(v.get("quality_rating"))
+    total_planned = summary["follow_ups_planned"]  # Planlanan ziyaret = Toplam takip sayısı
+    total_completed = summary["follow_ups_completed"]  # Tamamlanan takipler
+    total_payment = summary["payment_total"]
+    payment_count = summary["payment_count"]
+    visit_completed_count = summary["completed"]  # Ziyaret tamamlama sayısı (ödeme oranı için)
     
     # FAZ 2: Süre analizi
-    avg_duration = round(sum(duration_values) / len(duration_values), 1) if duration_values else None
-    short_visits = len([d for d in duration_values if d < 5])  # <5 dakika
-    long_visits = len([d for d in duration_values if d > 60])  # >60 dakika
+    avg_duration = round(summary["duration_sum"] / summary["duration_count"], 1) if summary["duration_count"] else None
     
     # FAZ 2: Kalite analizi
-    avg_quality = round(sum(quality_values) / len(quality_values), 1) if quality_values else None
-    quality_distribution = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-    for q in quality_values:
-        if q in quality_distribution:
-            quality_distribution[q] += 1
-    
+    avg_quality = round(summary["quality_sum"] / summary["quality_count"], 1) if summary["quality_count"] else None
+    quality_distribution = {rating: summary["quality"][rating]["count"] for rating in QUALITY_RATINGS}
     # Kalite-Tahsilat ilişkisi (ortalama tahsilat her kalite seviyesi için)
-    quality_payment_relation = {}
-    for rating in range(1, 6):
-        payments = [p for (q, p) in quality_payment_data if q == rating]
-        if payments:
-            quality_payment_relation[rating] = round(sum(payments) / len(payments), 2)
-    
-    # New customers in period
-    new_customers = []
-    for c in all_customers:
-        created = c.get("created_at", "")
-        if isinstance(created, str):
-            created_date = created[:10]
-            if start <= created_date <= end:
-                new_customers.append(c)
-    
-    # Price status analysis
-    iskontolu_customers = [c for c in all_customers if c.get("price_status") == "İskontolu"]
-    standart_customers = [c for c in all_customers if c.get("price_status") != "İskontolu"]
-    
-    # Visits and payments by price status
-    iskontolu_visits = 0
-    iskontolu_completed = 0
-    iskontolu_payment = 0
-    standart_visits = 0
-    standart_completed = 0
-    standart_payment = 0
-    
-    customer_map = {c["id"]: c for c in all_customers}
-    for v in visits:
-        cid = v.get("customer_id")
-        customer = customer_map.get(cid, {})
-        is_iskontolu = customer.get("price_status") == "İskontolu"
-        
-        if is_iskontolu:
-            iskontolu_visits += 1
-            if v.get("completed"):
-                iskontolu_completed += 1
-            if v.get("payment_collected"):
-                iskontolu_payment += v.get("payment_amount", 0) or 0
-        else:
-            standart_visits += 1
-            if v.get("completed"):
-                standart_completed += 1
-            if v.get("payment_collected"):
-                standart_payment += v.get("payment_amount", 0) or 0
+    quality_payment_relation = {
+        rating: round(row["paid_sum"] / row["paid_count"], 2)
+        for rating, row in summary["quality"].items() if row["paid_count"]
+    }
+    
+    iskontolu = summary["price"]["iskontolu"]
+    standart = summary["price"]["standart"]
+    new_customers = customer_stats["new_customers"]
     
     # Daily breakdown for charts
-    daily_data = []
-    date_cursor = datetime.fromisoformat(start)
-    while date_cursor.date() <= end_dt.date():
-        date_str = date_cursor.date().isoformat()
-        day_visits = [v for v in visits if v.get("date") == date_str]
-        day_followups = [fu for fu in follow_ups if fu.get("due_date") == date_str]
-        completed_followups = sum(1 for fu in day_followups if fu.get("status") == "done")
-        payment = sum((v.get("payment_amount", 0) or 0) for v in day_visits if v.get("payment_collected"))
-        
-        daily_data.append({
-            "date": date_str,
-            "day": date_cursor.strftime("%a"),
-            "planned": len(day_followups),  # Planlanan = O günkü takipler
-            "completed": completed_followups,  # Tamamlanan = O günkü tamamlanan takipler
-            "payment": payment
-        })
-        date_cursor += timedelta(days=1)
+    daily_data = build_daily_breakdown(
+        start, end,
+        {doc["date"]: {"planned": doc["follow_ups_planned"], "completed": doc["follow_ups_completed"]} for doc in stats_docs},
+        {doc["date"]: doc["payment_total"] for doc in stats_docs}
+    )
     
     visit_rate = (total_completed / total_planned * 100) if total_planned > 0 else 0
     payment_rate = (payment_count / visit_completed_count * 100) if visit_completed_count > 0 else 0
@@ -1488,32 +2462,32 @@ async def get_performance_analytics(
             "total_planned": total_planned,
             "total_completed": total_completed,
             "visit_rate": round(visit_rate, 1),
-            "skip_reasons": visit_skip_reasons
+            "skip_reasons": summary["visit_skip_reasons"]
         },
         "payment_performance": {
             "total_amount": total_payment,
             "customer_count": payment_count,
             "payment_rate": round(payment_rate, 1),
-            "skip_reasons": payment_skip_reasons
+            "skip_reasons": summary["payment_skip_reasons"]
         },
         "customer_acquisition": {
             "new_count": len(new_customers),
-            "new_customers": [{"name": c["name"], "region": c["region"], "price_status": c.get("price_status", "Standart")} for c in new_customers]
+            "new_customers": new_customers
         },
         "price_analysis": {
             "iskontolu": {
-                "customer_count": len(iskontolu_customers),
-                "visit_count": iskontolu_visits,
-                "completed_count": iskontolu_completed,
-                "visit_rate": round((iskontolu_completed / iskontolu_visits * 100) if iskontolu_visits > 0 else 0, 1),
-                "total_payment": iskontolu_payment
+                "customer_count": customer_stats["iskontolu_count"],
+                "visit_count": iskontolu["visits"],
+                "completed_count": iskontolu["completed"],
+                "visit_rate": round((iskontolu["completed"] / iskontolu["visits"] * 100) if iskontolu["visits"] > 0 else 0, 1),
+                "total_payment": iskontolu["payment"]
             },
             "standart": {
-                "customer_count": len(standart_customers),
-                "visit_count": standart_visits,
-                "completed_count": standart_completed,
-                "visit_rate": round((standart_completed / standart_visits * 100) if standart_visits > 0 else 0, 1),
-                "total_payment": standart_payment
+                "customer_count": customer_stats["standart_count"],
+                "visit_count": standart["visits"],
+                "completed_count": standart["completed"],
+                "visit_rate": round((standart["completed"] / standart["visits"] * 100) if standart["visits"] > 0 else 0, 1),
+                "total_payment": standart["payment"]
             }
         },
         "daily_breakdown": daily_data,
@@ -1521,36 +2495,158 @@ async def get_performance_analytics(
         "visit_quality": {
             "duration": {
                 "average_minutes": avg_duration,
-                "total_measured": len(duration_values),
-                "short_visits": short_visits,  # <5 dakika
-                "long_visits": long_visits,  # >60 dakika
+                "total_measured": summary["duration_count"],
+                "short_visits": summary["short_visits"],  # <5 dakika
+                "long_visits": summary["long_visits"],  # >60 dakika
                 "warning_threshold": {"short": 5, "long": 60}
             },
             "rating": {
                 "average_rating": avg_quality,
-                "total_rated": len(quality_values),
+                "total_rated": summary["quality_count"],
                 "distribution": quality_distribution,
                 "quality_payment_relation": quality_payment_relation
             }
         }
     }
 
-# Seed sample data
-@api_router.post("/seed")
-async def seed_data():
-    # Check if data already exists
-    count = await db.customers.count_documents({})
-    if count > 0:
-        return {"message": "Veriler zaten mevcut", "customer_count": count}
-    
-    sample_customers = [
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Ahmet Yılmaz Market",
-            "region": "Kadıköy",
-            "phone": "0532 111 2233",
-            "address": "Caferağa Mah. Moda Cad. No:15",
-            "price_status": "İskontolu",
+# =============================================================================
+# Ekip analizi (yönetici)
+# =============================================================================
+# Yönetici tüm temsilcilerin dönem performansını tek istekte görür. Her
+# temsilci için get_performance_analytics çağırmak yerine daily_stats üzerinde
+# (user_id, date) indeksiyle tek bir aggregation çalışır; temsilci toplamları,
+# ekip toplamı ve günlük ekip trendi $facet ile paralel hesaplanır.
+TEAM_STAT_FIELDS = [
+    "visits", "visited", "not_visited", "completed", "payment_count", "payment_total",
+    "follow_ups_planned", "follow_ups_completed", "duration_count", "duration_sum",
+    "quality_count", "quality_sum", "km", "fuel_cost"
+]
+
+def team_stat_group(group_id) -> dict:
+    """TEAM_STAT_FIELDS toplamları ve çalışılan gün sayısı için $group aşaması"""
+    group = {"_id": group_id}
+    for field in TEAM_STAT_FIELDS:
+        group[field] = {"$sum": f"${field}"}
+    group["working_days"] = {"$sum": {"$cond": [{"$gt": ["$visits", 0]}, 1, 0]}}
+    return {"$group": group}
+
+def team_performance(totals: dict) -> dict:
+    """Toplamlardan oranlar ve ortalamalar (get_performance_analytics ile aynı formüller)"""
+    planned = totals["follow_ups_planned"]
+    return {
+        **{field: totals[field] for field in TEAM_STAT_FIELDS},
+        "working_days": totals["working_days"],
+        "visit_rate": round(totals["follow_ups_completed"] / planned * 100, 1) if planned else 0,
+        "payment_rate": round(totals["payment_count"] / totals["completed"] * 100, 1) if totals["completed"] else 0,
+        "average_minutes": round(totals["duration_sum"] / totals["duration_count"], 1) if totals["duration_count"] else None,
+        "average_rating": round(totals["quality_sum"] / totals["quality_count"], 1) if totals["quality_count"] else None,
+    }
+
+async def ensure_team_daily_stats(user_ids: list, start: str, end: str):
+    """
+    Dönemde özeti eksik veya revizyonu geride kalmış temsilcilerin günlerini
+    load_daily_stats ile yeniden hesapla. Yalnızca (user_id, date, rev) okunur.
+    """
+    day_count = len(report_days(start, end))
+    match = {"user_id": {"$in": user_ids}, "date": {"$gte": start, "$lte": end}}
+    stored, revision_rows = await asyncio.gather(
+        db.daily_stats.find(
+            {**match, "v": DAILY_STATS_VERSION}, {"_id": 0, "user_id": 1, "date": 1, "rev": 1}
+        ).to_list(None),
+        db.daily_stat_revisions.find(match, {"_id": 0, "user_id": 1, "date": 1, "rev": 1}).to_list(None)
+    )
+    revisions = {}
+    for row in revision_rows:
+        revisions.setdefault(row["user_id"], {})[row["date"]] = row["rev"]
+    current_days = {}
+    for doc in stored:
+        if daily_stats_current(doc, revisions.get(doc["user_id"], {})):
+            current_days[doc["user_id"]] = current_days.get(doc["user_id"], 0) + 1
+    complete = {user_id for user_id, days in current_days.items() if days >= day_count}
+    await asyncio.gather(*[
+        load_daily_stats(user_id, start, end) for user_id in user_ids if user_id not in complete
+    ])
+
+async def aggregate_team_stats(user_ids: list, start: str, end: str) -> dict:
+    """Temsilci başına toplamlar, ekip toplamı ve günlük ekip trendi"""
+    facets = (await db.daily_stats.aggregate([
+        {"$match": {"user_id": {"$in": user_ids}, "date": {"$gte": start, "$lte": end}, "v": DAILY_STATS_VERSION}},
+        {"$facet": {
+            "representatives": [team_stat_group("$user_id")],
+            "team": [team_stat_group(None)],
+            "daily": [
+                {"$group": {
+                    "_id": "$date",
+                    "visited": {"$sum": "$visited"},
+                    "planned": {"$sum": "$follow_ups_planned"},
+                    "completed": {"$sum": "$follow_ups_completed"},
+                    "payment": {"$sum": "$payment_total"},
+                    "active_representatives": {"$sum": {"$cond": [{"$gt": ["$visits", 0]}, 1, 0]}}
+                }},
+                {"$sort": {"_id": 1}}
+            ]
+        }}
+    ]).to_list(1))[0]
+    return {
+        "representatives": {row.pop("_id"): row for row in facets["representatives"]},
+        "team": facets["team"][0] if facets["team"] else None,
+        "daily": [{"date": row.pop("_id"), **row} for row in facets["daily"]]
+    }
+
+@api_router.get("/analytics/team")
+async def get_team_analytics(
+    period: str = "weekly",
+    start_date: str = None,
+    end_date: str = None,
+    current_user: dict = Depends(require_manager)
+):
+    """Yönetici için tüm temsilcilerin dönem performansı ve ekip toplamı"""
+    start, end = resolve_analytics_period(period, start_date, end_date)
+    
+    representatives = await db.users.find(
+        {"role": {"$nin": sorted(MANAGER_ROLES)}},
+        {"_id": 0, "id": 1, "name": 1, "email": 1}
+    ).sort("name", 1).to_list(None)
+    user_ids = [rep["id"] for rep in representatives]
+    
+    stats = {"representatives": {}, "team": None, "daily": []}
+    if user_ids:
+        await ensure_team_daily_stats(user_ids, start, end)
+        stats = await aggregate_team_stats(user_ids, start, end)
+    empty = dict.fromkeys(TEAM_STAT_FIELDS + ["working_days"], 0)
+    
+    rows = []
+    for rep in representatives:
+        totals = stats["representatives"].get(rep["id"], empty)
+        rows.append({"user_id": rep["id"], "name": rep["name"], "email": rep["email"], **team_performance(totals)})
+    rows.sort(key=lambda row: row["payment_total"], reverse=True)
+    
+    return {
+        "period": period,
+        "start_date": start,
+        "end_date": end,
+        "representative_count": len(rows),
+        "team": team_performance(stats["team"] or empty),
+        "representatives": rows,
+        "daily": stats["daily"]
+    }
+
+# Seed sample data
+@api_router.post("/seed")
+async def seed_data():
+    # Check if data already exists
+    count = await db.customers.count_documents({})
+    if count > 0:
+        return {"message": "Veriler zaten mevcut", "customer_count": count}
+    
+    sample_customers = [
+        {
+            "id": str(uuid.uuid4()),
+            "name": "Ahmet Yılmaz Market",
+            "region": "Kadıköy",
+            "phone": "0532 111 2233",
+            "address": "Caferağa Mah. Moda Cad. No:15",
+            "price_status": "İskontolu",
             "visit_days": ["Pazartesi", "Perşembe"],
             "created_at": datetime.now(timezone.utc).isoformat()
         },
@@ -1712,6 +2808,7 @@ async def update_vehicle(vehicle_id: str, input: VehicleUpdate, current_user: di
     
     if update_data:
         await db.vehicles.update_one({"id": vehicle_id}, {"$set": update_data})
+        await touch_report_versions(current_user["id"])
     
     updated = await db.vehicles.find_one({"id": vehicle_id}, {"_id": 0})
     return updated
@@ -1724,6 +2821,7 @@ async def delete_vehicle(vehicle_id: str, current_user: dict = Depends(require_a
     )
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Araç bulunamadı")
+    await touch_report_versions(current_user["id"])
     return {"message": "Araç silindi"}
 
 # ===== YAKIT KAYITLARI =====
@@ -1788,16 +2886,21 @@ async def create_fuel_record(input: FuelRecordCreate, current_user: dict = Depen
     )
     
     await db.fuel_records.insert_one(record.model_dump())
+    await touch_report_versions(current_user["id"], input.date)
+    await refresh_daily_stats(current_user["id"], input.date)
     return record.model_dump()
 
 @api_router.delete("/fuel-records/{record_id}")
 async def delete_fuel_record(record_id: str, current_user: dict = Depends(require_auth)):
     """Yakıt kaydını sil"""
-    result = await db.fuel_records.delete_one(
-        {"id": record_id, "user_id": current_user["id"]}
+    deleted = await db.fuel_records.find_one_and_delete(
+        {"id": record_id, "user_id": current_user["id"]},
+        {"_id": 0, "date": 1}
     )
-    if result.deleted_count == 0:
+    if not deleted:
         raise HTTPException(status_code=404, detail="Kayıt bulunamadı")
+    await touch_report_versions(current_user["id"], deleted.get("date"))
+    await refresh_daily_stats(current_user["id"], deleted.get("date"))
     return {"message": "Yakıt kaydı silindi"}
 
 # ===== GÜNLÜK KM TAKİBİ =====
@@ -1914,6 +3017,8 @@ async def create_or_update_daily_km(
             {"id": existing["id"]},
             {"$set": update_data}
         )
+        await touch_report_versions(current_user["id"], input.date)
+        await refresh_daily_stats(current_user["id"], input.date)
         updated = await db.daily_km_records.find_one({"id": existing["id"]}, {"_id": 0})
         return updated
     else:
@@ -1929,6 +3034,8 @@ async def create_or_update_daily_km(
             daily_cost=daily_cost
         )
         await db.daily_km_records.insert_one(record.model_dump())
+        await touch_report_versions(current_user["id"], input.date)
+        await refresh_daily_stats(current_user["id"], input.date)
         return record.model_dump()
 
 @api_router.put("/daily-km/{record_id}")
@@ -1967,6 +3074,8 @@ async def update_daily_km(
     
     if update_data:
         await db.daily_km_records.update_one({"id": record_id}, {"$set": update_data})
+        await touch_report_versions(current_user["id"], record.get("date"))
+        await refresh_daily_stats(current_user["id"], record.get("date"))
     
     updated = await db.daily_km_records.find_one({"id": record_id}, {"_id": 0})
     return updated
@@ -2018,11 +3127,174 @@ async def get_vehicle_stats(vehicle_id: str, current_user: dict = Depends(requir
         "fuel_record_count": len(fuel_records)
     }
 
+# =========================================================================
+# PDF Rapor Havuzu
+# =========================================================================
+# Çok sayfalı FPDF çizimi yüzlerce cell() çağrısıdır ve saf CPU işidir; GIL
+# nedeniyle thread yetmez, ayrı süreçlerde çalıştırılır. "spawn" ile başlatılan
+# worker'lar yalnızca pdf_reports modülünü yükler (veritabanı bağlantısı açmaz)
+# ve rapor fontlarını açılışta bir kez ayrıştırır.
+REPORT_WORKERS = int(os.environ.get("REPORT_WORKERS", "2"))
+REPORT_MAX_QUEUE = int(os.environ.get("REPORT_MAX_QUEUE", "16"))
+
+report_pool = BoundedExecutor(
+    "report",
+    lambda workers: ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=warm_up_fonts
+    ),
+    REPORT_WORKERS,
+    REPORT_MAX_QUEUE
+)
+
+# Rapor tablolarında kullanılan ziyaret alanları
+REPORT_VISIT_FIELDS = [
+    "status", "payment_collected", "payment_amount", "payment_skip_reason",
+    "customer_request", "note", "visit_skip_reason"
+]
+
+# Üretilen PDF'ler kullanıcı + rapor türü + dönem + sürüm damgası ile anahtarlanır.
+# Sık kullanılanlar bellekte tutulur, tümü diskte saklanır.
+REPORT_CACHE_DIR = Path(os.environ.get("REPORT_CACHE_DIR", str(ROOT_DIR / "report_cache")))
+REPORT_CACHE_MEMORY_BYTES = int(os.environ.get("REPORT_CACHE_MEMORY_BYTES", str(32 * 1024 * 1024)))
+REPORT_CACHE_MAX_AGE_DAYS = int(os.environ.get("REPORT_CACHE_MAX_AGE_DAYS", "7"))
+# Rapor çizimi değiştiğinde artırılır; eski önbellek kayıtları kullanılmaz
+REPORT_CACHE_FORMAT = 1
+
+class ReportCache:
+    """Üretilmiş PDF'ler için anahtar bazlı önbellek: bellekte LRU, diskte kalıcı"""
+    
+    def __init__(self, directory: Path, memory_limit_bytes: int):
+        self.directory = directory
+        self.memory_limit_bytes = memory_limit_bytes
+        self._memory = OrderedDict()  # key -> PDF baytları
+        self._memory_bytes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.writes = 0
+    
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pdf"
+    
+    def _remember(self, key: str, content: bytes):
+        if len(content) > self.memory_limit_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = content
+        self._memory_bytes += len(content)
+        while self._memory_bytes > self.memory_limit_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+    
+    def _write(self, key: str, content: bytes):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.directory / f".{key}.{uuid.uuid4().hex}.tmp"
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, self._path(key))
+    
+    async def get(self, key: str) -> Optional[bytes]:
+        content = self._memory.get(key)
+        if content is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return content
+        try:
+            content = await asyncio.to_thread(self._path(key).read_bytes)
+        except OSError:
+            self.misses += 1
+            return None
+        self.disk_hits += 1
+        self._remember(key, content)
+        return content
+    
+    async def put(self, key: str, content: bytes):
+        self._remember(key, content)
+        try:
+            await asyncio.to_thread(self._write, key, content)
+            self.writes += 1
+        except OSError as e:
+            logger.warning(f"Rapor önbelleğe yazılamadı: {e}")
+    
+    def prune(self, max_age_seconds: float) -> int:
+        """Süresi geçmiş (artık kimsenin istemediği sürümlere ait) dosyaları sil"""
+        if not self.directory.exists():
+            return 0
+        removed = 0
+        cutoff = time.time() - max_age_seconds
+        for entry in os.scandir(self.directory):
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+    
+    def stats(self) -> dict:
+        return {
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "writes": self.writes,
+        }
+
+report_cache = ReportCache(REPORT_CACHE_DIR, REPORT_CACHE_MEMORY_BYTES)
+
+def report_cache_key(current_user: dict, report_type: str, params: list, version: str) -> str:
+    """Rapor içeriğini belirleyen her şeyden türetilen anahtar (ETag olarak da kullanılır)"""
+    payload = [
+        REPORT_CACHE_FORMAT,
+        current_user["id"],
+        current_user.get("name"),
+        current_user.get("email"),
+        report_type,
+        params,
+        version
+    ]
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False).encode()).hexdigest()
+
+def etag_matches(if_none_match: Optional[str], cache_key: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return f'"{cache_key}"' in candidates or "*" in candidates
+
+def pdf_response(content: bytes, filename: str, cache_key: str) -> StreamingResponse:
+    return StreamingResponse(
+        io.BytesIO(content),
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "ETag": f'"{cache_key}"',
+            "Cache-Control": "private, no-cache"
+        }
+    )
+
+def pdf_not_modified_response(cache_key: str) -> Response:
+    report_cache.not_modified += 1
+    return Response(status_code=304, headers={"ETag": f'"{cache_key}"', "Cache-Control": "private, no-cache"})
+
+def _report_pair(customer: dict, visit: dict) -> tuple:
+    """Rapor snapshot'ı için (müşteri, ziyaret) çiftini sadeleştir"""
+    return (
+        {"name": customer["name"], "region": customer["region"]},
+        {k: visit[k] for k in REPORT_VISIT_FIELDS if k in visit}
+    )
+
 # PDF Report endpoint - Profesyonel, Kompakt, Tablo Bazlı Format
 @api_router.get("/report/pdf/{day_name}/{date}")
 async def generate_daily_report_pdf(
     day_name: str, 
     date: str,
+    if_none_match: Optional[str] = Header(None),
     current_user: dict = Depends(require_auth)
 ):
     """Generate professional daily visit report as PDF - compact table format"""
@@ -2030,6 +3302,17 @@ async def generate_daily_report_pdf(
     # Kullanıcı bilgisi al
     user_name = current_user.get("name", "Satış Temsilcisi")
     user_email = current_user.get("email", "")
+    filename = f"ziyaret_raporu_{date}.pdf"
+    
+    # Önbellek: sürüm damgası veriden önce okunur, böylece önbelleğe yazılan
+    # içerik hiçbir zaman damgasından eski olmaz
+    version = await get_report_version(current_user["id"], date, date)
+    cache_key = report_cache_key(current_user, "daily", [day_name, date], version)
+    if etag_matches(if_none_match, cache_key):
+        return pdf_not_modified_response(cache_key)
+    cached = await report_cache.get(cache_key)
+    if cached is not None:
+        return pdf_response(cached, filename, cache_key)
     
     # Get customers for this day (only user's customers)
     customers = await db.customers.find(
@@ -2065,21 +3348,6 @@ async def generate_daily_report_pdf(
     daily_note = await db.daily_notes.find_one({"date": date, "user_id": current_user["id"]}, {"_id": 0})
     daily_note_text = daily_note.get("note", "") if daily_note else ""
     
-    # Calculate stats
-    total_count = len(customers)
-    visited_count = len(visited_customers)
-    not_visited_count = len(not_visited_customers)
-    pending_count_stat = len(pending_customers)
-    visit_rate = round((visited_count / total_count * 100), 1) if total_count > 0 else 0
-    
-    # Calculate payment stats
-    total_payment = 0
-    payment_count = 0
-    for c, visit in visited_customers:
-        if visit.get("payment_collected"):
-            payment_count += 1
-            total_payment += visit.get("payment_amount", 0) or 0
-    
     # Get vehicle/km data
     daily_km_record = await db.daily_km_records.find_one(
         {"user_id": current_user["id"], "date": date},
@@ -2092,315 +3360,36 @@ async def generate_daily_report_pdf(
             {"_id": 0}
         )
     
-    # Create PDF
-    pdf = FPDF()
-    pdf.set_auto_page_break(auto=True, margin=15)
-    
-    # Add Unicode font for Turkish characters
-    pdf.add_font("DejaVu", "", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", uni=True)
-    pdf.add_font("DejaVu", "B", "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", uni=True)
-    
-    # =========================================================================
-    # SAYFA 1: YÖNETİCİ ÖZETİ
-    # =========================================================================
-    pdf.add_page()
-    
-    # Header
-    pdf.set_font("DejaVu", "B", 18)
-    pdf.set_text_color(15, 23, 42)
-    pdf.cell(0, 10, "GÜNLÜK ZİYARET RAPORU", ln=True, align="C")
-    
-    pdf.set_font("DejaVu", "", 12)
-    pdf.set_text_color(71, 85, 105)
-    pdf.cell(0, 7, f"{day_name}, {date}", ln=True, align="C")
-    
-    pdf.ln(3)
-    pdf.set_font("DejaVu", "B", 11)
-    pdf.set_text_color(0, 85, 255)
-    pdf.cell(0, 6, f"Satış Temsilcisi: {user_name}", ln=True, align="C")
-    if user_email:
-        pdf.set_font("DejaVu", "", 9)
-        pdf.set_text_color(100, 116, 139)
-        pdf.cell(0, 5, user_email, ln=True, align="C")
-    
-    pdf.ln(8)
-    
-    # Özet Kutusu
-    pdf.set_fill_color(248, 250, 252)
-    pdf.set_draw_color(226, 232, 240)
-    box_y = pdf.get_y()
-    pdf.rect(10, box_y, 190, 55, "DF")
-    
-    # Sol Kolon - Ziyaret Özeti
-    pdf.set_xy(15, box_y + 5)
-    pdf.set_font("DejaVu", "B", 11)
-    pdf.set_text_color(15, 23, 42)
-    pdf.cell(80, 6, "ZİYARET ÖZETİ")
-    
-    pdf.set_font("DejaVu", "", 10)
-    pdf.set_xy(15, box_y + 14)
-    pdf.set_text_color(71, 85, 105)
-    pdf.cell(50, 5, "Planlanan Ziyaret:")
-    pdf.set_font("DejaVu", "B", 10)
-    pdf.set_text_color(15, 23, 42)
-    pdf.cell(30, 5, str(total_count))
-    
-    pdf.set_font("DejaVu", "", 10)
-    pdf.set_xy(15, box_y + 22)
-    pdf.set_text_color(22, 163, 74)
-    pdf.cell(50, 5, "Ziyaret Edilen:")
-    pdf.set_font("DejaVu", "B", 10)
-    pdf.cell(30, 5, str(visited_count))
-    
-    pdf.set_font("DejaVu", "", 10)
-    pdf.set_xy(15, box_y + 30)
-    pdf.set_text_color(220, 38, 38)
-    pdf.cell(50, 5, "Ziyaret Edilmeyen:")
-    pdf.set_font("DejaVu", "B", 10)
-    pdf.cell(30, 5, str(not_visited_count))
-    
-    pdf.set_font("DejaVu", "", 10)
-    pdf.set_xy(15, box_y + 38)
-    pdf.set_text_color(100, 116, 139)
-    pdf.cell(50, 5, "Bekleyen:")
-    pdf.set_font("DejaVu", "B", 10)
-    pdf.set_text_color(15, 23, 42)
-    pdf.cell(30, 5, str(pending_count_stat))
-    
-    pdf.set_font("DejaVu", "B", 11)
-    pdf.set_xy(15, box_y + 46)
-    pdf.set_text_color(0, 85, 255)
-    pdf.cell(50, 5, "Ziyaret Oranı:")
-    pdf.cell(30, 5, f"%{visit_rate}")
-    
-    # Sağ Kolon - Tahsilat Özeti
-    pdf.set_xy(110, box_y + 5)
-    pdf.set_font("DejaVu", "B", 11)
-    pdf.set_text_color(15, 23, 42)
-    pdf.cell(80, 6, "TAHSİLAT ÖZETİ")
-    
-    pdf.set_font("DejaVu", "", 10)
-    pdf.set_xy(110, box_y + 14)
-    pdf.set_text_color(71, 85, 105)
-    pdf.cell(50, 5, "Tahsilat Yapılan:")
-    pdf.set_font("DejaVu", "B", 10)
-    pdf.set_text_color(22, 163, 74)
-    pdf.cell(30, 5, f"{payment_count} müşteri")
-    
-    pdf.set_font("DejaVu", "B", 12)
-    pdf.set_xy(110, box_y + 26)
-    pdf.set_text_color(0, 85, 255)
-    pdf.cell(50, 6, "Toplam Tahsilat:")
-    pdf.cell(40, 6, f"{total_payment:,.2f} TL")
-    
-    # Araç bilgisi (varsa)
-    if daily_km_record and vehicle:
-        pdf.set_font("DejaVu", "", 9)
-        pdf.set_xy(110, box_y + 38)
-        pdf.set_text_color(71, 85, 105)
-        daily_km = daily_km_record.get("daily_km")
-        daily_cost = daily_km_record.get("daily_cost")
-        pdf.cell(80, 5, f"Araç: {vehicle.get('name', '-')}")
-        if daily_km:
-            pdf.set_xy(110, box_y + 44)
-            pdf.cell(40, 5, f"Günlük: {daily_km:,.0f} km")
-            if daily_cost:
-                pdf.cell(40, 5, f"Maliyet: {daily_cost:,.2f} TL")
-    
-    pdf.set_y(box_y + 60)
-    
-    # Gün Sonu Notu (varsa)
-    if daily_note_text:
-        pdf.ln(5)
-        pdf.set_font("DejaVu", "B", 11)
-        pdf.set_text_color(113, 63, 18)
-        pdf.cell(0, 6, "GÜN SONU NOTU:", ln=True)
-        
-        pdf.set_fill_color(254, 252, 232)
-        pdf.set_draw_color(250, 204, 21)
-        note_y = pdf.get_y()
-        pdf.rect(10, note_y, 190, 20, "DF")
-        
-        pdf.set_font("DejaVu", "", 9)
-        pdf.set_text_color(113, 63, 18)
-        pdf.set_xy(15, note_y + 3)
-        pdf.multi_cell(180, 5, daily_note_text[:200])
-    
-    # =========================================================================
-    # SAYFA 2: ZİYARET EDİLENLER TABLOSU
-    # =========================================================================
-    if visited_customers:
-        pdf.add_page()
-        
-        pdf.set_font("DejaVu", "B", 14)
-        pdf.set_text_color(22, 163, 74)
-        pdf.cell(0, 10, f"ZİYARET EDİLEN MÜŞTERİLER ({len(visited_customers)})", ln=True)
-        pdf.ln(2)
-        
-        # Tablo başlığı
-        pdf.set_fill_color(220, 252, 231)
-        pdf.set_draw_color(134, 239, 172)
-        pdf.set_font("DejaVu", "B", 9)
-        pdf.set_text_color(22, 101, 52)
-        
-        pdf.cell(8, 8, "#", border=1, fill=True, align="C")
-        pdf.cell(52, 8, "Müşteri Adı", border=1, fill=True)
-        pdf.cell(28, 8, "Bölge", border=1, fill=True)
-        pdf.cell(35, 8, "Tahsilat", border=1, fill=True)
-        pdf.cell(67, 8, "Not / Talep", border=1, fill=True, ln=True)
-        
-        # Tablo satırları
-        pdf.set_font("DejaVu", "", 8)
-        for i, (customer, visit) in enumerate(visited_customers, 1):
-            # Sayfa kontrolü
-            if pdf.get_y() > 260:
-                pdf.add_page()
-                # Başlık tekrar
-                pdf.set_fill_color(220, 252, 231)
-                pdf.set_font("DejaVu", "B", 9)
-                pdf.set_text_color(22, 101, 52)
-                pdf.cell(8, 8, "#", border=1, fill=True, align="C")
-                pdf.cell(52, 8, "Müşteri Adı", border=1, fill=True)
-                pdf.cell(28, 8, "Bölge", border=1, fill=True)
-                pdf.cell(35, 8, "Tahsilat", border=1, fill=True)
-                pdf.cell(67, 8, "Not / Talep", border=1, fill=True, ln=True)
-                pdf.set_font("DejaVu", "", 8)
-            
-            pdf.set_fill_color(255, 255, 255)
-            pdf.set_text_color(15, 23, 42)
-            
-            pdf.cell(8, 7, str(i), border=1, align="C")
-            pdf.cell(52, 7, customer['name'][:28], border=1)
-            pdf.cell(28, 7, customer['region'][:15], border=1)
-            
-            # Tahsilat
-            if visit.get("payment_collected"):
-                amount = visit.get("payment_amount", 0) or 0
-                pdf.set_text_color(22, 163, 74)
-                pdf.cell(35, 7, f"{amount:,.0f} TL", border=1)
-            else:
-                pdf.set_text_color(234, 88, 12)
-                reason = visit.get("payment_skip_reason", "Yapılmadı")[:18]
-                pdf.cell(35, 7, reason, border=1)
-            
-            # Not
-            pdf.set_text_color(71, 85, 105)
-            note_text = visit.get("customer_request") or visit.get("note") or "-"
-            pdf.cell(67, 7, note_text[:35], border=1, ln=True)
-    
-    # =========================================================================
-    # SAYFA 3: ZİYARET EDİLMEYENLER TABLOSU
-    # =========================================================================
-    if not_visited_customers:
-        pdf.add_page()
-        
-        pdf.set_font("DejaVu", "B", 14)
-        pdf.set_text_color(220, 38, 38)
-        pdf.cell(0, 10, f"ZİYARET EDİLMEYEN MÜŞTERİLER ({len(not_visited_customers)})", ln=True)
-        pdf.ln(2)
-        
-        # Tablo başlığı
-        pdf.set_fill_color(254, 226, 226)
-        pdf.set_draw_color(252, 165, 165)
-        pdf.set_font("DejaVu", "B", 9)
-        pdf.set_text_color(153, 27, 27)
-        
-        pdf.cell(8, 8, "#", border=1, fill=True, align="C")
-        pdf.cell(60, 8, "Müşteri Adı", border=1, fill=True)
-        pdf.cell(35, 8, "Bölge", border=1, fill=True)
-        pdf.cell(87, 8, "Ziyaret Edilmeme Sebebi", border=1, fill=True, ln=True)
-        
-        # Tablo satırları
-        pdf.set_font("DejaVu", "", 8)
-        for i, (customer, visit) in enumerate(not_visited_customers, 1):
-            if pdf.get_y() > 260:
-                pdf.add_page()
-                pdf.set_fill_color(254, 226, 226)
-                pdf.set_font("DejaVu", "B", 9)
-                pdf.set_text_color(153, 27, 27)
-                pdf.cell(8, 8, "#", border=1, fill=True, align="C")
-                pdf.cell(60, 8, "Müşteri Adı", border=1, fill=True)
-                pdf.cell(35, 8, "Bölge", border=1, fill=True)
-                pdf.cell(87, 8, "Ziyaret Edilmeme Sebebi", border=1, fill=True, ln=True)
-                pdf.set_font("DejaVu", "", 8)
-            
-            pdf.set_fill_color(255, 255, 255)
-            pdf.set_text_color(15, 23, 42)
-            
-            pdf.cell(8, 7, str(i), border=1, align="C")
-            pdf.cell(60, 7, customer['name'][:32], border=1)
-            pdf.cell(35, 7, customer['region'][:18], border=1)
-            
-            pdf.set_text_color(220, 38, 38)
-            reason = visit.get("visit_skip_reason", "Belirtilmemiş")[:45]
-            pdf.cell(87, 7, reason, border=1, ln=True)
-    
-    # =========================================================================
-    # BEKLEYENLER (varsa kısa liste)
-    # =========================================================================
-    if pending_customers:
-        if pdf.get_y() > 200:
-            pdf.add_page()
-        else:
-            pdf.ln(10)
-        
-        pdf.set_font("DejaVu", "B", 12)
-        pdf.set_text_color(100, 116, 139)
-        pdf.cell(0, 8, f"BEKLEYEN MÜŞTERİLER ({len(pending_customers)})", ln=True)
-        
-        pdf.set_font("DejaVu", "", 8)
-        pdf.set_text_color(71, 85, 105)
-        
-        # Sadece isimlerini listele (kompakt)
-        pending_names = [c['name'][:25] for c, v in pending_customers]
-        pdf.multi_cell(0, 5, " • ".join(pending_names))
-    
-    # =========================================================================
-    # FOOTER
-    # =========================================================================
-    pdf.ln(10)
-    pdf.set_font("DejaVu", "", 7)
-    pdf.set_text_color(148, 163, 184)
-    report_date = datetime.now(timezone.utc).strftime('%d.%m.%Y %H:%M')
-    pdf.cell(0, 4, f"Rapor: {report_date} UTC | {user_name} | Satış Takip Sistemi", ln=True, align="C")
-    
-    # Output PDF
-    pdf_output = io.BytesIO()
-    pdf_content = pdf.output()
-    pdf_output.write(pdf_content)
-    pdf_output.seek(0)
-    
-    filename = f"ziyaret_raporu_{date}.pdf"
+    # PDF çizimi süreç havuzunda yapılır; yalnızca gereken alanlar gönderilir
+    report = {
+        "day_name": day_name,
+        "date": date,
+        "user_name": user_name,
+        "user_email": user_email,
+        "visited_customers": [_report_pair(c, v) for c, v in visited_customers],
+        "not_visited_customers": [_report_pair(c, v) for c, v in not_visited_customers],
+        "pending_customers": [_report_pair(c, v) for c, v in pending_customers],
+        "daily_note_text": daily_note_text,
+        "daily_km_record": {
+            "daily_km": daily_km_record.get("daily_km"),
+            "daily_cost": daily_km_record.get("daily_cost")
+        } if daily_km_record else None,
+        "vehicle": {"name": vehicle.get("name", "-")} if vehicle else None
+    }
+    pdf_content = await report_pool.run(render_daily_report, report)
+    await report_cache.put(cache_key, pdf_content)
     
-    return StreamingResponse(
-        pdf_output,
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f"attachment; filename={filename}"
-        }
-    )
+    return pdf_response(pdf_content, filename, cache_key)
 
 # =========================================================================
 # DÖNEM RAPORU - Haftalık/Aylık Özet PDF
 # =========================================================================
-@api_router.get("/report/pdf/period/{period_type}")
-async def generate_period_report_pdf(
-    period_type: str,  # "weekly" or "monthly"
-    start_date: str = None,  # Optional custom start date
-    end_date: str = None,    # Optional custom end date
-    current_user: dict = Depends(require_auth)
-):
-    """Generate weekly or monthly performance summary PDF report"""
-    
-    user_name = current_user.get("name", "Satış Temsilcisi")
-    user_email = current_user.get("email", "")
-    
-    # Calculate date range
+def resolve_report_period(period_type: str, start_date: Optional[str], end_date: Optional[str]) -> tuple:
+    """Rapor dönemini (başlangıç, bitiş) tarihleri olarak hesapla"""
     today = datetime.now(timezone.utc).date()
     
     if start_date and end_date:
-        period_start = datetime.strptime(start_date, "%Y-%m-%d").date()
-        period_end = datetime.strptime(end_date, "%Y-%m-%d").date()
+        period_start, period_end = parse_report_range(start_date, end_date)
     elif period_type == "weekly":
         # Current week (Monday to Sunday)
         days_since_monday = today.weekday()
@@ -2414,354 +3403,665 @@ async def generate_period_report_pdf(
             next_month = today.replace(month=today.month + 1, day=1)
         period_end = next_month - timedelta(days=1)
     
-    start_str = period_start.isoformat()
-    end_str = period_end.isoformat()
-    
-    # Get all visits in date range
-    visits = await db.visits.find({
-        "user_id": current_user["id"],
-        "date": {"$gte": start_str, "$lte": end_str}
-    }, {"_id": 0}).to_list(10000)
-    
-    # Apply migration for status
-    for v in visits:
-        migrate_visit_status(v)
-    
-    # Get all customers
-    customers = await db.customers.find({"user_id": current_user["id"]}, {"_id": 0}).to_list(1000)
-    
-    # Get daily KM records
-    daily_km_records = await db.daily_km_records.find({
-        "user_id": current_user["id"],
-        "date": {"$gte": start_str, "$lte": end_str}
-    }, {"_id": 0}).to_list(1000)
+    return period_start, period_end
+
+def period_report_filename(period_type: str, period_start) -> str:
+    period_label_file = "haftalik" if period_type == "weekly" else "aylik"
+    return f"performans_raporu_{period_label_file}_{period_start.strftime('%Y%m%d')}.pdf"
+
+async def period_report_cache_key(current_user: dict, period_type: str, start_str: str, end_str: str) -> str:
+    version = await get_report_version(current_user["id"], start_str, end_str)
+    return report_cache_key(current_user, "period", [period_type, start_str, end_str], version)
+
+async def build_period_report(current_user: dict, period_type: str, start_str: str, end_str: str) -> dict:
+    """Dönem raporunun çizimi için gereken özet verileri topla"""
+    user_name = current_user.get("name", "Satış Temsilcisi")
+    user_email = current_user.get("email", "")
     
-    # Get fuel records
-    fuel_records = await db.fuel_records.find({
-        "user_id": current_user["id"],
-        "date": {"$gte": start_str, "$lte": end_str}
-    }, {"_id": 0}).to_list(1000)
+    # Ziyaret, tahsilat, km ve yakıt toplamları günlük özetlerden gelir
+    stats_docs, customer_count = await asyncio.gather(
+        load_daily_stats(current_user["id"], start_str, end_str),
+        db.customers.count_documents({"user_id": current_user["id"]})
+    )
+    stats = sum_daily_stats(stats_docs)
     
     # Calculate statistics
-    total_visits = len(visits)
-    visited_count = sum(1 for v in visits if v.get("status") == "visited")
-    not_visited_count = sum(1 for v in visits if v.get("status") == "not_visited")
+    total_visits = stats["visits"]
+    visited_count = stats["visited"]
+    not_visited_count = stats["not_visited"]
     pending_count = total_visits - visited_count - not_visited_count
     visit_rate = round((visited_count / total_visits * 100), 1) if total_visits > 0 else 0
     
     # Payment stats
-    total_payment = 0
-    payment_count = 0
+    total_payment = stats["payment_total"]
+    payment_count = stats["payment_count"]
     payment_by_type = {"Nakit": 0, "Kredi Kartı": 0, "Havale/EFT": 0, "Çek": 0, "Diğer": 0}
-    
-    for v in visits:
-        if v.get("payment_collected"):
-            payment_count += 1
-            amount = v.get("payment_amount", 0) or 0
-            total_payment += amount
-            ptype = v.get("payment_type", "Diğer")
-            if ptype in payment_by_type:
-                payment_by_type[ptype] += amount
-            else:
-                payment_by_type["Diğer"] += amount
+    for ptype, amount in stats["payment_by_type"].items():
+        if ptype in payment_by_type:
+            payment_by_type[ptype] += amount
+        else:
+            payment_by_type["Diğer"] += amount
     
     # Working days (unique dates with visits)
-    unique_dates = set(v.get("date") for v in visits if v.get("date"))
-    working_days = len(unique_dates)
+    working_days = stats["working_days"]
     
     # Daily averages
     avg_daily_visits = round(visited_count / working_days, 1) if working_days > 0 else 0
     avg_daily_payment = round(total_payment / working_days, 2) if working_days > 0 else 0
     
     # Vehicle/Fuel stats
-    total_km = sum(r.get("daily_km", 0) or 0 for r in daily_km_records)
-    total_fuel_cost = sum(r.get("amount", 0) or 0 for r in fuel_records)
+    total_km = stats["km"]
+    total_fuel_cost = stats["fuel_cost"]
     avg_km_cost = round(total_fuel_cost / total_km, 3) if total_km > 0 else 0
     
-    # Daily data for charts
-    daily_data = {}
-    for v in visits:
-        date = v.get("date")
-        if date:
-            if date not in daily_data:
-                daily_data[date] = {"visited": 0, "not_visited": 0, "payment": 0}
-            if v.get("status") == "visited":
-                daily_data[date]["visited"] += 1
-            elif v.get("status") == "not_visited":
-                daily_data[date]["not_visited"] += 1
-            if v.get("payment_collected"):
-                daily_data[date]["payment"] += v.get("payment_amount", 0) or 0
-    
-    # Sort daily data by date
-    sorted_dates = sorted(daily_data.keys())
-    
-    # Create PDF
-    pdf = FPDF()
-    pdf.set_auto_page_break(auto=True, margin=15)
-    pdf.add_font("DejaVu", "", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", uni=True)
-    pdf.add_font("DejaVu", "B", "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", uni=True)
-    
-    # =========================================================================
-    # SAYFA 1: DÖNEM ÖZETİ
-    # =========================================================================
-    pdf.add_page()
-    
-    # Header
-    period_label = "HAFTALIK" if period_type == "weekly" else "AYLIK"
-    pdf.set_font("DejaVu", "B", 18)
-    pdf.set_text_color(15, 23, 42)
-    pdf.cell(0, 10, f"{period_label} PERFORMANS RAPORU", ln=True, align="C")
-    
-    pdf.set_font("DejaVu", "", 11)
-    pdf.set_text_color(71, 85, 105)
-    pdf.cell(0, 7, f"{period_start.strftime('%d.%m.%Y')} - {period_end.strftime('%d.%m.%Y')}", ln=True, align="C")
-    
-    pdf.ln(3)
-    pdf.set_font("DejaVu", "B", 11)
-    pdf.set_text_color(0, 85, 255)
-    pdf.cell(0, 6, f"Satış Temsilcisi: {user_name}", ln=True, align="C")
-    if user_email:
-        pdf.set_font("DejaVu", "", 9)
-        pdf.set_text_color(100, 116, 139)
-        pdf.cell(0, 5, user_email, ln=True, align="C")
-    
-    pdf.ln(8)
-    
-    # Çalışma Özeti
-    pdf.set_fill_color(248, 250, 252)
-    pdf.set_draw_color(226, 232, 240)
-    box_y = pdf.get_y()
-    pdf.rect(10, box_y, 190, 25, "DF")
-    
-    pdf.set_font("DejaVu", "B", 10)
-    pdf.set_text_color(15, 23, 42)
-    pdf.set_xy(15, box_y + 5)
-    pdf.cell(60, 6, f"Çalışılan Gün: {working_days}")
-    pdf.cell(60, 6, f"Toplam Müşteri: {len(customers)}")
-    pdf.cell(60, 6, f"Toplam Ziyaret Kaydı: {total_visits}")
-    
-    pdf.set_y(box_y + 30)
-    
-    # ===== ZİYARET PERFORMANSI =====
-    pdf.set_font("DejaVu", "B", 12)
-    pdf.set_text_color(22, 163, 74)
-    pdf.cell(0, 8, "ZİYARET PERFORMANSI", ln=True)
-    
-    pdf.set_fill_color(220, 252, 231)
-    pdf.set_draw_color(134, 239, 172)
-    box_y = pdf.get_y()
-    pdf.rect(10, box_y, 190, 40, "DF")
-    
-    pdf.set_font("DejaVu", "", 10)
-    pdf.set_text_color(22, 101, 52)
-    
-    pdf.set_xy(15, box_y + 5)
-    pdf.cell(60, 6, f"Ziyaret Edilen: {visited_count}")
-    pdf.cell(60, 6, f"Ziyaret Edilmeyen: {not_visited_count}")
-    pdf.cell(60, 6, f"Bekleyen: {pending_count}")
-    
-    pdf.set_xy(15, box_y + 14)
-    pdf.set_font("DejaVu", "B", 11)
-    pdf.cell(60, 6, f"Ziyaret Oranı: %{visit_rate}")
-    pdf.set_font("DejaVu", "", 10)
-    pdf.cell(60, 6, f"Günlük Ort. Ziyaret: {avg_daily_visits}")
-    
-    pdf.set_y(box_y + 45)
-    
-    # ===== TAHSİLAT PERFORMANSI =====
-    pdf.set_font("DejaVu", "B", 12)
-    pdf.set_text_color(0, 85, 255)
-    pdf.cell(0, 8, "TAHSİLAT PERFORMANSI", ln=True)
-    
-    pdf.set_fill_color(219, 234, 254)
-    pdf.set_draw_color(147, 197, 253)
-    box_y = pdf.get_y()
-    pdf.rect(10, box_y, 190, 50, "DF")
-    
-    pdf.set_font("DejaVu", "", 10)
-    pdf.set_text_color(30, 64, 175)
-    
-    pdf.set_xy(15, box_y + 5)
-    pdf.cell(90, 6, f"Tahsilat Yapılan Müşteri: {payment_count}")
-    pdf.cell(90, 6, f"Günlük Ort. Tahsilat: {avg_daily_payment:,.2f} TL")
-    
-    pdf.set_xy(15, box_y + 14)
-    pdf.set_font("DejaVu", "B", 14)
-    pdf.cell(0, 8, f"TOPLAM TAHSİLAT: {total_payment:,.2f} TL", ln=True)
-    
-    # Payment breakdown
-    pdf.set_font("DejaVu", "", 9)
-    pdf.set_xy(15, box_y + 28)
-    col_x = 15
-    for ptype, amount in payment_by_type.items():
-        if amount > 0:
-            pdf.set_xy(col_x, box_y + 28)
-            pdf.cell(45, 5, f"{ptype}: {amount:,.0f} TL")
-            col_x += 45
-            if col_x > 160:
-                col_x = 15
-                pdf.ln(6)
-    
-    pdf.set_y(box_y + 55)
-    
-    # ===== ARAÇ/YAKIT ÖZETİ =====
-    if total_km > 0 or total_fuel_cost > 0:
-        pdf.set_font("DejaVu", "B", 12)
-        pdf.set_text_color(113, 63, 18)
-        pdf.cell(0, 8, "ARAÇ / YAKIT ÖZETİ", ln=True)
-        
-        pdf.set_fill_color(254, 252, 232)
-        pdf.set_draw_color(250, 204, 21)
-        box_y = pdf.get_y()
-        pdf.rect(10, box_y, 190, 25, "DF")
-        
-        pdf.set_font("DejaVu", "", 10)
-        pdf.set_text_color(113, 63, 18)
-        
-        pdf.set_xy(15, box_y + 5)
-        pdf.cell(60, 6, f"Toplam KM: {total_km:,.0f} km")
-        pdf.cell(60, 6, f"Toplam Yakıt: {total_fuel_cost:,.2f} TL")
-        pdf.cell(60, 6, f"Ort. KM Maliyeti: {avg_km_cost:.3f} TL/km")
-        
-        pdf.set_y(box_y + 30)
+    # Daily data for charts (yalnızca ziyaret olan günler)
+    daily_data = {
+        doc["date"]: {"visited": doc["visited"], "not_visited": doc["not_visited"], "payment": doc["payment_total"]}
+        for doc in stats_docs if doc["visits"]
+    }
     
-    # =========================================================================
-    # SAYFA 2: GÜNLÜK DETAY TABLOSU
-    # =========================================================================
-    if sorted_dates:
-        pdf.add_page()
-        
-        pdf.set_font("DejaVu", "B", 14)
-        pdf.set_text_color(15, 23, 42)
-        pdf.cell(0, 10, "GÜNLÜK PERFORMANS DETAYI", ln=True)
-        pdf.ln(2)
-        
-        # Tablo başlığı
-        pdf.set_fill_color(241, 245, 249)
-        pdf.set_draw_color(203, 213, 225)
-        pdf.set_font("DejaVu", "B", 9)
-        pdf.set_text_color(15, 23, 42)
-        
-        pdf.cell(30, 8, "Tarih", border=1, fill=True, align="C")
-        pdf.cell(25, 8, "Gün", border=1, fill=True, align="C")
-        pdf.cell(30, 8, "Ziyaret", border=1, fill=True, align="C")
-        pdf.cell(30, 8, "Edilmedi", border=1, fill=True, align="C")
-        pdf.cell(35, 8, "Oran", border=1, fill=True, align="C")
-        pdf.cell(40, 8, "Tahsilat", border=1, fill=True, align="C", ln=True)
-        
-        # Türkçe gün isimleri
-        gun_isimleri = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
-        
-        pdf.set_font("DejaVu", "", 8)
-        for date_str in sorted_dates:
-            if pdf.get_y() > 260:
-                pdf.add_page()
-                pdf.set_fill_color(241, 245, 249)
-                pdf.set_font("DejaVu", "B", 9)
-                pdf.cell(30, 8, "Tarih", border=1, fill=True, align="C")
-                pdf.cell(25, 8, "Gün", border=1, fill=True, align="C")
-                pdf.cell(30, 8, "Ziyaret", border=1, fill=True, align="C")
-                pdf.cell(30, 8, "Edilmedi", border=1, fill=True, align="C")
-                pdf.cell(35, 8, "Oran", border=1, fill=True, align="C")
-                pdf.cell(40, 8, "Tahsilat", border=1, fill=True, align="C", ln=True)
-                pdf.set_font("DejaVu", "", 8)
-            
-            data = daily_data[date_str]
-            date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-            gun_adi = gun_isimleri[date_obj.weekday()]
-            
-            total_day = data["visited"] + data["not_visited"]
-            day_rate = round((data["visited"] / total_day * 100), 0) if total_day > 0 else 0
-            
-            pdf.set_fill_color(255, 255, 255)
-            pdf.set_text_color(15, 23, 42)
-            
-            pdf.cell(30, 7, date_obj.strftime("%d.%m"), border=1, align="C")
-            pdf.cell(25, 7, gun_adi[:3], border=1, align="C")
-            
-            pdf.set_text_color(22, 163, 74)
-            pdf.cell(30, 7, str(data["visited"]), border=1, align="C")
-            
-            pdf.set_text_color(220, 38, 38)
-            pdf.cell(30, 7, str(data["not_visited"]), border=1, align="C")
-            
-            pdf.set_text_color(0, 85, 255)
-            pdf.cell(35, 7, f"%{day_rate:.0f}", border=1, align="C")
-            
-            pdf.set_text_color(15, 23, 42)
-            pdf.cell(40, 7, f"{data['payment']:,.0f} TL", border=1, align="C", ln=True)
-        
-        # Toplam satırı
-        pdf.set_font("DejaVu", "B", 9)
-        pdf.set_fill_color(241, 245, 249)
-        pdf.cell(30, 8, "TOPLAM", border=1, fill=True, align="C")
-        pdf.cell(25, 8, f"{working_days} gün", border=1, fill=True, align="C")
-        pdf.set_text_color(22, 163, 74)
-        pdf.cell(30, 8, str(visited_count), border=1, fill=True, align="C")
-        pdf.set_text_color(220, 38, 38)
-        pdf.cell(30, 8, str(not_visited_count), border=1, fill=True, align="C")
-        pdf.set_text_color(0, 85, 255)
-        pdf.cell(35, 8, f"%{visit_rate}", border=1, fill=True, align="C")
-        pdf.set_text_color(15, 23, 42)
-        pdf.cell(40, 8, f"{total_payment:,.0f} TL", border=1, fill=True, align="C", ln=True)
-    
-    # Footer
-    pdf.ln(10)
-    pdf.set_font("DejaVu", "", 7)
-    pdf.set_text_color(148, 163, 184)
-    report_date = datetime.now(timezone.utc).strftime('%d.%m.%Y %H:%M')
-    pdf.cell(0, 4, f"Rapor: {report_date} UTC | {user_name} | Satış Takip Sistemi", ln=True, align="C")
-    
-    # Output PDF
-    pdf_output = io.BytesIO()
-    pdf_content = pdf.output()
-    pdf_output.write(pdf_content)
-    pdf_output.seek(0)
+    report = {
+        "period_type": period_type,
+        "start_date": start_str,
+        "end_date": end_str,
+        "user_name": user_name,
+        "user_email": user_email,
+        "working_days": working_days,
+        "customer_count": customer_count,
+        "total_visits": total_visits,
+        "visited_count": visited_count,
+        "not_visited_count": not_visited_count,
+        "pending_count": pending_count,
+        "visit_rate": visit_rate,
+        "avg_daily_visits": avg_daily_visits,
+        "total_payment": total_payment,
+        "payment_count": payment_count,
+        "payment_by_type": payment_by_type,
+        "avg_daily_payment": avg_daily_payment,
+        "total_km": total_km,
+        "total_fuel_cost": total_fuel_cost,
+        "avg_km_cost": avg_km_cost,
+        "daily_data": daily_data
+    }
+    return report
+
+async def load_period_report_pdf(current_user: dict, period_type: str, start_str: str, end_str: str, cache_key: str) -> bytes:
+    """Dönem raporu PDF'i: önbellekte varsa oradan, yoksa üretip önbelleğe yaz"""
+    cached = await report_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    report = await build_period_report(current_user, period_type, start_str, end_str)
+    pdf_content = await report_pool.run(render_period_report, report)
+    await report_cache.put(cache_key, pdf_content)
+    return pdf_content
+
+@api_router.get("/report/pdf/period/{period_type}")
+async def generate_period_report_pdf(
+    period_type: str,  # "weekly" or "monthly"
+    start_date: str = None,  # Optional custom start date
+    end_date: str = None,    # Optional custom end date
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(require_auth)
+):
+    """Generate weekly or monthly performance summary PDF report"""
+    period_start, period_end = resolve_report_period(period_type, start_date, end_date)
+    start_str = period_start.isoformat()
+    end_str = period_end.isoformat()
+    filename = period_report_filename(period_type, period_start)
     
-    period_label_file = "haftalik" if period_type == "weekly" else "aylik"
-    filename = f"performans_raporu_{period_label_file}_{period_start.strftime('%Y%m%d')}.pdf"
+    cache_key = await period_report_cache_key(current_user, period_type, start_str, end_str)
+    if etag_matches(if_none_match, cache_key):
+        return pdf_not_modified_response(cache_key)
     
-    return StreamingResponse(
-        pdf_output,
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f"attachment; filename={filename}"
-        }
-    )
+    pdf_content = await load_period_report_pdf(current_user, period_type, start_str, end_str, cache_key)
+    return pdf_response(pdf_content, filename, cache_key)
+
+# =========================================================================
+# RAPOR İŞLERİ - Büyük raporlar için arka plan üretimi
+# =========================================================================
+# İstemci işi gönderir, iş id'si ile durumu sorgular ve hazır olunca indirir.
+# Böylece render süresince HTTP bağlantısı açık tutulmaz.
+REPORT_JOB_WORKERS = int(os.environ.get("REPORT_JOB_WORKERS", "2"))
+REPORT_JOB_TTL_HOURS = int(os.environ.get("REPORT_JOB_TTL_HOURS", "24"))
+REPORT_JOB_STALE_SECONDS = int(os.environ.get("REPORT_JOB_STALE_SECONDS", "600"))
+
+report_jobs = JobRunner(
+    "report",
+    "report_jobs",
+    workers=REPORT_JOB_WORKERS,
+    ttl_seconds=REPORT_JOB_TTL_HOURS * 3600,
+    stale_seconds=REPORT_JOB_STALE_SECONDS
+)
+
+class ReportJobCreate(BaseModel):
+    period_type: str  # "weekly" or "monthly"
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+
+async def run_period_report_job(job: dict) -> dict:
+    params = job["params"]
+    user = await load_user(job["user_id"])
+    if not user:
+        raise HTTPException(status_code=404, detail="Kullanıcı bulunamadı")
+    cache_key = await period_report_cache_key(user, params["period_type"], params["start_date"], params["end_date"])
+    pdf_content = await load_period_report_pdf(user, params["period_type"], params["start_date"], params["end_date"], cache_key)
+    return {"cache_key": cache_key, "filename": params["filename"], "size": len(pdf_content)}
+
+report_jobs.register("period_pdf", run_period_report_job)
+
+def report_job_response(job: dict) -> dict:
+    response = {
+        "id": job["id"],
+        "type": job["type"],
+        "status": job["status"],
+        "params": job["params"],
+        "error": job.get("error"),
+        "created_at": job["created_at"],
+        "started_at": job.get("started_at"),
+        "finished_at": job.get("finished_at"),
+        "queue_position": report_jobs.queue_position(job["id"]) if job["status"] == "queued" else None,
+        "download_url": None
+    }
+    if job["status"] == "done":
+        response["download_url"] = f"/api/report/jobs/{job['id']}/download"
+    return response
+
+@api_router.post("/report/jobs")
+async def create_report_job(input: ReportJobCreate, current_user: dict = Depends(require_auth)):
+    """Dönem raporu üretimini arka planda başlat"""
+    if input.period_type not in ("weekly", "monthly"):
+        raise HTTPException(status_code=400, detail="Geçersiz dönem tipi")
+    period_start, period_end = resolve_report_period(input.period_type, input.start_date, input.end_date)
+    
+    job = await report_jobs.submit(current_user["id"], "period_pdf", {
+        "period_type": input.period_type,
+        "start_date": period_start.isoformat(),
+        "end_date": period_end.isoformat(),
+        "filename": period_report_filename(input.period_type, period_start)
+    })
+    return report_job_response(job)
+
+@api_router.get("/report/jobs/{job_id}")
+async def get_report_job(job_id: str, current_user: dict = Depends(require_auth)):
+    job = await report_jobs.get(job_id, current_user["id"])
+    if not job:
+        raise HTTPException(status_code=404, detail="İş bulunamadı")
+    return report_job_response(job)
+
+@api_router.get("/report/jobs/{job_id}/download")
+async def download_report_job(
+    job_id: str,
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(require_auth)
+):
+    job = await report_jobs.get(job_id, current_user["id"])
+    if not job:
+        raise HTTPException(status_code=404, detail="İş bulunamadı")
+    if job["status"] != "done":
+        raise HTTPException(status_code=409, detail="Rapor henüz hazır değil")
+    
+    params = job["params"]
+    cache_key = job["result"]["cache_key"]
+    if etag_matches(if_none_match, cache_key):
+        return pdf_not_modified_response(cache_key)
+    pdf_content = await report_cache.get(cache_key)
+    if pdf_content is None:
+        # Önbellekten düşmüşse güncel veriyle yeniden üret
+        cache_key = await period_report_cache_key(current_user, params["period_type"], params["start_date"], params["end_date"])
+        pdf_content = await load_period_report_pdf(current_user, params["period_type"], params["start_date"], params["end_date"], cache_key)
+    return pdf_response(pdf_content, params["filename"], cache_key)
 
 # =============================================================================
 # FAZ 5: Ürün Kataloğu Endpoint'leri
 # =============================================================================
 
+# ===== Görsel Yükleme =====
+# Yüklemeler event loop dışında, sınırlı bir thread havuzunda paralel çalışır.
+# IMAGE_UPLOAD_TIMEOUT_SECONDS depolama istemcisinin soket zaman aşımıdır
+# (bağlantı ve her okuma için ayrı ayrı); toplam yükleme süresine üst sınır
+# koymaz, ancak takılan bağlantıda thread'i ve havuz yerini gerçekten serbest
+# bırakır. Depolamanın döndürdüğü hatalar yeniden denenir; zaman aşımı
+# denenmez, çünkü istek karşı tarafa ulaşmış ve görsel kaydedilmiş olabilir.
+IMAGE_UPLOAD_CONCURRENCY = int(os.environ.get("IMAGE_UPLOAD_CONCURRENCY", "8"))
+IMAGE_UPLOAD_TIMEOUT_SECONDS = float(os.environ.get("IMAGE_UPLOAD_TIMEOUT_SECONDS", "60"))
+IMAGE_UPLOAD_RETRIES = int(os.environ.get("IMAGE_UPLOAD_RETRIES", "2"))
+
+image_upload_pool = BoundedExecutor(
+    "image_upload",
+    lambda workers: ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-upload"),
+    concurrency=IMAGE_UPLOAD_CONCURRENCY
+)
+
+# ===== Görsel Varyantları =====
+# Liste ekranları tam çözünürlüklü görsel yerine küçük WebP/JPEG varyantları
+# kullanır. Varyantlar yükleme sırasında ayrı süreçlerde üretilir (Pillow
+# kodlaması CPU işidir), orijinalle aynı depolamaya yazılır ve image_assets
+# koleksiyonunda orijinal URL ile eşlenir.
+IMAGE_VARIANT_WORKERS = int(os.environ.get("IMAGE_VARIANT_WORKERS", "2"))
+
+image_variant_pool = BoundedExecutor(
+    "image_variant",
+    lambda workers: ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn")
+    ),
+    IMAGE_VARIANT_WORKERS
+)
+
+# ===== Görsel Depolama =====
+# IMAGE_STORAGE=cloudinary (varsayılan) veya local. Yerel depolama dosyaları
+# içerik hash'i ile adlandırır ve /api/media altından uzun ömürlü önbellek
+# başlıklarıyla sunar; çevrimdışı çalışma ve yük testleri için kullanılır.
+IMAGE_STORAGE = os.environ.get("IMAGE_STORAGE", "cloudinary")
+LOCAL_IMAGE_DIR = Path(os.environ.get("LOCAL_IMAGE_DIR", str(ROOT_DIR / "media")))
+# Görsel URL'lerinin öneki; frontend farklı bir adresteyse backend'in dış adresi verilmeli
+LOCAL_IMAGE_BASE_URL = os.environ.get("LOCAL_IMAGE_BASE_URL", "/api/media").rstrip("/")
+
+class ImageStorage(ABC):
+    """Görsel depolama arayüzü. save() bloklayan bir çağrıdır, havuzda çalıştırılır."""
+    
+    name = "base"
+    
+    @abstractmethod
+    def save(self, contents: bytes, folder: str, timeout: Optional[float] = None) -> dict:
+        """
+        Görseli kaydet ve {"url", "public_id"} döndür. Ağ üzerinden çalışan
+        depolamalar `timeout`u soket (bağlantı / okuma) zaman aşımı olarak
+        uygular ve zaman aşımını TimeoutError olarak bildirir.
+        """
+
+def is_timeout_error(error: Optional[BaseException]) -> bool:
+    """
+    Hata zincirinde zaman aşımı var mı: urllib3 TimeoutError (MaxRetryError.reason
+    içinde de gelebilir) veya ham socket.timeout (Python 3.10+ TimeoutError).
+    """
+    import urllib3.exceptions
+    
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, (TimeoutError, urllib3.exceptions.TimeoutError)):
+            return True
+        reason = getattr(error, "reason", None)
+        error = reason if isinstance(reason, BaseException) else (error.__cause__ or error.__context__)
+    return False
+
+class CloudinaryStorage(ImageStorage):
+    name = "cloudinary"
+    
+    def save(self, contents: bytes, folder: str, timeout: Optional[float] = None) -> dict:
+        import cloudinary.exceptions
+        import cloudinary.uploader
+        
+        try:
+            result = cloudinary.uploader.upload(contents, folder=folder, resource_type="image", timeout=timeout)
+        except cloudinary.exceptions.Error as e:
+            # Ağ hataları cloudinary.Error içine sarılarak gelir ("Unexpected error" / "Socket error")
+            if is_timeout_error(e.__context__):
+                raise TimeoutError("Yükleme zaman aşımına uğradı") from e
+            raise
+        return {"url": result.get("secure_url"), "public_id": result.get("public_id")}
+
+IMAGE_SIGNATURES = [
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+]
+
+def image_extension(contents: bytes) -> str:
+    for signature, extension in IMAGE_SIGNATURES:
+        if contents.startswith(signature):
+            return extension
+    if contents[:4] == b"RIFF" and contents[8:12] == b"WEBP":
+        return ".webp"
+    return ".img"
+
+class LocalImageStorage(ImageStorage):
+    """Dosya sistemi depolaması: aynı içerik aynı dosya adını alır, tekrar yazılmaz"""
+    
+    name = "local"
+    
+    def __init__(self, root: Path, base_url: str):
+        self.root = root
+        self.base_url = base_url
+    
+    def save(self, contents: bytes, folder: str, timeout: Optional[float] = None) -> dict:
+        digest = hashlib.sha256(contents).hexdigest()
+        relative = f"{folder}/{digest[:2]}/{digest}{image_extension(contents)}"
+        path = self.root / relative
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+            tmp_path.write_bytes(contents)
+            os.replace(tmp_path, path)
+        return {"url": f"{self.base_url}/{relative}", "public_id": relative}
+    
+    def resolve(self, relative: str) -> Optional[Path]:
+        """URL yolunu dosya yoluna çevir; kök dizin dışına çıkan yollar için None"""
+        root = self.root.resolve()
+        path = (root / relative).resolve()
+        if root not in path.parents or not path.is_file():
+            return None
+        return path
+
+def create_image_storage() -> ImageStorage:
+    if IMAGE_STORAGE == "local":
+        return LocalImageStorage(LOCAL_IMAGE_DIR, LOCAL_IMAGE_BASE_URL)
+    return CloudinaryStorage()
+
+# Testlerde ve benchmark'ta sahte bir depolama ile değiştirilebilir
+image_storage = create_image_storage()
+
+@api_router.get("/media/{relative_path:path}")
+async def get_local_image(relative_path: str):
+    """Yerel depolamadaki görseli sun (içerik hash'li adlar değişmez, süresiz önbelleklenebilir)"""
+    if not isinstance(image_storage, LocalImageStorage):
+        raise HTTPException(status_code=404, detail="Görsel bulunamadı")
+    path = image_storage.resolve(relative_path)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Görsel bulunamadı")
+    return FileResponse(path, headers={"Cache-Control": "public, max-age=31536000, immutable"})
+
+async def upload_image(contents: bytes, folder: str) -> dict:
+    """Tek görseli havuzda yükle; depolama hatasında yeniden dene (zaman aşımında denenmez)"""
+    last_error = None
+    for attempt in range(IMAGE_UPLOAD_RETRIES + 1):
+        if attempt:
+            await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+        try:
+            return await image_upload_pool.run(
+                image_storage.save, contents, folder, timeout=IMAGE_UPLOAD_TIMEOUT_SECONDS
+            )
+        except (TimeoutError, HTTPException):
+            # Zaman aşımı: yükleme karşı tarafta tamamlanmış olabilir (çift kayıt riski)
+            # HTTPException: havuz dolu, tekrar denemek yükü artırır
+            raise
+        except Exception as e:
+            last_error = e
+        logger.warning(f"Görsel yüklenemedi (deneme {attempt + 1}/{IMAGE_UPLOAD_RETRIES + 1}): {last_error}")
+    raise last_error
+
+async def create_image_variants(contents: bytes, folder: str) -> dict:
+    """
+    Görselin varyantlarını üret ve depolamaya yükle; algısal hash'i de hesapla.
+    {"variants": [{"size", "format", "width", "height", "url"}, ...], "dhash"}
+    döndürür. Pillow'un açamadığı dosyalarda veya yükleme hatasında varyant
+    listesi boş döner; ürün listesi bu durumda orijinal görsele geri düşer.
+    """
+    if image_extension(contents) == ".img":
+        return {"variants": [], "dhash": None}
+    try:
+        processed = await image_variant_pool.run(process_image, contents)
+        rendered = processed["variants"]
+        uploads = await asyncio.gather(*(
+            upload_image(variant["content"], f"{folder}/variants") for variant in rendered
+        ))
+    except Exception as e:
+        logger.warning(f"Görsel varyantları üretilemedi: {e}")
+        return {"variants": [], "dhash": None}
+    variants = [
+        {
+            "size": variant["size"],
+            "format": variant["format"],
+            "width": variant["width"],
+            "height": variant["height"],
+            "url": upload["url"]
+        }
+        for variant, upload in zip(rendered, uploads)
+    ]
+    return {"variants": variants, "dhash": processed["dhash"]}
+
+async def store_image(contents: bytes, folder: str) -> dict:
+    """Orijinali yükle ve varyantlarını eşzamanlı üret: {"url", "public_id", "variants", "dhash"}"""
+    upload, processed = await asyncio.gather(
+        upload_image(contents, folder),
+        create_image_variants(contents, folder)
+    )
+    return {**upload, **processed}
+
+async def save_image_assets(user_id: str, uploads: list):
+    """
+    Yüklenen görselleri image_assets'e tek bulk_write ile yaz.
+    Kayıtlar içerik özeti (sha256) ile anahtarlanır; aynı içerik eşzamanlı
+    iki istekte yüklenirse ilk yazılan kayıt kalır.
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    operations = [
+        UpdateOne(
+            {"user_id": user_id, "sha256": upload["sha256"]},
+            {"$setOnInsert": {
+                "id": str(uuid.uuid4()),
+                "url": upload["url"],
+                "public_id": upload.get("public_id"),
+                "variants": upload["variants"],
+                "dhash": upload.get("dhash"),
+                "size": upload.get("size"),
+                "created_at": now
+            }},
+            upsert=True
+        )
+        for upload in uploads
+    ]
+    if not operations:
+        return
+    try:
+        await db.image_assets.bulk_write(operations, ordered=False)
+    except BulkWriteError as e:
+        # Yalnızca eşzamanlı yüklemelerde görülür; görsel yüklendi, kaydı diğer istekte
+        logger.warning(f"Görsel kayıtları kısmen yazılamadı: {len(e.details.get('writeErrors', []))} hata")
+
+# ===== Tekrarlanan Görseller =====
+# Aynı fotoğraf klasörleri tekrar tekrar yüklenir. Dosyalar depolamaya
+# gönderilmeden önce SHA-256 ile özetlenip image_assets'te aranır; daha önce
+# yüklenmiş içerik tekrar gönderilmez, mevcut URL (ve varyantları) kullanılır.
+# dHash her yüklemede varyantlarla birlikte hesaplanıp kaydedilir. IMAGE_PHASH
+# açıksa yeniden kodlanmış / küçültülmüş kopyalar da yüklemeden önce dHash
+# eşitliğiyle yakalanır; bunun için her yeni dosyanın önceden çözülmesi gerekir.
+IMAGE_PHASH = os.environ.get("IMAGE_PHASH", "false").lower() in ("1", "true", "yes")
+
+image_dedup_stats = {"checked": 0, "duplicates": 0, "near_duplicates": 0, "bytes_saved": 0}
+
+def hash_upload(file: UploadFile) -> tuple:
+    """Dosyayı parça parça okuyup (sha256, boyut) döndür ve başa sar (bloklayan, thread'de çalışır)"""
+    digest = hashlib.sha256()
+    size = 0
+    file.file.seek(0)
+    for chunk in iter(lambda: file.file.read(1024 * 1024), b""):
+        digest.update(chunk)
+        size += len(chunk)
+    file.file.seek(0)
+    return digest.hexdigest(), size
+
+async def find_image_assets(user_id: str, field: str, values: list) -> dict:
+    """image_assets kayıtlarını tek $in sorgusuyla bul: değer -> kayıt"""
+    values = list({v for v in values if v})
+    if not values:
+        return {}
+    assets = await db.image_assets.find(
+        {"user_id": user_id, field: {"$in": values}},
+        {"_id": 0, "url": 1, "public_id": 1, "variants": 1, "sha256": 1, "dhash": 1}
+    ).to_list(None)
+    return {asset[field]: asset for asset in assets}
+
+async def upload_dhashes(files: List[UploadFile]) -> list:
+    """Dosyaların dHash'lerini hesapla; çözülemeyen dosyalar için None"""
+    slots = asyncio.Semaphore(IMAGE_UPLOAD_CONCURRENCY)
+    
+    async def dhash(file: UploadFile) -> Optional[str]:
+        async with slots:
+            contents = await file.read()
+            await file.seek(0)
+            if image_extension(contents) == ".img":
+                return None
+            try:
+                return await image_variant_pool.run(difference_hash, contents)
+            except Exception as e:
+                logger.warning(f"Görsel hash'i hesaplanamadı ({file.filename}): {e}")
+                return None
+    
+    return await asyncio.gather(*(dhash(file) for file in files))
+
+async def upload_new_images(user_id: str, files: List[UploadFile], folder: str) -> list:
+    """
+    Dosyaları yükle; daha önce yüklenmiş içerik depolamaya tekrar gönderilmez.
+    Aynı istekteki kopyalar da bir kez yüklenir. Sonuçlar dosya sırasıyla
+    döner: {"url", "public_id", "variants", "duplicate"} veya exception.
+    """
+    hashes = await asyncio.gather(*(asyncio.to_thread(hash_upload, file) for file in files))
+    known = await find_image_assets(user_id, "sha256", [digest for digest, _ in hashes])
+    
+    # İçerik başına ilk dosya yüklenir
+    first_by_digest = {}
+    for file, (digest, _) in zip(files, hashes):
+        if digest not in known:
+            first_by_digest.setdefault(digest, file)
+    
+    dhashes = {}
+    if IMAGE_PHASH and first_by_digest:
+        dhashes = dict(zip(first_by_digest, await upload_dhashes(list(first_by_digest.values()))))
+        near = await find_image_assets(user_id, "dhash", list(dhashes.values()))
+        for digest, dhash in dhashes.items():
+            if dhash in near:
+                known[digest] = near[dhash]
+                image_dedup_stats["near_duplicates"] += 1
+                del first_by_digest[digest]
+    
+    sizes = {digest: size for digest, size in hashes}
+    uploads = dict(zip(first_by_digest, await upload_images(list(first_by_digest.values()), folder)))
+    await save_image_assets(user_id, [
+        {**upload, "sha256": digest, "dhash": upload.get("dhash") or dhashes.get(digest), "size": sizes[digest]}
+        for digest, upload in uploads.items()
+        if not isinstance(upload, Exception)
+    ])
+    
+    results = []
+    for file, (digest, size) in zip(files, hashes):
+        image_dedup_stats["checked"] += 1
+        if digest in uploads and first_by_digest[digest] is file:
+            upload = uploads[digest]
+            results.append(upload if isinstance(upload, Exception) else {**upload, "duplicate": False})
+            continue
+        source = known.get(digest) or uploads[digest]
+        if isinstance(source, Exception):
+            results.append(source)
+            continue
+        image_dedup_stats["duplicates"] += 1
+        image_dedup_stats["bytes_saved"] += size
+        results.append({
+            "url": source["url"],
+            "public_id": source.get("public_id"),
+            "variants": source.get("variants") or [],
+            "duplicate": True
+        })
+    return results
+
+async def image_variant_docs(user_id: str, urls: List[str]) -> list:
+    """Ürün görsel URL'leri için image_variants alt belgelerini (images sırasıyla) döndür"""
+    if not urls:
+        return []
+    assets = await db.image_assets.find(
+        {"user_id": user_id, "url": {"$in": list(set(urls))}},
+        {"_id": 0, "url": 1, "variants": 1}
+    ).to_list(None)
+    variants_by_url = {asset["url"]: asset["variants"] for asset in assets}
+    return [{"url": url, "variants": variants_by_url[url]} for url in urls if url in variants_by_url]
+
+def product_thumbnail(product: dict) -> Optional[dict]:
+    """İlk görselin liste küçük resmi: {"url", "webp", "width", "height"} veya None"""
+    images = product.get("images") or []
+    if not images:
+        return None
+    for entry in product.get("image_variants") or []:
+        if entry["url"] != images[0]:
+            continue
+        thumbs = {v["format"]: v for v in entry["variants"] if v["size"] == "thumb"}
+        if "jpeg" not in thumbs:
+            return None
+        thumbnail = {"url": thumbs["jpeg"]["url"], "width": thumbs["jpeg"]["width"], "height": thumbs["jpeg"]["height"]}
+        if "webp" in thumbs:
+            thumbnail["webp"] = thumbs["webp"]["url"]
+        return thumbnail
+    return None
+
+async def attach_product_images(user_id: str, images: list) -> dict:
+    """
+    Görselleri product_code ile ürünlere ekle.
+    images: [(product_code, url), ...]
+    Ürünler tek $in sorgusuyla bulunur, görseller (ve image_assets'teki
+    varyantları) tek bulk_write ile $addToSet kullanılarak eklenir;
+    eşzamanlı yüklemeler birbirinin görselini ezmez.
+    Bulunan ürünleri product_code -> {id, name} olarak döndürür.
+    """
+    codes = list({code for code, _ in images})
+    if not codes:
+        return {}
+    products, variant_docs = await asyncio.gather(
+        db.products.find(
+            {"user_id": user_id, "product_code": {"$in": codes}},
+            {"_id": 0, "id": 1, "product_code": 1, "name": 1}
+        ).to_list(None),
+        image_variant_docs(user_id, [url for _, url in images])
+    )
+    products_by_code = {p["product_code"]: p for p in products}
+    variants_by_url = {doc["url"]: doc for doc in variant_docs}
+    
+    urls_by_product = {}
+    for code, url in images:
+        product = products_by_code.get(code)
+        if product and url not in urls_by_product.setdefault(product["id"], []):
+            urls_by_product[product["id"]].append(url)
+    
+    operations = []
+    for product_id, urls in urls_by_product.items():
+        add = {"images": {"$each": urls}}
+        variants = [variants_by_url[url] for url in urls if url in variants_by_url]
+        if variants:
+            add["image_variants"] = {"$each": variants}
+        operations.append(UpdateOne({"id": product_id, "user_id": user_id}, {"$addToSet": add}))
+    if operations:
+        await db.products.bulk_write(operations, ordered=False)
+    return products_by_code
+
+async def upload_images(files: List[UploadFile], folder: str) -> list:
+    """
+    Dosyaları varyantlarıyla birlikte paralel yükle; sonuçlar dosya sırasıyla
+    döner, başarısız olanlar için exception. Aynı anda en fazla
+    IMAGE_UPLOAD_CONCURRENCY dosya okunur, böylece bellek kullanımı dosya
+    sayısıyla büyümez.
+    """
+    slots = asyncio.Semaphore(IMAGE_UPLOAD_CONCURRENCY)
+    
+    async def upload_file(file: UploadFile) -> dict:
+        async with slots:
+            contents = await file.read()
+            return await store_image(contents, folder)
+    
+    return await asyncio.gather(*(upload_file(file) for file in files), return_exceptions=True)
+
 # Cloudinary Direkt Upload Endpoint
 @api_router.post("/upload-image")
 async def upload_image_to_cloudinary(
     file: UploadFile = File(...),
     current_user: dict = Depends(require_auth)
 ):
-    """Görseli Cloudinary'ye yükle ve URL döndür"""
-    import cloudinary.uploader
-    
+    """Görseli yapılandırılmış depolamaya (Cloudinary / yerel) yükle ve URL döndür"""
     if not file.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="Sadece görsel dosyaları kabul edilir")
     
     try:
-        # Dosyayı oku
-        contents = await file.read()
-        
-        # Cloudinary'ye yükle
-        result = cloudinary.uploader.upload(
-            contents,
-            folder=f"products/{current_user['id']}",
-            resource_type="image"
-        )
-        
-        return {
-            "url": result.get("secure_url"),
-            "public_id": result.get("public_id")
-        }
+        # Daha önce yüklenmediyse depolamaya yükle; varyantlar ürüne eklenirken image_assets'ten bulunur
+        upload = (await upload_new_images(current_user["id"], [file], f"products/{current_user['id']}"))[0]
+        if isinstance(upload, Exception):
+            raise upload
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Yükleme hatası: {str(e)}")
+    return {
+        "url": upload["url"],
+        "public_id": upload["public_id"],
+        "duplicate": upload["duplicate"],
+        "thumbnail": product_thumbnail({"images": [upload["url"]], "image_variants": [upload]})
+    }
 
 # Toplu Görsel Yükleme Endpoint
 @api_router.post("/upload-images-bulk")
@@ -2769,9 +4069,7 @@ async def upload_images_bulk(
     files: List[UploadFile] = File(...),
     current_user: dict = Depends(require_auth)
 ):
-    """Birden fazla görseli yükle ve product_code ile eşleştir"""
-    import cloudinary.uploader
-    
+    """Birden fazla görseli paralel yükle, ardından product_code ile toplu eşleştir"""
     results = {
         "uploaded": [],
         "matched": [],
@@ -2779,60 +4077,54 @@ async def upload_images_bulk(
         "errors": []
     }
     
+    image_files = []
     for file in files:
         if not file.content_type.startswith("image/"):
             results["errors"].append({"file": file.filename, "error": "Görsel değil"})
             continue
-        
+        image_files.append(file)
+    
+    # Daha önce yüklenmemiş içerikleri depolamaya paralel yükle
+    upload_results = await upload_new_images(current_user["id"], image_files, f"products/{current_user['id']}")
+    
+    for file, upload_result in zip(image_files, upload_results):
+        if isinstance(upload_result, Exception):
+            results["errors"].append({"file": file.filename, "error": str(upload_result)})
+            continue
         # product_code'u dosya adından çıkar
         filename_without_ext = file.filename.rsplit(".", 1)[0]
         product_code = filename_without_ext.split("_")[0]
-        
-        try:
-            # Dosyayı oku
-            contents = await file.read()
-            
-            # Cloudinary'ye yükle
-            upload_result = cloudinary.uploader.upload(
-                contents,
-                folder=f"products/{current_user['id']}",
-                resource_type="image"
-            )
-            
-            url = upload_result.get("secure_url")
-            results["uploaded"].append({"file": file.filename, "url": url, "product_code": product_code})
-            
-            # Ürünü bul ve görseli ekle
-            product = await db.products.find_one({
-                "user_id": current_user["id"],
-                "product_code": product_code
+        results["uploaded"].append({
+            "file": file.filename,
+            "url": upload_result["url"],
+            "product_code": product_code,
+            "duplicate": upload_result["duplicate"]
+        })
+    
+    # Ürünleri toplu eşleştir ve görselleri ekle
+    products_by_code = await attach_product_images(
+        current_user["id"],
+        [(item["product_code"], item["url"]) for item in results["uploaded"]]
+    )
+    
+    for item in results["uploaded"]:
+        product = products_by_code.get(item["product_code"])
+        if product:
+            results["matched"].append({
+                "file": item["file"],
+                "product_code": item["product_code"],
+                "product_name": product["name"]
+            })
+        else:
+            results["unmatched"].append({
+                "file": item["file"],
+                "product_code": item["product_code"],
+                "reason": "Ürün bulunamadı"
             })
-            
-            if product:
-                current_images = product.get("images", [])
-                if url not in current_images:
-                    current_images.append(url)
-                    await db.products.update_one(
-                        {"id": product["id"]},
-                        {"$set": {"images": current_images}}
-                    )
-                results["matched"].append({
-                    "file": file.filename,
-                    "product_code": product_code,
-                    "product_name": product["name"]
-                })
-            else:
-                results["unmatched"].append({
-                    "file": file.filename,
-                    "product_code": product_code,
-                    "reason": "Ürün bulunamadı"
-                })
-                
-        except Exception as e:
-            results["errors"].append({"file": file.filename, "error": str(e)})
     
     return {
         "uploaded_count": len(results["uploaded"]),
+        "duplicate_count": sum(1 for item in results["uploaded"] if item["duplicate"]),
         "matched_count": len(results["matched"]),
         "unmatched_count": len(results["unmatched"]),
         "error_count": len(results["errors"]),
@@ -2851,16 +4143,18 @@ async def get_categories(
     if not include_inactive:
         query["is_active"] = True
     
-    categories = await db.categories.find(query, {"_id": 0}).to_list(1000)
+    # Ürün sayıları tek bir $group ile, kategori listesiyle eşzamanlı hesaplanır
+    categories, counts = await asyncio.gather(
+        db.categories.find(query, {"_id": 0}).to_list(1000),
+        db.products.aggregate([
+            {"$match": {"user_id": current_user["id"], "is_active": True}},
+            {"$group": {"_id": "$category", "count": {"$sum": 1}}}
+        ]).to_list(None)
+    )
+    product_counts = {c["_id"]: c["count"] for c in counts}
     
-    # Her kategori için ürün sayısını hesapla
     for cat in categories:
-        product_count = await db.products.count_documents({
-            "user_id": current_user["id"],
-            "category": cat["name"],
-            "is_active": True
-        })
-        cat["product_count"] = product_count
+        cat["product_count"] = product_counts.get(cat["name"], 0)
     
     return categories
 
@@ -2884,7 +4178,11 @@ async def create_category(
     )
     doc = category.model_dump()
     doc["created_at"] = doc["created_at"].isoformat()
-    await db.categories.insert_one(doc)
+    try:
+        await db.categories.insert_one(doc)
+    except DuplicateKeyError:
+        # Eşzamanlı bir istek aynı kategoriyi oluşturdu (user_id, name unique indeksi)
+        raise HTTPException(status_code=400, detail="Bu isimde kategori zaten mevcut")
     
     # _id'yi kaldır (MongoDB ekledi)
     doc.pop("_id", None)
@@ -2908,18 +4206,23 @@ async def update_category(
     old_name = category["name"]
     update_data = {k: v for k, v in input.model_dump().items() if v is not None}
     
+    # Önce kategori: isim başka bir kategoride varsa ürünlere dokunulmaz
+    if update_data:
+        try:
+            await db.categories.update_one(
+                {"id": category_id, "user_id": current_user["id"]},
+                {"$set": update_data}
+            )
+        except DuplicateKeyError:
+            raise HTTPException(status_code=400, detail="Bu isimde kategori zaten mevcut")
+    
     # İsim değişiyorsa, ürünlerdeki kategori adını da güncelle
     if "name" in update_data and update_data["name"] != old_name:
         await db.products.update_many(
             {"user_id": current_user["id"], "category": old_name},
             {"$set": {"category": update_data["name"]}}
         )
-    
-    if update_data:
-        await db.categories.update_one(
-            {"id": category_id, "user_id": current_user["id"]},
-            {"$set": update_data}
-        )
+        await touch_product_version(current_user["id"])
     
     updated = await db.categories.find_one({"id": category_id}, {"_id": 0})
     return updated
@@ -2955,16 +4258,49 @@ async def delete_category(
 
 # ===== Ürün Endpoint'leri =====
 
+# Ürün listesi (user_id, is_active[, category], name, id) indeksleri üzerinden
+# keyset ile sayfalanır. Toplam sayı (user, filtre, katalog sürümü) anahtarıyla
+# önbelleklenir; ürün yazan her işlem kullanıcının katalog sürümünü artırır.
+PRODUCT_SORT = [("name", 1), ("id", 1)]
+PRODUCT_PAGE_MAX = 500
+PRODUCT_COUNT_CACHE_TTL_SECONDS = float(os.environ.get("PRODUCT_COUNT_CACHE_TTL_SECONDS", "600"))
+PRODUCT_COUNT_CACHE_MAX_SIZE = int(os.environ.get("PRODUCT_COUNT_CACHE_MAX_SIZE", "5000"))
+
+# UserCache'in TTL + LRU mantığı sayım sonuçları için de kullanılır: anahtar -> {"total": n}
+product_count_cache = UserCache(PRODUCT_COUNT_CACHE_MAX_SIZE, PRODUCT_COUNT_CACHE_TTL_SECONDS)
+
+async def touch_product_version(user_id: str):
+    """Kullanıcının katalog sürümünü artır (önbellekteki ürün sayıları geçersiz olur)"""
+    await db.product_versions.update_one({"user_id": user_id}, {"$inc": {"rev": 1}}, upsert=True)
+
+async def count_products(user_id: str, query: dict, filter_key: tuple) -> int:
+    """Sorgunun toplam ürün sayısı; katalog değişmediyse önbellekten"""
+    version = await db.product_versions.find_one({"user_id": user_id}, {"_id": 0, "rev": 1})
+    cache_key = (user_id, version["rev"] if version else 0, filter_key)
+    cached = product_count_cache.get(cache_key)
+    if cached is not None:
+        return cached["total"]
+    total = await db.products.count_documents(query)
+    product_count_cache.set(cache_key, {"total": total})
+    return total
+
 @api_router.get("/products")
 async def get_products(
     category: Optional[str] = None,
     search: Optional[str] = None,
     include_inactive: bool = False,
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=PRODUCT_PAGE_MAX),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
     current_user: dict = Depends(require_auth)
 ):
-    """Ürünleri listele (sayfalama destekli)"""
+    """
+    Ürünleri isim sırasıyla listele.
+    Sonraki sayfa için önceki yanıttaki next_cursor gönderilir (sayfa derinliğinden
+    bağımsız sabit maliyet). skip eski istemciler için desteklenir. Toplam sayı
+    önbellekten gelir; include_total=false ile hiç hesaplanmaz.
+    """
     query = {"user_id": current_user["id"]}
     
     if not include_inactive:
@@ -2979,13 +4315,26 @@ async def get_products(
             {"product_code": {"$regex": search, "$options": "i"}}
         ]
     
-    total = await db.products.count_documents(query)
-    products = await db.products.find(query, {"_id": 0}).skip(skip).limit(limit).to_list(limit)
+    if cursor or not skip:
+        page = keyset_page(db.products, query, PRODUCT_SORT, limit, cursor, {"_id": 0})
+    else:
+        page = skip_page(db.products, query, PRODUCT_SORT, skip, limit)
+    if include_total:
+        filter_key = (category, search, include_inactive)
+        (products, next_cursor), total = await asyncio.gather(page, count_products(current_user["id"], query, filter_key))
+    else:
+        (products, next_cursor), total = await page, None
+    
+    # Liste ekranı yalnızca küçük resmi kullanır
+    for product in products:
+        product["thumbnail"] = product_thumbnail(product)
+        product.pop("image_variants", None)
     
     return {
         "total": total,
         "skip": skip,
         "limit": limit,
+        "next_cursor": next_cursor,
         "products": products
     }
 
@@ -3005,6 +4354,17 @@ async def get_product(
     
     return product
 
+async def ensure_category(user_id: str, name: str):
+    """Kategori yoksa oluştur; eşzamanlı isteklerde unique indeks tek kaydı korur"""
+    if await db.categories.find_one({"user_id": user_id, "name": name}, {"_id": 1}):
+        return
+    cat_doc = Category(user_id=user_id, name=name).model_dump()
+    cat_doc["created_at"] = cat_doc["created_at"].isoformat()
+    try:
+        await db.categories.insert_one(cat_doc)
+    except DuplicateKeyError:
+        pass
+
 @api_router.post("/products")
 async def create_product(
     input: ProductCreate,
@@ -3020,20 +4380,17 @@ async def create_product(
         raise HTTPException(status_code=400, detail="Bu ürün kodu zaten mevcut")
     
     # Kategori yoksa oluştur
-    cat_exists = await db.categories.find_one({
-        "user_id": current_user["id"],
-        "name": input.category
-    })
-    if not cat_exists:
-        new_cat = Category(user_id=current_user["id"], name=input.category)
-        cat_doc = new_cat.model_dump()
-        cat_doc["created_at"] = cat_doc["created_at"].isoformat()
-        await db.categories.insert_one(cat_doc)
+    await ensure_category(current_user["id"], input.category)
     
-    product = Product(user_id=current_user["id"], **input.model_dump())
+    product = Product(
+        user_id=current_user["id"],
+        image_variants=await image_variant_docs(current_user["id"], input.images),
+        **input.model_dump()
+    )
     doc = product.model_dump()
     doc["created_at"] = doc["created_at"].isoformat()
     await db.products.insert_one(doc)
+    await touch_product_version(current_user["id"])
     
     # _id'yi kaldır (MongoDB ekledi)
     doc.pop("_id", None)
@@ -3067,21 +4424,18 @@ async def update_product(
     
     # Yeni kategori ise oluştur
     if "category" in update_data:
-        cat_exists = await db.categories.find_one({
-            "user_id": current_user["id"],
-            "name": update_data["category"]
-        })
-        if not cat_exists:
-            new_cat = Category(user_id=current_user["id"], name=update_data["category"])
-            cat_doc = new_cat.model_dump()
-            cat_doc["created_at"] = cat_doc["created_at"].isoformat()
-            await db.categories.insert_one(cat_doc)
+        await ensure_category(current_user["id"], update_data["category"])
+    
+    # Görsel listesi değiştiyse varyantları da aynı sıraya getir
+    if "images" in update_data:
+        update_data["image_variants"] = await image_variant_docs(current_user["id"], update_data["images"])
     
     if update_data:
         await db.products.update_one(
             {"id": product_id, "user_id": current_user["id"]},
             {"$set": update_data}
         )
+        await touch_product_version(current_user["id"])
     
     updated = await db.products.find_one({"id": product_id}, {"_id": 0})
     return updated
@@ -3101,9 +4455,159 @@ async def delete_product(
         raise HTTPException(status_code=404, detail="Ürün bulunamadı")
     
     await db.products.delete_one({"id": product_id, "user_id": current_user["id"]})
+    await touch_product_version(current_user["id"])
     return {"message": "Ürün silindi"}
 
 # ===== Excel Yükleme =====
+# Satırlar gruplar halinde işlenir: her grup için eksik kategoriler tek
+# insert_many ile, ürünler tek sırasız bulk_write (upsert) ile yazılır.
+PRODUCT_IMPORT_BATCH_SIZE = int(os.environ.get("PRODUCT_IMPORT_BATCH_SIZE", "1000"))
+
+# Excel'den gelen alanlar; diğer ürün alanları yalnızca ilk oluşturulurken yazılır
+PRODUCT_IMPORT_FIELDS = ("name", "category", "base_price", "unit", "description")
+
+def map_product_columns(headers: list) -> dict:
+    """Başlık satırından kolon eşleştirmesi çıkar"""
+    col_map = {}
+    for i, h in enumerate(headers):
+        if "code" in h or "kod" in h:
+            col_map["product_code"] = i
+        elif "name" in h or "ad" in h or "isim" in h:
+            col_map["name"] = i
+        elif "categ" in h or "kategori" in h:
+            col_map["category"] = i
+        elif "price" in h or "fiyat" in h:
+            col_map["price"] = i
+        elif "unit" in h or "birim" in h:
+            col_map["unit"] = i
+        elif "desc" in h or "açıklama" in h:
+            col_map["description"] = i
+    
+    if "product_code" not in col_map or "name" not in col_map:
+        raise HTTPException(
+            status_code=400,
+            detail="Excel'de 'product_code' ve 'product_name' kolonları zorunludur"
+        )
+    return col_map
+
+def parse_product_row(row: tuple, col_map: dict) -> dict:
+    """Excel satırını ürün alanlarına çevir"""
+    product_code = str(row[col_map["product_code"]]).strip() if row[col_map["product_code"]] else None
+    name = str(row[col_map["name"]]).strip() if row[col_map["name"]] else None
+    
+    if not product_code or not name:
+        raise ValueError("Ürün kodu veya adı boş")
+    
+    category = str(row[col_map.get("category", -1)]).strip() if col_map.get("category") is not None and row[col_map["category"]] else "Genel"
+    
+    price = 0
+    if col_map.get("price") is not None and row[col_map["price"]]:
+        try:
+            price = float(row[col_map["price"]])
+        except:
+            pass
+    
+    unit = str(row[col_map.get("unit", -1)]).strip() if col_map.get("unit") is not None and row[col_map["unit"]] else "Adet"
+    description = str(row[col_map.get("description", -1)]).strip() if col_map.get("description") is not None and row[col_map["description"]] else None
+    
+    return {
+        "product_code": product_code,
+        "name": name,
+        "category": category,
+        "base_price": price,
+        "unit": unit,
+        "description": description
+    }
+
+def merge_import_result(total: dict, part: dict):
+    """Bir grubun sonucunu toplam sonuca ekle (sayılar toplanır, listeler birleştirilir)"""
+    for key, value in part.items():
+        if isinstance(value, list):
+            total.setdefault(key, []).extend(value)
+        else:
+            total[key] = total.get(key, 0) + value
+
+async def create_missing_categories(user_id: str, names: set, known_categories: set) -> list:
+    """Bilinmeyen kategorileri tek insert_many ile oluştur, oluşturulanları döndür"""
+    missing = sorted(names - known_categories)
+    if not missing:
+        return []
+    
+    docs = []
+    for name in missing:
+        doc = Category(user_id=user_id, name=name).model_dump()
+        doc["created_at"] = doc["created_at"].isoformat()
+        docs.append(doc)
+    
+    created = set(missing)
+    try:
+        await db.categories.insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        for err in e.details.get("writeErrors", []):
+            # Eşzamanlı bir yükleme aynı kategoriyi oluşturmuş olabilir (unique indeks)
+            if err.get("code") != 11000:
+                raise
+            created.discard(docs[err["index"]]["name"])
+    known_categories.update(missing)
+    return [name for name in missing if name in created]
+
+async def apply_product_import_batch(user_id: str, rows: list, col_map: dict, known_categories: set) -> dict:
+    """
+    Bir grup Excel satırını uygula.
+    rows: [(satır_no, satır_değerleri), ...]
+    Aynı ürün kodu birden fazla satırda varsa son satır geçerlidir; önceki
+    satırlar eski davranıştaki gibi güncelleme sayılır.
+    """
+    result = {"created": 0, "updated": 0, "errors": [], "categories_created": []}
+    
+    parsed = {}  # product_code -> (satır_no, alanlar)
+    duplicates = 0
+    for row_idx, row in rows:
+        try:
+            fields = parse_product_row(row, col_map)
+        except Exception as e:
+            result["errors"].append({"row": row_idx, "error": str(e)})
+            continue
+        if fields["product_code"] in parsed:
+            duplicates += 1
+        parsed[fields["product_code"]] = (row_idx, fields)
+    
+    if not parsed:
+        return result
+    
+    entries = list(parsed.values())
+    result["categories_created"] = await create_missing_categories(
+        user_id, {fields["category"] for _, fields in entries}, known_categories
+    )
+    
+    operations = []
+    for _, fields in entries:
+        defaults = Product(user_id=user_id, **fields).model_dump()
+        defaults["created_at"] = defaults["created_at"].isoformat()
+        on_insert = {
+            k: v for k, v in defaults.items()
+            if k not in PRODUCT_IMPORT_FIELDS and k not in ("user_id", "product_code")
+        }
+        operations.append(UpdateOne(
+            {"user_id": user_id, "product_code": fields["product_code"]},
+            {"$set": {k: fields[k] for k in PRODUCT_IMPORT_FIELDS}, "$setOnInsert": on_insert},
+            upsert=True
+        ))
+    
+    try:
+        write = await db.products.bulk_write(operations, ordered=False)
+        upserted = set(write.upserted_ids)
+        write_errors = []
+    except BulkWriteError as e:
+        upserted = {u["index"] for u in e.details.get("upserted", [])}
+        write_errors = e.details.get("writeErrors", [])
+    await touch_product_version(user_id)
+    
+    for err in write_errors:
+        result["errors"].append({"row": entries[err["index"]][0], "error": err.get("errmsg", "Yazma hatası")})
+    result["created"] = len(upserted)
+    result["updated"] = len(entries) - len(upserted) - len(write_errors) + duplicates
+    return result
 
 @api_router.post("/products/upload")
 async def upload_products_excel(
@@ -3111,130 +4615,192 @@ async def upload_products_excel(
     current_user: dict = Depends(require_auth)
 ):
     """
-    Excel'den toplu ürün yükleme.
+    Excel'den toplu ürün yükleme (arka plan işi).
     Kolonlar: product_code | product_name | category | price | unit | description
     Aynı product_code varsa günceller, yoksa yeni oluşturur.
+    Yanıttaki iş id'si ile /api/import/jobs/{job_id} sorgulanır.
     """
     if not file.filename.endswith(('.xlsx', '.xls')):
         raise HTTPException(status_code=400, detail="Sadece Excel dosyaları kabul edilir")
     
+    return await start_import_job(file, "products", current_user)
+
+def product_header_map(header_values: list) -> dict:
+    headers = [str(value).lower().strip() if value else "" for value in header_values]
+    return map_product_columns(headers)
+
+async def import_product_rows(job: dict, path: str, progress: dict) -> dict:
+    """Ürün içe aktarma işi: upsert'ler tekrar çalıştırılabilir, gruplar kaldığı yerden devam eder"""
+    reader = ExcelRowReader(path, batch_size=IMPORT_BATCH_SIZE, start_row=progress["next_row"])
     try:
-        content = await file.read()
-        wb = load_workbook(filename=io.BytesIO(content))
-        ws = wb.active
-        
-        # Başlık satırını al
-        headers = [str(cell.value).lower().strip() if cell.value else "" for cell in ws[1]]
+        col_map = product_header_map(await reader.open())
+        start_import_progress(progress, reader)
         
-        # Kolon eşleştirme
-        col_map = {}
-        for i, h in enumerate(headers):
-            if "code" in h or "kod" in h:
-                col_map["product_code"] = i
-            elif "name" in h or "ad" in h or "isim" in h:
-                col_map["name"] = i
-            elif "categ" in h or "kategori" in h:
-                col_map["category"] = i
-            elif "price" in h or "fiyat" in h:
-                col_map["price"] = i
-            elif "unit" in h or "birim" in h:
-                col_map["unit"] = i
-            elif "desc" in h or "açıklama" in h:
-                col_map["description"] = i
-        
-        if "product_code" not in col_map or "name" not in col_map:
-            raise HTTPException(
-                status_code=400,
-                detail="Excel'de 'product_code' ve 'product_name' kolonları zorunludur"
-            )
-        
-        created_count = 0
-        updated_count = 0
-        error_rows = []
-        categories_created = set()
-        
-        for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
-            try:
-                product_code = str(row[col_map["product_code"]]).strip() if row[col_map["product_code"]] else None
-                name = str(row[col_map["name"]]).strip() if row[col_map["name"]] else None
-                
-                if not product_code or not name:
-                    error_rows.append({"row": row_idx, "error": "Ürün kodu veya adı boş"})
-                    continue
-                
-                category = str(row[col_map.get("category", -1)]).strip() if col_map.get("category") is not None and row[col_map["category"]] else "Genel"
-                
-                price = 0
-                if col_map.get("price") is not None and row[col_map["price"]]:
-                    try:
-                        price = float(row[col_map["price"]])
-                    except:
-                        pass
-                
-                unit = str(row[col_map.get("unit", -1)]).strip() if col_map.get("unit") is not None and row[col_map["unit"]] else "Adet"
-                description = str(row[col_map.get("description", -1)]).strip() if col_map.get("description") is not None and row[col_map["description"]] else None
-                
-                # Kategori yoksa oluştur
-                if category not in categories_created:
-                    cat_exists = await db.categories.find_one({
-                        "user_id": current_user["id"],
-                        "name": category
-                    })
-                    if not cat_exists:
-                        new_cat = Category(user_id=current_user["id"], name=category)
-                        cat_doc = new_cat.model_dump()
-                        cat_doc["created_at"] = cat_doc["created_at"].isoformat()
-                        await db.categories.insert_one(cat_doc)
-                        categories_created.add(category)
-                
-                # Ürün var mı?
-                existing = await db.products.find_one({
-                    "user_id": current_user["id"],
-                    "product_code": product_code
-                })
-                
-                if existing:
-                    # Güncelle
-                    await db.products.update_one(
-                        {"id": existing["id"]},
-                        {"$set": {
-                            "name": name,
-                            "category": category,
-                            "base_price": price,
-                            "unit": unit,
-                            "description": description
-                        }}
-                    )
-                    updated_count += 1
-                else:
-                    # Yeni oluştur
-                    product = Product(
-                        user_id=current_user["id"],
-                        product_code=product_code,
-                        name=name,
-                        category=category,
-                        base_price=price,
-                        unit=unit,
-                        description=description
-                    )
-                    doc = product.model_dump()
-                    doc["created_at"] = doc["created_at"].isoformat()
-                    await db.products.insert_one(doc)
-                    created_count += 1
-                    
-            except Exception as e:
-                error_rows.append({"row": row_idx, "error": str(e)})
-        
-        return {
-            "message": "Yükleme tamamlandı",
-            "created": created_count,
-            "updated": updated_count,
-            "errors": error_rows,
-            "categories_created": list(categories_created)
-        }
+        # Mevcut kategoriler tek sorguda
+        known_categories = set(await db.categories.distinct("name", {"user_id": job["user_id"]}))
         
+        async for batch in reader.batches():
+            part = await apply_product_import_batch(job["user_id"], batch, col_map, known_categories)
+            progress["created"] += part["created"]
+            progress["updated"] += part["updated"]
+            progress["failed"] += len(part["errors"])
+            progress["errors"].extend(part["errors"][:max(IMPORT_MAX_ERRORS - len(progress["errors"]), 0)])
+            progress["categories_created"].extend(part["categories_created"])
+            await save_import_progress(job, progress, batch)
+    finally:
+        await reader.close()
+    
+    return {
+        "message": "Yükleme tamamlandı",
+        "created": progress["created"],
+        "updated": progress["updated"],
+        "errors": sorted(progress["errors"], key=lambda e: e["row"]),
+        "categories_created": progress["categories_created"]
+    }
+
+# =============================================================================
+# İçe aktarma işleri - Excel yüklemeleri arka planda
+# =============================================================================
+# Yükleme isteği dosyayı diske yazıp başlıkları doğrular ve hemen iş id'si
+# döndürür. İşçi satırları gruplar halinde yazar; her gruptan sonra ilerleme
+# (next_row) kaydedilir, yeniden başlatmada iş son kaydedilen gruptan devam eder.
+IMPORT_UPLOAD_DIR = Path(os.environ.get("IMPORT_UPLOAD_DIR", str(ROOT_DIR / "import_uploads")))
+IMPORT_BATCH_SIZE = int(os.environ.get("IMPORT_BATCH_SIZE", str(PRODUCT_IMPORT_BATCH_SIZE)))
+IMPORT_JOB_WORKERS = int(os.environ.get("IMPORT_JOB_WORKERS", "1"))
+IMPORT_JOB_TTL_HOURS = int(os.environ.get("IMPORT_JOB_TTL_HOURS", "24"))
+IMPORT_JOB_STALE_SECONDS = int(os.environ.get("IMPORT_JOB_STALE_SECONDS", "300"))
+# İş kaydında tutulacak en fazla satır hatası (doküman boyutu sınırı için)
+IMPORT_MAX_ERRORS = 1000
+
+import_jobs = JobRunner(
+    "import",
+    "import_jobs",
+    workers=IMPORT_JOB_WORKERS,
+    ttl_seconds=IMPORT_JOB_TTL_HOURS * 3600,
+    stale_seconds=IMPORT_JOB_STALE_SECONDS
+)
+
+IMPORT_KINDS = {
+    # tür: (başlık doğrulama, satır işleyici)
+    "customers": (map_customer_columns, import_customer_rows),
+    "products": (product_header_map, import_product_rows),
+}
+
+def new_import_progress() -> dict:
+    return {
+        "total": None,
+        "processed": 0,
+        "created": 0,
+        "updated": 0,
+        "failed": 0,
+        "next_row": 2,
+        "errors": [],
+        "categories_created": [],
+        # ETA hesabı için bu çalıştırmanın başlangıcı (devam edilen işlerde sıfırlanır)
+        "run_started_at": None,
+        "run_started_processed": 0
+    }
+
+def start_import_progress(progress: dict, reader: ExcelRowReader):
+    if reader.total_rows is not None:
+        progress["total"] = reader.total_rows
+    progress["run_started_at"] = datetime.now(timezone.utc).isoformat()
+    progress["run_started_processed"] = progress["processed"]
+
+async def save_import_progress(job: dict, progress: dict, batch: list):
+    progress["processed"] += len(batch)
+    progress["next_row"] = batch[-1][0] + 1
+    await import_jobs.update(job["id"], progress=progress)
+
+async def run_import_job(job: dict) -> dict:
+    params = job["params"]
+    _, import_rows = IMPORT_KINDS[params["kind"]]
+    progress = job.get("progress") or new_import_progress()
+    try:
+        result = await import_rows(job, params["path"], progress)
+    except asyncio.CancelledError:
+        # Kapanışta kesildi: dosya kalır, iş sonraki açılışta devam eder
+        raise
+    except Exception:
+        remove_import_upload(params["path"])
+        raise
+    remove_import_upload(params["path"])
+    return result
+
+import_jobs.register("excel_import", run_import_job)
+
+def remove_import_upload(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+async def start_import_job(file: UploadFile, kind: str, current_user: dict) -> dict:
+    """Dosyayı kalıcı dizine yaz, başlıkları doğrula ve içe aktarma işini sıraya al"""
+    validate_headers, _ = IMPORT_KINDS[kind]
+    IMPORT_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    path = await spool_upload(file, directory=IMPORT_UPLOAD_DIR)
+    
+    reader = ExcelRowReader(path)
+    try:
+        validate_headers(await reader.open())
+        total_rows = reader.total_rows
+    except HTTPException:
+        remove_import_upload(path)
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Excel işleme hatası: {str(e)}")
+        remove_import_upload(path)
+        raise HTTPException(status_code=400, detail=f"Excel dosyası okunamadı: {str(e)}")
+    finally:
+        await reader.close()
+    
+    progress = new_import_progress()
+    progress["total"] = total_rows
+    job = await import_jobs.submit(current_user["id"], "excel_import", {
+        "kind": kind,
+        "path": path,
+        "filename": file.filename
+    }, progress=progress)
+    return {"message": "Yükleme sıraya alındı", **import_job_response(job)}
+
+def import_job_response(job: dict) -> dict:
+    progress = job.get("progress") or new_import_progress()
+    total = progress["total"]
+    processed = progress["processed"]
+    
+    eta_seconds = None
+    if job["status"] == "running" and total and progress["run_started_at"]:
+        elapsed = (datetime.now(timezone.utc) - datetime.fromisoformat(progress["run_started_at"])).total_seconds()
+        done_in_run = processed - progress["run_started_processed"]
+        if done_in_run > 0 and elapsed > 0:
+            eta_seconds = round(max(total - processed, 0) / (done_in_run / elapsed), 1)
+    
+    return {
+        "id": job["id"],
+        "kind": job["params"]["kind"],
+        "filename": job["params"]["filename"],
+        "status": job["status"],
+        "total": total,
+        "processed": processed,
+        "created": progress["created"],
+        "updated": progress["updated"],
+        "failed": progress["failed"],
+        "percent": round(min(processed / total, 1) * 100, 1) if total else None,
+        "eta_seconds": eta_seconds,
+        "result": job.get("result"),
+        "error": job.get("error"),
+        "created_at": job["created_at"],
+        "started_at": job.get("started_at"),
+        "finished_at": job.get("finished_at")
+    }
+
+@api_router.get("/import/jobs/{job_id}")
+async def get_import_job(job_id: str, current_user: dict = Depends(require_auth)):
+    """İçe aktarma işinin durumu ve ilerlemesi"""
+    job = await import_jobs.get(job_id, current_user["id"])
+    if not job:
+        raise HTTPException(status_code=404, detail="İş bulunamadı")
+    return import_job_response(job)
 
 # ===== Toplu Görsel Eşleştirme =====
 
@@ -3249,6 +4815,7 @@ async def match_product_images(
     """
     matched = []
     unmatched = []
+    valid = []
     
     for img in images:
         product_code = img.get("product_code")
@@ -3257,22 +4824,14 @@ async def match_product_images(
         if not product_code or not url:
             unmatched.append({"product_code": product_code, "reason": "Eksik bilgi"})
             continue
-        
-        # Ürünü bul
-        product = await db.products.find_one({
-            "user_id": current_user["id"],
-            "product_code": product_code
-        })
-        
+        valid.append((product_code, url))
+    
+    # Ürünleri tek sorguda bul, görselleri tek bulk_write ile ekle
+    products_by_code = await attach_product_images(current_user["id"], valid)
+    
+    for product_code, _ in valid:
+        product = products_by_code.get(product_code)
         if product:
-            # Görseli ekle
-            current_images = product.get("images", [])
-            if url not in current_images:
-                current_images.append(url)
-                await db.products.update_one(
-                    {"id": product["id"]},
-                    {"$set": {"images": current_images}}
-                )
             matched.append({"product_code": product_code, "product_name": product["name"]})
         else:
             unmatched.append({"product_code": product_code, "reason": "Ürün bulunamadı"})
@@ -3284,6 +4843,195 @@ async def match_product_images(
         "unmatched": unmatched
     }
 
+# =============================================================================
+# Metrikler
+# =============================================================================
+@api_router.get("/metrics")
+async def get_metrics(current_user: dict = Depends(require_auth)):
+    """Süreç içi önbellek sayaçları ve indeks durumu"""
+    return {
+        "user_cache": user_cache.stats(),
+        "product_count_cache": product_count_cache.stats(),
+        "analytics_cache": {
+            **analytics_cache.stats(),
+            "compute_seconds": round(analytics_cache_savings["compute_seconds"], 3),
+            "saved_seconds": round(analytics_cache_savings["saved_seconds"], 3)
+        },
+        "image_storage": image_storage.name,
+        "image_dedup": image_dedup_stats,
+        "pools": {
+            "password": password_pool.stats(),
+            "report": report_pool.stats(),
+            "image_upload": image_upload_pool.stats(),
+            "image_variant": image_variant_pool.stats()
+        },
+        "jobs": {
+            "report": report_jobs.stats(),
+            "import": import_jobs.stats()
+        },
+        "report_cache": report_cache.stats(),
+        "index_drift": INDEX_DRIFT
+    }
+
+# =============================================================================
+# MongoDB İndeksleri
+# =============================================================================
+# Handler'ların neredeyse tamamı {"id", "user_id"}, {"user_id", "date"} veya
+# {"user_id", "product_code"} ile filtreleme yapıyor. İndeks olmadan her istek
+# tüm kullanıcıların verisini tarar. Beklenen indeksler burada tanımlanır ve
+# uygulama açılışında oluşturulur: (isim, anahtarlar, seçenekler)
+#
+# "id" alanı tek başına unique tutulur: hem {"id": ...} hem de
+# {"id": ..., "user_id": ...} sorgularını karşılar.
+INDEX_SPECS = {
+    "users": [
+        ("id_unique", [("id", 1)], {"unique": True}),
+        ("email_unique", [("email", 1)], {"unique": True}),
+    ],
+    "customers": [
+        ("id_unique", [("id", 1)], {"unique": True}),
+        ("user_name_id", [("user_id", 1), ("name", 1), ("id", 1)], {}),
+        ("user_region", [("user_id", 1), ("region", 1)], {}),
+        ("user_visit_days", [("user_id", 1), ("visit_days", 1)], {}),
+    ],
+    "regions": [
+        ("id_unique", [("id", 1)], {"unique": True}),
+        ("user_name_unique", [("user_id", 1), ("name", 1)], {"unique": True}),
+    ],
+    "visits": [
+        ("id_unique", [("id", 1)], {"unique": True}),
+        ("user_date", [("user_id", 1), ("date", 1)], {}),
+        ("user_customer_date_unique", [("user_id", 1), ("customer_id", 1), ("date", 1)], {"unique": True}),
+    ],
+    "follow_ups": [
+        ("id_unique", [("id", 1)], {"unique": True}),
+        ("user_status_due_date", [("user_id", 1), ("status", 1), ("due_date", 1)], {}),
+        ("user_due_date", [("user_id", 1), ("due_date", 1)], {}),
+        ("user_customer", [("user_id", 1), ("customer_id", 1)], {}),
+    ],
+    "daily_notes": [
+        ("user_date_unique", [("user_id", 1), ("date", 1)], {"unique": True}),
+    ],
+    "vehicles": [
+        ("id_unique", [("id", 1)], {"unique": True}),
+        ("user_active", [("user_id", 1), ("is_active", 1)], {}),
+    ],
+    "fuel_records": [
+        ("id_unique", [("id", 1)], {"unique": True}),
+        ("user_date", [("user_id", 1), ("date", 1)], {}),
+        ("user_vehicle_km", [("user_id", 1), ("vehicle_id", 1), ("current_km", 1)], {}),
+    ],
+    "daily_km_records": [
+        ("id_unique", [("id", 1)], {"unique": True}),
+        ("user_date", [("user_id", 1), ("date", 1)], {}),
+        ("user_vehicle_date_unique", [("user_id", 1), ("vehicle_id", 1), ("date", 1)], {"unique": True}),
+    ],
+    "categories": [
+        ("id_unique", [("id", 1)], {"unique": True}),
+        ("user_name_unique", [("user_id", 1), ("name", 1)], {"unique": True}),
+    ],
+    "products": [
+        ("id_unique", [("id", 1)], {"unique": True}),
+        ("user_product_code_unique", [("user_id", 1), ("product_code", 1)], {"unique": True}),
+        ("user_active_name_id", [("user_id", 1), ("is_active", 1), ("name", 1), ("id", 1)], {}),
+        ("user_active_category_name_id", [("user_id", 1), ("is_active", 1), ("category", 1), ("name", 1), ("id", 1)], {}),
+    ],
+    "password_resets": [
+        ("token_unique", [("token", 1)], {"unique": True}),
+        ("user", [("user_id", 1)], {}),
+    ],
+    "report_jobs": [
+        ("id_unique", [("id", 1)], {"unique": True}),
+        ("user", [("user_id", 1)], {}),
+        ("status_created", [("status", 1), ("created_at", 1)], {}),
+        ("expires_at_ttl", [("expires_at", 1)], {"expireAfterSeconds": 0}),
+    ],
+    "import_jobs": [
+        ("id_unique", [("id", 1)], {"unique": True}),
+        ("user", [("user_id", 1)], {}),
+        ("status_created", [("status", 1), ("created_at", 1)], {}),
+        ("expires_at_ttl", [("expires_at", 1)], {"expireAfterSeconds": 0}),
+    ],
+    "image_assets": [
+        ("user_url", [("user_id", 1), ("url", 1)], {}),
+        ("user_sha256_unique", [("user_id", 1), ("sha256", 1)], {
+            "unique": True,
+            "partialFilterExpression": {"sha256": {"$exists": True}}
+        }),
+        ("user_dhash", [("user_id", 1), ("dhash", 1)], {}),
+    ],
+    "product_versions": [
+        ("user_unique", [("user_id", 1)], {"unique": True}),
+    ],
+    "analytics_versions": [
+        ("user_unique", [("user_id", 1)], {"unique": True}),
+    ],
+    "report_versions": [
+        ("user_scope_unique", [("user_id", 1), ("scope", 1)], {"unique": True}),
+    ],
+    "daily_stats": [
+        ("user_date_unique", [("user_id", 1), ("date", 1)], {"unique": True}),
+    ],
+    "daily_stat_revisions": [
+        ("user_date_unique", [("user_id", 1), ("date", 1)], {"unique": True}),
+    ],
+}
+
+# Son açılıştaki fark raporu: {koleksiyon: {"missing": [...], "mismatched": [...], "extra": [...]}}
+INDEX_DRIFT = {}
+
+def _index_signature(keys, options: dict) -> tuple:
+    """İndeksi karşılaştırılabilir hale getir (anahtarlar + önemli seçenekler)"""
+    normalized_keys = tuple(
+        (field, int(direction) if isinstance(direction, (int, float)) else direction)
+        for field, direction in keys
+    )
+    return (
+        normalized_keys,
+        bool(options.get("unique")),
+        options.get("expireAfterSeconds"),
+    )
+
+def diff_indexes(specs: list, existing: dict) -> dict:
+    """Tanımlı indeksleri veritabanındakilerle karşılaştır"""
+    declared = {name: _index_signature(keys, options) for name, keys, options in specs}
+    actual = {
+        name: _index_signature(info["key"], info)
+        for name, info in existing.items()
+        if name != "_id_"
+    }
+    return {
+        "missing": [name for name in declared if name not in actual],
+        "mismatched": [name for name in declared if name in actual and actual[name] != declared[name]],
+        "extra": [name for name in actual if name not in declared],
+    }
+
+async def ensure_indexes() -> dict:
+    """Tanımlı indeksleri oluştur ve tanımlı set ile farkları raporla"""
+    drift = {}
+    for collection_name, specs in INDEX_SPECS.items():
+        collection = db[collection_name]
+        try:
+            for name, keys, options in specs:
+                try:
+                    await collection.create_index(keys, name=name, **options)
+                except OperationFailure as e:
+                    # Çakışan isim/seçenek veya unique ihlali: açılışı durdurma, farkı raporla
+                    logger.warning(f"İndeks oluşturulamadı {collection_name}.{name}: {e}")
+            report = diff_indexes(specs, await collection.index_information())
+        except PyMongoError as e:
+            logger.error(f"İndeks kontrolü başarısız ({collection_name}): {e}")
+            report = {"missing": [name for name, _, _ in specs], "mismatched": [], "extra": [], "error": str(e)}
+        if any(report.values()):
+            drift[collection_name] = report
+            logger.warning(f"İndeks farkı ({collection_name}): {report}")
+    
+    INDEX_DRIFT.clear()
+    INDEX_DRIFT.update(drift)
+    if not drift:
+        logger.info("Tüm MongoDB indeksleri tanımlı set ile uyumlu")
+    return drift
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -3302,6 +5050,27 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def create_db_indexes():
+    await ensure_indexes()
+
+@app.on_event("startup")
+async def prune_report_cache():
+    removed = await asyncio.to_thread(report_cache.prune, REPORT_CACHE_MAX_AGE_DAYS * 24 * 3600)
+    if removed:
+        logger.info(f"Rapor önbelleğinden {removed} eski dosya silindi")
+
+@app.on_event("startup")
+async def start_job_runners():
+    await report_jobs.start()
+    await import_jobs.start()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await report_jobs.stop()
+    await import_jobs.stop()
+    password_pool.shutdown()
+    report_pool.shutdown()
+    image_upload_pool.shutdown()
+    image_variant_pool.shutdown()
     client.close()
@@ -0,0 +1,130 @@
+"""
+Takip listesi benchmark - /api/follow-ups/today için veritabanı round-trip sayısı
+
+Geçici bir veritabanına N takip + müşteri yazılır, ardından handler doğrudan
+çağrılır. Gönderilen MongoDB komutları pymongo CommandListener ile sayılır:
+  before: her takip için ayrı find_one (N+1)
+  after:  tek $in sorgusu
+
+Gerçek bir MongoDB gerekir (MONGO_URL). Geçici veritabanı sonunda silinir.
+
+Kullanım:
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/bench_follow_ups.py --follow-ups 500
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from pymongo import monitoring
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "bench_follow_ups")
+
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
+import server  # noqa: E402
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.commands = Counter()
+
+    def started(self, event):
+        if event.database_name == server.db.name:
+            self.commands[event.command_name] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+async def legacy_today_follow_ups(current_user):
+    """Eski davranış: her takip için ayrı müşteri sorgusu"""
+    today = datetime.now(timezone.utc).date().isoformat()
+    follow_ups = await server.db.follow_ups.find({
+        "user_id": current_user["id"],
+        "$or": [
+            {"due_date": today},
+            {"due_date": {"$lt": today}, "status": {"$ne": "done"}}
+        ]
+    }, {"_id": 0}).to_list(1000)
+    for fu in follow_ups:
+        if fu.get("status") == "pending" and fu.get("due_date") < today:
+            fu["status"] = "late"
+            await server.db.follow_ups.update_one({"id": fu["id"]}, {"$set": {"status": "late"}})
+    for fu in follow_ups:
+        customer = await server.db.customers.find_one({"id": fu["customer_id"], "user_id": current_user["id"]}, {"_id": 0})
+        if customer:
+            fu["customer"] = {"name": customer["name"], "region": customer["region"]}
+    return follow_ups
+
+
+async def seed(user_id, follow_up_count, customer_count):
+    today = datetime.now(timezone.utc).date()
+    customers = [
+        {"id": str(uuid.uuid4()), "user_id": user_id, "name": f"Müşteri {i}", "region": f"Bölge {i % 12}"}
+        for i in range(customer_count)
+    ]
+    follow_ups = [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "customer_id": customers[i % customer_count]["id"],
+            "due_date": (today - timedelta(days=i % 30)).isoformat(),
+            "status": "pending",
+            "notes": "Sipariş takibi",
+        }
+        for i in range(follow_up_count)
+    ]
+    await server.db.customers.insert_many(customers)
+    await server.db.follow_ups.insert_many(follow_ups)
+
+
+async def measure(label, handler, current_user, counter, user_id, args):
+    await server.db.customers.delete_many({})
+    await server.db.follow_ups.delete_many({})
+    await seed(user_id, args.follow_ups, args.customers)
+
+    counter.commands.clear()
+    started = time.perf_counter()
+    result = await handler(current_user=current_user)
+    elapsed = time.perf_counter() - started
+    commands = dict(counter.commands)
+    print(
+        f"  {label:<7} follow_ups={len(result):<5} round_trips={sum(commands.values()):<5} "
+        f"time={elapsed * 1000:8.1f} ms  {commands}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--follow-ups", type=int, default=500)
+    parser.add_argument("--customers", type=int, default=200)
+    args = parser.parse_args()
+
+    counter = CommandCounter()
+    client = AsyncIOMotorClient(os.environ["MONGO_URL"], event_listeners=[counter])
+    db_name = f"bench_follow_ups_{uuid.uuid4().hex[:8]}"
+    server.db = client[db_name]
+    user_id = str(uuid.uuid4())
+    current_user = {"id": user_id, "name": "Benchmark", "email": "bench@example.com"}
+
+    try:
+        print(f"/api/follow-ups/today ({args.follow_ups} follow-ups, {args.customers} customers)")
+        await measure("before", legacy_today_follow_ups, current_user, counter, user_id, args)
+        await measure("after", server.get_today_follow_ups, current_user, counter, user_id, args)
+    finally:
+        await client.drop_database(db_name)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+"""
+Toplu görsel yükleme benchmark - sahte yükleyici ile paralel yükleme
+
+Cloudinary yerine sabit gecikmeli sahte bir depolama (--storage fake) veya
+geçici dizinde yerel depolama (--storage local) kullanılır; böylece ölçüm
+çevrimdışı yapılabilir. Aynı dosya listesi farklı paralellik değerleriyle
+yüklenir ve toplam süre ile event loop gecikmesi raporlanır.
+
+Veritabanı veya sunucu gerektirmez.
+
+Kullanım:
+    python benchmarks/bench_image_upload.py --files 200 --latency 0.3 --concurrency 1 4 8 16
+    python benchmarks/bench_image_upload.py --storage local --files 500
+"""
+import argparse
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "bench_image_upload")
+
+from fastapi import UploadFile  # noqa: E402
+
+import server  # noqa: E402
+
+
+class FakeStorage(server.ImageStorage):
+    """Sabit ağ gecikmesini taklit eden depolama"""
+
+    name = "fake"
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def save(self, contents, folder, timeout=None):
+        time.sleep(self.latency)
+        return {"url": f"https://images.local/{folder}/{len(contents)}", "public_id": folder}
+
+
+async def loop_lag(stop, samples, interval=0.01):
+    """Event loop'un ne kadar geç uyandığını ölç (bloklanma göstergesi)"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - started - interval)
+
+
+async def run(files, size, concurrency):
+    server.IMAGE_UPLOAD_CONCURRENCY = concurrency
+    server.image_upload_pool = server.BoundedExecutor(
+        "image_upload",
+        lambda workers: ThreadPoolExecutor(max_workers=workers),
+        concurrency=concurrency
+    )
+    uploads = [UploadFile(file=io.BytesIO(os.urandom(size)), filename=f"P{i:04d}_1.jpg") for i in range(files)]
+
+    stop = asyncio.Event()
+    lag = []
+    ticker = asyncio.create_task(loop_lag(stop, lag))
+    started = time.perf_counter()
+    results = await server.upload_images(uploads, "products/bench")
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+    server.image_upload_pool.shutdown()
+
+    failed = sum(1 for r in results if isinstance(r, Exception))
+    print(
+        f"  concurrency={concurrency:<3} time={elapsed:7.2f} s  files/s={files / elapsed:7.1f}  "
+        f"failed={failed}  max_loop_lag={max(lag, default=0) * 1000:6.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--size", type=int, default=200 * 1024, help="dosya boyutu (bayt)")
+    parser.add_argument("--latency", type=float, default=0.3, help="sahte yükleme süresi (sn)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--storage", choices=["fake", "local"], default="fake")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as media_dir:
+        if args.storage == "local":
+            server.image_storage = server.LocalImageStorage(Path(media_dir), "/api/media")
+            print(f"/api/upload-images-bulk ({args.files} files, local storage in {media_dir})")
+        else:
+            server.image_storage = FakeStorage(args.latency)
+            print(f"/api/upload-images-bulk ({args.files} files, {args.latency * 1000:.0f} ms per upload)")
+        for concurrency in args.concurrency:
+            asyncio.run(run(args.files, args.size, concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Görsel varyantı benchmark - küçük resim üretim süresi ve aktarılan bayt
+
+Fotoğraf benzeri (gürültülü) N görsel üretilir ve render_variants ile
+varyantları çıkarılır. Görsel başına süre ile liste ekranında orijinal yerine
+küçük resim kullanıldığında aktarılan bayt oranı raporlanır.
+
+Veritabanı veya sunucu gerektirmez.
+
+Kullanım:
+    python benchmarks/bench_image_variants.py --images 20 --width 4000 --height 3000
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+import image_variants  # noqa: E402
+
+
+def photo_like(width, height, seed):
+    """Kamera fotoğrafına yakın sıkıştırma oranı veren gürültülü bir görsel"""
+    noise = Image.effect_noise((width // 4, height // 4), 40 + seed % 20).resize((width, height))
+    gradient = Image.linear_gradient("L").resize((width, height))
+    image = Image.merge("RGB", (noise, gradient, noise.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=20)
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=3000)
+    args = parser.parse_args()
+
+    originals = [photo_like(args.width, args.height, i) for i in range(args.images)]
+    timings = []
+    variant_bytes = defaultdict(int)
+    for contents in originals:
+        started = time.perf_counter()
+        variants = image_variants.render_variants(contents)
+        timings.append(time.perf_counter() - started)
+        for variant in variants:
+            variant_bytes[(variant["size"], variant["format"])] += len(variant["content"])
+
+    original_bytes = sum(len(c) for c in originals)
+    print(f"render_variants ({args.images} images, {args.width}x{args.height}, {original_bytes / args.images / 1024:.0f} KiB avg)")
+    print(
+        f"  time/image mean={statistics.mean(timings) * 1000:7.1f} ms  "
+        f"median={statistics.median(timings) * 1000:7.1f} ms  max={max(timings) * 1000:7.1f} ms"
+    )
+    for (size, fmt), total in sorted(variant_bytes.items()):
+        print(
+            f"  {size:<6} {fmt:<4} avg={total / args.images / 1024:7.1f} KiB  "
+            f"of original={total / original_bytes * 100:5.1f} %"
+        )
+
+
+if __name__ == "__main__":
+    main()
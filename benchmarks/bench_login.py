@@ -0,0 +1,94 @@
+"""
+Login benchmark - eşzamanlı girişlerde gecikme ölçümü
+
+Sabah 8:30'daki toplu girişi taklit eder: N eşzamanlı /api/auth/login isteği
+gönderilirken, aynı anda hafif bir endpoint'e (/api/) düzenli istek atılır.
+bcrypt event loop'u blokluyorsa "ping" gecikmesi login süresine yaklaşır.
+
+Kullanım:
+    REACT_APP_BACKEND_URL=http://localhost:8001 python benchmarks/bench_login.py --logins 200 --concurrency 50
+"""
+import argparse
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', 'http://localhost:8001').rstrip('/')
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(name, values):
+    if not values:
+        print(f"{name:<8} no samples")
+        return
+    print(
+        f"{name:<8} n={len(values):<5} "
+        f"p50={percentile(values, 50) * 1000:8.1f} ms  "
+        f"p95={percentile(values, 95) * 1000:8.1f} ms  "
+        f"p99={percentile(values, 99) * 1000:8.1f} ms  "
+        f"max={max(values) * 1000:8.1f} ms  "
+        f"mean={statistics.mean(values) * 1000:8.1f} ms"
+    )
+
+
+def login_once(email, password):
+    started = time.perf_counter()
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={"email": email, "password": password})
+    elapsed = time.perf_counter() - started
+    return elapsed, response.status_code
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--email", default="test@example.com")
+    parser.add_argument("--password", default="test123")
+    parser.add_argument("--logins", type=int, default=200, help="toplam login isteği")
+    parser.add_argument("--concurrency", type=int, default=50, help="eşzamanlı istemci sayısı")
+    parser.add_argument("--ping-interval", type=float, default=0.05, help="/api/ ping aralığı (sn)")
+    args = parser.parse_args()
+
+    login_latencies = []
+    ping_latencies = []
+    failures = 0
+    stop = threading.Event()
+
+    def pinger():
+        while not stop.is_set():
+            started = time.perf_counter()
+            requests.get(f"{BASE_URL}/api/")
+            ping_latencies.append(time.perf_counter() - started)
+            time.sleep(args.ping_interval)
+
+    ping_thread = threading.Thread(target=pinger, daemon=True)
+    ping_thread.start()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for elapsed, status in pool.map(lambda _: login_once(args.email, args.password), range(args.logins)):
+            login_latencies.append(elapsed)
+            if status != 200:
+                failures += 1
+    total = time.perf_counter() - started
+
+    stop.set()
+    ping_thread.join()
+
+    print(f"Target: {BASE_URL}  logins={args.logins} concurrency={args.concurrency}")
+    print(f"Wall time: {total:.2f} s  throughput: {args.logins / total:.1f} login/s  failures: {failures}")
+    summarize("login", login_latencies)
+    summarize("ping", ping_latencies)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+PDF render benchmark - font önbelleği öncesi/sonrası rapor başına süre
+
+Aynı snapshot'lar iki şekilde çizilir:
+  before: her belgede DejaVu fontları diskten okunup ayrıştırılır (eski davranış)
+  after:  ReportPDF, süreç başına bir kez ayrıştırılan font şablonlarını kullanır
+
+Veritabanı veya sunucu gerektirmez.
+
+Kullanım:
+    python benchmarks/bench_pdf_render.py --iterations 30
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from fpdf import FPDF  # noqa: E402
+
+import pdf_reports  # noqa: E402
+
+
+class UncachedReportPDF(FPDF):
+    """Eski davranış: fontlar her belgede yeniden ayrıştırılır"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.set_auto_page_break(auto=True, margin=15)
+        for style, path in pdf_reports.REPORT_FONTS.items():
+            self.add_font(pdf_reports.REPORT_FONT_FAMILY, style, path)
+
+
+def daily_snapshot(customers):
+    visited = [
+        ({"name": f"Müşteri {i} Gıda Ltd. Şti.", "region": "Kadıköy"},
+         {"status": "visited", "payment_collected": i % 2 == 0, "payment_amount": 150.0 * i,
+          "payment_skip_reason": "Sonra ödeyecek", "note": "Çarşamba tekrar uğranacak"})
+        for i in range(customers)
+    ]
+    not_visited = [
+        ({"name": f"İşletme {i}", "region": "Üsküdar"}, {"status": "not_visited", "visit_skip_reason": "Kapalıydı"})
+        for i in range(customers // 4)
+    ]
+    pending = [({"name": f"Bekleyen {i}", "region": "Şişli"}, {}) for i in range(customers // 4)]
+    return {
+        "day_name": "Pazartesi",
+        "date": "2026-01-05",
+        "user_name": "Ayşe Yılmaz",
+        "user_email": "ayse@example.com",
+        "visited_customers": visited,
+        "not_visited_customers": not_visited,
+        "pending_customers": pending,
+        "daily_note_text": "Gün sonu notu: bölgede yoğun trafik vardı.",
+        "daily_km_record": {"daily_km": 120.0, "daily_cost": 312.5},
+        "vehicle": {"name": "Fiat Doblo"},
+    }
+
+
+def period_snapshot(days):
+    daily_data = {
+        f"2026-01-{day:02d}": {"visited": 8, "not_visited": 2, "payment": 1250.0}
+        for day in range(1, days + 1)
+    }
+    return {
+        "period_type": "monthly",
+        "start_date": "2026-01-01",
+        "end_date": f"2026-01-{days:02d}",
+        "user_name": "Ayşe Yılmaz",
+        "user_email": "ayse@example.com",
+        "working_days": days,
+        "customer_count": 240,
+        "total_visits": days * 10,
+        "visited_count": days * 8,
+        "not_visited_count": days * 2,
+        "pending_count": 0,
+        "visit_rate": 80.0,
+        "avg_daily_visits": 8.0,
+        "total_payment": days * 1250.0,
+        "payment_count": days * 4,
+        "payment_by_type": {"Nakit": days * 800.0, "Kredi Kartı": days * 450.0, "Havale/EFT": 0, "Çek": 0, "Diğer": 0},
+        "avg_daily_payment": 1250.0,
+        "total_km": days * 110.0,
+        "total_fuel_cost": days * 290.0,
+        "avg_km_cost": 2.636,
+        "daily_data": daily_data,
+    }
+
+
+def measure(render, snapshot, iterations):
+    timings = []
+    size = 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        size = len(render(snapshot))
+        timings.append(time.perf_counter() - started)
+    return timings, size
+
+
+def report(label, timings, size):
+    print(
+        f"  {label:<7} mean={statistics.mean(timings) * 1000:8.1f} ms  "
+        f"median={statistics.median(timings) * 1000:8.1f} ms  "
+        f"min={min(timings) * 1000:8.1f} ms  size={size} B"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--customers", type=int, default=40, help="günlük rapordaki ziyaret edilen müşteri sayısı")
+    parser.add_argument("--days", type=int, default=30, help="dönem raporundaki gün sayısı")
+    args = parser.parse_args()
+
+    cached_pdf = pdf_reports.ReportPDF
+    cases = [
+        ("daily", pdf_reports.render_daily_report, daily_snapshot(args.customers)),
+        ("period", pdf_reports.render_period_report, period_snapshot(args.days)),
+    ]
+    for name, render, snapshot in cases:
+        print(f"{name} report ({args.iterations} iterations)")
+
+        pdf_reports.ReportPDF = UncachedReportPDF
+        before, before_size = measure(render, snapshot, args.iterations)
+
+        pdf_reports.ReportPDF = cached_pdf
+        pdf_reports.warm_up_fonts()
+        after, after_size = measure(render, snapshot, args.iterations)
+
+        report("before", before, before_size)
+        report("after", after, after_size)
+        print(f"  speedup x{statistics.mean(before) / statistics.mean(after):.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Performans analizi benchmark - /api/analytics/performance uzun tarih aralıklarında
+
+Geçici bir veritabanına bir yıla yayılmış N ziyaret + M takip yazılır,
+ardından handler 30/90/365 günlük özel aralıklarla doğrudan çağrılır:
+  before: tüm kayıtları uygulamaya çekip her gün için listeleri yeniden tarayan
+          eski günlük kırılım (O(gün x kayıt))
+  after:  günlük özetlerin (daily_stats) toplamı + tek geçişli kırılım; ilk
+          çağrı eksik günlerin özetini hesaplar (max), sonrakiler yalnızca
+          özet belgelerini okur (median)
+Süre ve son çağrıda gönderilen MongoDB komutları (pymongo CommandListener) raporlanır.
+
+Gerçek bir MongoDB gerekir (MONGO_URL). Geçici veritabanı sonunda silinir.
+
+Kullanım:
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/bench_performance_analytics.py --visits 10000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+from pymongo import monitoring
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "bench_performance_analytics")
+
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
+import server  # noqa: E402
+
+RANGE_END = date(2024, 12, 31)
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.commands = Counter()
+
+    def started(self, event):
+        if event.database_name == server.db.name:
+            self.commands[event.command_name] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+async def legacy_performance_analytics(current_user, start, end):
+    """Eski davranış: ziyaret ve takipler listeye çekilir, her gün için tüm liste yeniden taranır"""
+    visits = await server.db.visits.find({
+        "user_id": current_user["id"],
+        "date": {"$gte": start, "$lte": end}
+    }, {"_id": 0}).to_list(10000)
+    follow_ups = await server.db.follow_ups.find({
+        "user_id": current_user["id"],
+        "due_date": {"$gte": start, "$lte": end}
+    }, {"_id": 0}).to_list(10000)
+
+    daily_data = []
+    date_cursor = datetime.fromisoformat(start)
+    end_dt = datetime.fromisoformat(end)
+    while date_cursor.date() <= end_dt.date():
+        date_str = date_cursor.date().isoformat()
+        day_visits = [v for v in visits if v.get("date") == date_str]
+        day_followups = [fu for fu in follow_ups if fu.get("due_date") == date_str]
+        completed_followups = sum(1 for fu in day_followups if fu.get("status") == "done")
+        payment = sum((v.get("payment_amount", 0) or 0) for v in day_visits if v.get("payment_collected"))
+        daily_data.append({
+            "date": date_str,
+            "day": date_cursor.strftime("%a"),
+            "planned": len(day_followups),
+            "completed": completed_followups,
+            "payment": payment
+        })
+        date_cursor += timedelta(days=1)
+    return {"daily_breakdown": daily_data}
+
+
+async def seed(user_id, args):
+    rng = random.Random(42)
+    customers = [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "name": f"Müşteri {i}",
+            "region": f"Bölge {i % 12}",
+            "price_status": "İskontolu" if i % 3 == 0 else "Standart",
+            "created_at": (RANGE_END - timedelta(days=rng.randrange(365))).isoformat(),
+        }
+        for i in range(args.customers)
+    ]
+    visits = []
+    for i in range(args.visits):
+        collected = rng.random() < 0.4
+        visits.append({
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "customer_id": customers[i % args.customers]["id"],
+            "date": (RANGE_END - timedelta(days=rng.randrange(365))).isoformat(),
+            "completed": rng.random() < 0.7,
+            "payment_collected": collected,
+            "payment_amount": rng.randrange(50, 5000) if collected else 0,
+            "duration_minutes": rng.randrange(1, 90),
+            "quality_rating": rng.randrange(1, 6),
+        })
+    follow_ups = [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "customer_id": customers[i % args.customers]["id"],
+            "due_date": (RANGE_END - timedelta(days=rng.randrange(365))).isoformat(),
+            "status": "done" if rng.random() < 0.6 else "pending",
+        }
+        for i in range(args.follow_ups)
+    ]
+    await server.db.customers.insert_many(customers)
+    await server.db.visits.insert_many(visits)
+    await server.db.follow_ups.insert_many(follow_ups)
+
+
+async def measure(label, handler, counter, days, repeat):
+    start = (RANGE_END - timedelta(days=days - 1)).isoformat()
+    end = RANGE_END.isoformat()
+    timings = []
+    for _ in range(repeat):
+        counter.commands.clear()
+        started = time.perf_counter()
+        result = await handler(start, end)
+        timings.append(time.perf_counter() - started)
+    commands = dict(counter.commands)
+    payment = sum(d["payment"] for d in result["daily_breakdown"])
+    print(
+        f"  {label:<7} days={days:<4} median={statistics.median(timings) * 1000:8.1f} ms  "
+        f"max={max(timings) * 1000:8.1f} ms  payment={payment:<10} {commands}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--visits", type=int, default=10000)
+    parser.add_argument("--follow-ups", type=int, default=5000)
+    parser.add_argument("--customers", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-legacy", action="store_true", help="eski O(gün x kayıt) döngüyü ölçme")
+    args = parser.parse_args()
+
+    counter = CommandCounter()
+    client = AsyncIOMotorClient(os.environ["MONGO_URL"], event_listeners=[counter])
+    db_name = f"bench_performance_analytics_{uuid.uuid4().hex[:8]}"
+    server.db = client[db_name]
+    user_id = str(uuid.uuid4())
+    current_user = {"id": user_id, "name": "Benchmark", "email": "bench@example.com"}
+
+    async def after(start, end):
+        return await server.get_performance_analytics(
+            period="custom", start_date=start, end_date=end, current_user=current_user
+        )
+
+    async def before(start, end):
+        return await legacy_performance_analytics(current_user, start, end)
+
+    try:
+        await seed(user_id, args)
+        await server.ensure_indexes()
+        print(
+            f"/api/analytics/performance ({args.visits} visits, {args.follow_ups} follow-ups, "
+            f"{args.customers} customers over 365 days)"
+        )
+        for days in (30, 90, 365):
+            if not args.skip_legacy:
+                await measure("before", before, counter, days, args.repeat)
+            await measure("after", after, counter, days, args.repeat)
+    finally:
+        await client.drop_database(db_name)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,144 @@
+"""
+Ürün Excel yükleme benchmark - /api/products/upload
+
+N satırlık bir fiyat listesi üretilir ve handler geçici bir veritabanına karşı
+doğrudan çağrılır. İkinci çalıştırma aynı dosyayı tekrar yükler (tüm satırlar
+güncelleme). Gönderilen MongoDB komutları pymongo CommandListener ile sayılır.
+
+--legacy verilirse eski satır başına find_one/insert_one/update_one akışı da
+--legacy-rows satır üzerinde ölçülür (50k satırda dakikalar sürer).
+
+Gerçek bir MongoDB gerekir (MONGO_URL). Geçici veritabanı sonunda silinir.
+
+Kullanım:
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/bench_product_import.py --rows 50000 --legacy
+"""
+import argparse
+import asyncio
+import io
+import os
+import sys
+import time
+import uuid
+from collections import Counter
+
+from openpyxl import Workbook
+from pymongo import monitoring
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "bench_product_import")
+
+from fastapi import UploadFile  # noqa: E402
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
+import server  # noqa: E402
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.commands = Counter()
+
+    def started(self, event):
+        if event.database_name == server.db.name:
+            self.commands[event.command_name] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def build_workbook(rows, categories):
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(["product_code", "product_name", "category", "price", "unit", "description"])
+    for i in range(rows):
+        ws.append([f"SKU-{i:06d}", f"Ürün {i}", f"Kategori {i % categories}", round(10 + i % 500 * 0.75, 2), "Adet", None])
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+async def legacy_import(content, current_user):
+    """Eski davranış: satır başına kategori + ürün sorgusu ve ayrı yazma"""
+    wb = server.load_workbook(filename=io.BytesIO(content))
+    ws = wb.active
+    headers = [str(cell.value).lower().strip() if cell.value else "" for cell in ws[1]]
+    col_map = server.map_product_columns(headers)
+    created = updated = 0
+    categories_created = set()
+    for row in ws.iter_rows(min_row=2, values_only=True):
+        fields = server.parse_product_row(row, col_map)
+        if fields["category"] not in categories_created:
+            if not await server.db.categories.find_one({"user_id": current_user["id"], "name": fields["category"]}):
+                doc = server.Category(user_id=current_user["id"], name=fields["category"]).model_dump()
+                await server.db.categories.insert_one(doc)
+                categories_created.add(fields["category"])
+        existing = await server.db.products.find_one({"user_id": current_user["id"], "product_code": fields["product_code"]})
+        if existing:
+            await server.db.products.update_one({"id": existing["id"]}, {"$set": fields})
+            updated += 1
+        else:
+            doc = server.Product(user_id=current_user["id"], **fields).model_dump()
+            await server.db.products.insert_one(doc)
+            created += 1
+    return {"created": created, "updated": updated}
+
+
+async def pipeline_import(content, current_user):
+    upload = UploadFile(file=io.BytesIO(content), filename="fiyat_listesi.xlsx")
+    return await server.upload_products_excel(upload, current_user=current_user)
+
+
+async def measure(label, importer, content, current_user, counter):
+    counter.commands.clear()
+    started = time.perf_counter()
+    result = await importer(content, current_user)
+    elapsed = time.perf_counter() - started
+    rows = result["created"] + result["updated"]
+    print(
+        f"  {label:<16} rows={rows:<6} created={result['created']:<6} updated={result['updated']:<6} "
+        f"time={elapsed:7.2f} s  rows/s={rows / elapsed:9.0f}  round_trips={sum(counter.commands.values())}"
+    )
+
+
+async def reset(db):
+    await db.products.delete_many({})
+    await db.categories.delete_many({})
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--categories", type=int, default=300)
+    parser.add_argument("--legacy", action="store_true", help="eski akışı da ölç")
+    parser.add_argument("--legacy-rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    counter = CommandCounter()
+    client = AsyncIOMotorClient(os.environ["MONGO_URL"], event_listeners=[counter])
+    db_name = f"bench_product_import_{uuid.uuid4().hex[:8]}"
+    server.db = client[db_name]
+    current_user = {"id": str(uuid.uuid4()), "name": "Benchmark", "email": "bench@example.com"}
+
+    try:
+        await server.ensure_indexes()
+        content = build_workbook(args.rows, args.categories)
+        print(f"/api/products/upload ({args.rows} rows, {len(content) / 1024:.0f} KiB)")
+        await measure("pipeline insert", pipeline_import, content, current_user, counter)
+        await measure("pipeline update", pipeline_import, content, current_user, counter)
+
+        if args.legacy:
+            await reset(server.db)
+            legacy_content = build_workbook(args.legacy_rows, args.categories)
+            await measure("legacy insert", legacy_import, legacy_content, current_user, counter)
+            await measure("legacy update", legacy_import, legacy_content, current_user, counter)
+    finally:
+        await client.drop_database(db_name)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,167 @@
+"""
+Ekip analizi benchmark - /api/analytics/team, N temsilci x 1 yıl ziyaret
+
+Geçici bir veritabanına N temsilci ve her biri için bir yıla yayılmış günlük
+ziyaret + takip yazılır. Ardından yıllık aralık için ölçülür:
+  per_rep: her temsilci için ayrı build_performance_analytics (önbelleksiz)
+  cold:    /api/analytics/team ilk çağrı (eksik günlük özetler doldurulur)
+  warm:    /api/analytics/team sonraki çağrılar (tek $facet aggregation)
+Süre ve gönderilen MongoDB komutları (pymongo CommandListener) raporlanır.
+
+Gerçek bir MongoDB gerekir (MONGO_URL). Geçici veritabanı sonunda silinir.
+
+Kullanım:
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/bench_team_analytics.py --reps 100 --visits-per-day 8
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from collections import Counter
+from datetime import date, timedelta
+
+from pymongo import monitoring
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "bench_team_analytics")
+
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
+import server  # noqa: E402
+
+RANGE_START = date(2024, 1, 1)
+RANGE_END = date(2024, 12, 31)
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.commands = Counter()
+
+    def started(self, event):
+        if event.database_name == server.db.name:
+            self.commands[event.command_name] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+async def seed_rep(user_id, args, rng):
+    customers = [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "name": f"Müşteri {i}",
+            "region": f"Bölge {i % 12}",
+            "price_status": "İskontolu" if i % 3 == 0 else "Standart",
+            "created_at": (RANGE_START + timedelta(days=rng.randrange(366))).isoformat(),
+        }
+        for i in range(args.customers)
+    ]
+    visits, follow_ups = [], []
+    day = RANGE_START
+    while day <= RANGE_END:
+        for customer in rng.sample(customers, args.visits_per_day):
+            completed = rng.random() < 0.7
+            collected = completed and rng.random() < 0.5
+            visits.append({
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "customer_id": customer["id"],
+                "date": day.isoformat(),
+                "status": "visited" if completed else "not_visited",
+                "completed": completed,
+                "payment_collected": collected,
+                "payment_type": rng.choice(["Nakit", "Kredi Kartı", "Havale/EFT"]) if collected else None,
+                "payment_amount": rng.randrange(50, 5000) if collected else None,
+                "duration_minutes": rng.randrange(1, 90),
+                "quality_rating": rng.randrange(1, 6),
+            })
+            follow_ups.append({
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "customer_id": customer["id"],
+                "due_date": day.isoformat(),
+                "status": "done" if rng.random() < 0.6 else "pending",
+            })
+        day += timedelta(days=1)
+    await server.db.customers.insert_many(customers)
+    await server.db.visits.insert_many(visits)
+    await server.db.follow_ups.insert_many(follow_ups)
+    return len(visits)
+
+
+async def measure(label, handler, counter, repeat):
+    timings = []
+    for _ in range(repeat):
+        counter.commands.clear()
+        started = time.perf_counter()
+        result = await handler()
+        timings.append(time.perf_counter() - started)
+    commands = dict(counter.commands)
+    print(
+        f"  {label:<8} median={statistics.median(timings) * 1000:9.1f} ms  max={max(timings) * 1000:9.1f} ms  "
+        f"round_trips={sum(commands.values()):<6} {commands}"
+    )
+    return result
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reps", type=int, default=100)
+    parser.add_argument("--customers", type=int, default=60)
+    parser.add_argument("--visits-per-day", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    counter = CommandCounter()
+    client = AsyncIOMotorClient(os.environ["MONGO_URL"], event_listeners=[counter])
+    db_name = f"bench_team_analytics_{uuid.uuid4().hex[:8]}"
+    server.db = client[db_name]
+    manager = {"id": str(uuid.uuid4()), "name": "Yönetici", "email": "manager@example.com", "role": "manager"}
+    reps = [
+        {"id": str(uuid.uuid4()), "name": f"Temsilci {i:03d}", "email": f"rep{i}@example.com", "role": "representative"}
+        for i in range(args.reps)
+    ]
+    start, end = RANGE_START.isoformat(), RANGE_END.isoformat()
+
+    async def per_rep():
+        return [await server.build_performance_analytics(rep["id"], "custom", start, end) for rep in reps]
+
+    async def team():
+        return await server.get_team_analytics(period="custom", start_date=start, end_date=end, current_user=manager)
+
+    try:
+        await server.ensure_indexes()
+        await server.db.users.insert_many([manager] + reps)
+        rng = random.Random(7)
+        seeded = time.perf_counter()
+        visit_count = 0
+        for rep in reps:
+            visit_count += await seed_rep(rep["id"], args, rng)
+        print(
+            f"/api/analytics/team ({args.reps} reps, {visit_count} visits over {start}..{end}, "
+            f"seeded in {time.perf_counter() - seeded:.1f} s)"
+        )
+
+        await measure("cold", team, counter, 1)
+        result = await measure("warm", team, counter, args.repeat)
+        await measure("per_rep", per_rep, counter, 1)
+        print(
+            f"  team payment_total={result['team']['payment_total']}  visit_rate={result['team']['visit_rate']}  "
+            f"days={len(result['daily'])}"
+        )
+    finally:
+        await client.drop_database(db_name)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
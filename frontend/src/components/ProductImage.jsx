@@ -0,0 +1,25 @@
+// Ürün görseli: varsa backend'in ürettiği WebP/JPEG varyantını, yoksa
+// (varyantı olmayan eski görsellerde) orijinal URL'yi gösterir.
+// variant: { url, webp } — listede `product.thumbnail`, detayda imageVariant() sonucu
+export default function ProductImage({ src, variant, alt = "", className, loading = "lazy" }) {
+  if (!variant) {
+    return <img src={src} alt={alt} className={className} loading={loading} />;
+  }
+  return (
+    <picture>
+      {variant.webp && <source srcSet={variant.webp} type="image/webp" />}
+      <img src={variant.url} alt={alt} className={className} loading={loading} />
+    </picture>
+  );
+}
+
+// Detay yanıtındaki image_variants içinden görselin istenen boyuttaki varyantı
+export function imageVariant(product, url, size) {
+  const entry = product?.image_variants?.find((item) => item.url === url);
+  if (!entry) return null;
+  const formats = {};
+  for (const variant of entry.variants) {
+    if (variant.size === size) formats[variant.format] = variant.url;
+  }
+  return formats.jpeg ? { url: formats.jpeg, webp: formats.webp } : null;
+}
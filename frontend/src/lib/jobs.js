@@ -0,0 +1,24 @@
+import axios from "axios";
+
+const DEFAULT_POLL_MS = 1500;
+const DEFAULT_TIMEOUT_MS = 10 * 60 * 1000;
+
+// Sunucudaki arka plan işini bitene kadar sorgular; bitmiş iş kaydını döndürür.
+// onProgress her sorgu sonucunda çağrılır (ilerleme göstermek için).
+export async function pollJob(url, { intervalMs = DEFAULT_POLL_MS, timeoutMs = DEFAULT_TIMEOUT_MS, onProgress } = {}) {
+  const startedAt = Date.now();
+  while (Date.now() - startedAt < timeoutMs) {
+    const { data: job } = await axios.get(url);
+    if (onProgress) onProgress(job);
+    if (job.status === "done") return job;
+    if (job.status === "failed") throw new Error(job.error || "İşlem tamamlanamadı");
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+  throw new Error("İşlem zaman aşımına uğradı");
+}
+
+// Hata mesajı: sunucu yanıtındaki detail, yoksa iş hatası
+export function jobErrorMessage(error, fallback) {
+  if (error.response) return error.response.data?.detail || fallback;
+  return error.message || fallback;
+}
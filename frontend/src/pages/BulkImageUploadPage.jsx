@@ -252,6 +252,9 @@ export default function BulkImageUploadPage() {
               <h3 className="font-semibold text-slate-900 mb-2">Özet</h3>
               <div className="grid grid-cols-2 gap-2 text-sm">
                 <div className="text-green-600">✓ Yüklenen: {results.uploaded_count}</div>
+                {results.duplicate_count > 0 && (
+                  <div className="text-slate-500">↺ Zaten yüklü (tekrar gönderilmedi): {results.duplicate_count}</div>
+                )}
                 <div className="text-green-600">✓ Eşleşen: {results.matched_count}</div>
                 <div className="text-orange-600">⚠ Eşleşmeyen: {results.unmatched_count}</div>
                 <div className="text-red-600">✗ Hatalı: {results.error_count}</div>
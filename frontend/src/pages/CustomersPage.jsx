@@ -5,6 +5,7 @@ import { useNavigate } from "react-router-dom";
 import { Input } from "@/components/ui/input";
 import { Button } from "@/components/ui/button";
 import { toast } from "sonner";
+import { pollJob, jobErrorMessage } from "@/lib/jobs";
 import {
   Dialog,
   DialogContent,
@@ -13,6 +14,7 @@ import {
 } from "@/components/ui/dialog";
 
 const API = `${process.env.REACT_APP_BACKEND_URL}/api`;
+const CUSTOMER_PAGE_SIZE = 200;
 
 export default function CustomersPage() {
   const [customers, setCustomers] = useState([]);
@@ -20,20 +22,35 @@ export default function CustomersPage() {
   const [loading, setLoading] = useState(true);
   const [uploadDialogOpen, setUploadDialogOpen] = useState(false);
   const [uploading, setUploading] = useState(false);
+  const [uploadProgress, setUploadProgress] = useState(null);
   const [selectedFile, setSelectedFile] = useState(null);
   const fileInputRef = useRef(null);
+  const fetchIdRef = useRef(0);
   const navigate = useNavigate();
 
+  // Müşteriler sayfa sayfa çekilir: ilk sayfa gelince liste gösterilir,
+  // kalan sayfalar arkadan eklenir. Yeni bir yükleme eskisini geçersiz kılar.
   const fetchCustomers = async () => {
+    const fetchId = ++fetchIdRef.current;
     setLoading(true);
     try {
-      const res = await axios.get(`${API}/customers`);
-      setCustomers(res.data);
+      let loaded = [];
+      let cursor = null;
+      do {
+        const { data } = await axios.get(`${API}/customers`, {
+          params: { limit: CUSTOMER_PAGE_SIZE, cursor },
+        });
+        if (fetchId !== fetchIdRef.current) return;
+        loaded = loaded.concat(data.customers);
+        setCustomers(loaded);
+        setLoading(false);
+        cursor = data.next_cursor;
+      } while (cursor);
     } catch (error) {
       console.error("Error fetching customers:", error);
       toast.error("Müşteriler yüklenirken hata oluştu");
     } finally {
-      setLoading(false);
+      if (fetchId === fetchIdRef.current) setLoading(false);
     }
   };
 
@@ -80,14 +97,18 @@ export default function CustomersPage() {
     formData.append("file", selectedFile);
 
     try {
-      const res = await axios.post(`${API}/customers/upload`, formData, {
+      const { data: job } = await axios.post(`${API}/customers/upload`, formData, {
         headers: { "Content-Type": "multipart/form-data" },
       });
+      // Satırlar sunucuda arka planda işlenir
+      const { result } = await pollJob(`${API}/import/jobs/${job.id}`, {
+        onProgress: setUploadProgress,
+      });
       
-      toast.success(res.data.message);
+      toast.success(result.message);
       
-      if (res.data.errors && res.data.errors.length > 0) {
-        toast.warning(`${res.data.errors.length} satırda hata var`);
+      if (result.errors && result.errors.length > 0) {
+        toast.warning(`${result.errors.length} satırda hata var`);
       }
       
       setUploadDialogOpen(false);
@@ -95,10 +116,10 @@ export default function CustomersPage() {
       fetchCustomers();
     } catch (error) {
       console.error("Error uploading file:", error);
-      const errorMsg = error.response?.data?.detail || "Dosya yüklenirken hata oluştu";
-      toast.error(errorMsg);
+      toast.error(jobErrorMessage(error, "Dosya yüklenirken hata oluştu"));
     } finally {
       setUploading(false);
+      setUploadProgress(null);
     }
   };
 
@@ -344,7 +365,9 @@ export default function CustomersPage() {
               {uploading ? (
                 <span className="flex items-center gap-2">
                   <div className="w-4 h-4 border-2 border-white/30 border-t-white rounded-full animate-spin" />
-                  Yükleniyor...
+                  {uploadProgress?.percent != null
+                    ? `İşleniyor... %${Math.round(uploadProgress.percent)}`
+                    : "Yükleniyor..."}
                 </span>
               ) : (
                 <span className="flex items-center gap-2">
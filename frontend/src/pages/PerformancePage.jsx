@@ -29,6 +29,7 @@ import {
   DialogTrigger,
 } from "@/components/ui/dialog";
 import { toast } from "sonner";
+import { pollJob, jobErrorMessage } from "@/lib/jobs";
 import {
   BarChart,
   Bar,
@@ -74,16 +75,20 @@ export default function PerformancePage() {
   const handleDownloadPeriodReport = async (reportPeriod) => {
     setDownloadingPdf(true);
     try {
+      const { data: job } = await axios.post(`${API}/report/jobs`, {
+        period_type: reportPeriod,
+      });
+      // Rapor sunucuda arka planda üretilir; bağlantı açık tutulmadan durum sorgulanır
+      const readyJob = await pollJob(`${API}/report/jobs/${job.id}`);
       const response = await axios.get(
-        `${API}/report/pdf/period/${reportPeriod}`,
+        `${API}/report/jobs/${readyJob.id}/download`,
         { responseType: "blob" }
       );
       
       const url = window.URL.createObjectURL(new Blob([response.data]));
       const link = document.createElement("a");
       link.href = url;
-      const periodLabel = reportPeriod === "weekly" ? "haftalik" : "aylik";
-      link.setAttribute("download", `performans_raporu_${periodLabel}.pdf`);
+      link.setAttribute("download", readyJob.params.filename);
       document.body.appendChild(link);
       link.click();
       link.remove();
@@ -93,7 +98,7 @@ export default function PerformancePage() {
       setReportDialogOpen(false);
     } catch (error) {
       console.error("Error downloading PDF:", error);
-      toast.error("PDF indirirken hata oluştu");
+      toast.error(jobErrorMessage(error, "PDF indirirken hata oluştu"));
     } finally {
       setDownloadingPdf(false);
     }
@@ -6,6 +6,7 @@ import {
   Eye, X, Package
 } from "lucide-react";
 import { Button } from "@/components/ui/button";
+import ProductImage, { imageVariant } from "@/components/ProductImage";
 import { Input } from "@/components/ui/input";
 import {
   Select,
@@ -261,10 +262,12 @@ export default function ProductDetailPage() {
         <div className="aspect-square bg-slate-100 relative">
           {product.images?.length > 0 ? (
             <>
-              <img
+              <ProductImage
                 src={product.images[currentImageIndex]}
+                variant={imageVariant(product, product.images[currentImageIndex], "medium")}
                 alt={product.name}
                 className="w-full h-full object-contain"
+                loading="eager"
               />
               {product.images.length > 1 && (
                 <>
@@ -1,4 +1,4 @@
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import { useNavigate, useSearchParams } from "react-router-dom";
 import axios from "axios";
 import { 
@@ -6,6 +6,7 @@ import {
   Grid, List, ImageOff, X
 } from "lucide-react";
 import { Button } from "@/components/ui/button";
+import ProductImage from "@/components/ProductImage";
 import { Input } from "@/components/ui/input";
 import {
   Select,
@@ -22,8 +23,10 @@ import {
   DialogTrigger,
 } from "@/components/ui/dialog";
 import { toast } from "sonner";
+import { pollJob, jobErrorMessage } from "@/lib/jobs";
 
 const API = `${process.env.REACT_APP_BACKEND_URL}/api`;
+const PRODUCT_PAGE_SIZE = 50;
 
 export default function ProductsPage() {
   const navigate = useNavigate();
@@ -32,6 +35,11 @@ export default function ProductsPage() {
   const [categories, setCategories] = useState([]);
   const [loading, setLoading] = useState(true);
   const [total, setTotal] = useState(0);
+  // Sonsuz kaydırma: sonraki sayfanın imleci ve liste sonundaki gözcü eleman
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const fetchIdRef = useRef(0);
+  const sentinelRef = useRef(null);
   
   // Filters - URL'den kategori parametresini oku
   const [search, setSearch] = useState("");
@@ -41,6 +49,7 @@ export default function ProductsPage() {
   // Excel Upload Dialog
   const [uploadDialogOpen, setUploadDialogOpen] = useState(false);
   const [uploading, setUploading] = useState(false);
+  const [uploadProgress, setUploadProgress] = useState(null);
   const [uploadResult, setUploadResult] = useState(null);
   
   // New Product Dialog
@@ -55,25 +64,68 @@ export default function ProductsPage() {
   });
   const [saving, setSaving] = useState(false);
 
+  const productParams = (cursor) => {
+    const params = new URLSearchParams();
+    if (search) params.append("search", search);
+    if (selectedCategory && selectedCategory !== "all") params.append("category", selectedCategory);
+    params.append("limit", String(PRODUCT_PAGE_SIZE));
+    if (cursor) {
+      // Toplam ilk sayfada geldi, sonraki sayfalarda tekrar hesaplatma
+      params.append("cursor", cursor);
+      params.append("include_total", "false");
+    }
+    return params.toString();
+  };
+
+  // Filtre değişince ilk sayfayı yükle; yeni bir yükleme eskisini geçersiz kılar
   const fetchProducts = async () => {
+    const fetchId = ++fetchIdRef.current;
     setLoading(true);
     try {
-      const params = new URLSearchParams();
-      if (search) params.append("search", search);
-      if (selectedCategory && selectedCategory !== "all") params.append("category", selectedCategory);
-      params.append("limit", "200");
-      
-      const res = await axios.get(`${API}/products?${params.toString()}`);
+      const res = await axios.get(`${API}/products?${productParams(null)}`);
+      if (fetchId !== fetchIdRef.current) return;
       setProducts(res.data.products);
       setTotal(res.data.total);
+      setNextCursor(res.data.next_cursor);
+    } catch (error) {
+      console.error("Error fetching products:", error);
+      toast.error("Ürünler yüklenirken hata oluştu");
+    } finally {
+      if (fetchId === fetchIdRef.current) setLoading(false);
+    }
+  };
+
+  const fetchMoreProducts = async () => {
+    if (!nextCursor || loadingMore) return;
+    const fetchId = fetchIdRef.current;
+    setLoadingMore(true);
+    try {
+      const res = await axios.get(`${API}/products?${productParams(nextCursor)}`);
+      if (fetchId !== fetchIdRef.current) return;
+      setProducts((prev) => prev.concat(res.data.products));
+      setNextCursor(res.data.next_cursor);
     } catch (error) {
       console.error("Error fetching products:", error);
       toast.error("Ürünler yüklenirken hata oluştu");
     } finally {
-      setLoading(false);
+      setLoadingMore(false);
     }
   };
 
+  // Liste sonu görünür olunca sonraki sayfayı getir
+  useEffect(() => {
+    const sentinel = sentinelRef.current;
+    if (!sentinel || !nextCursor) return;
+    const observer = new IntersectionObserver(
+      (entries) => {
+        if (entries[0].isIntersecting) fetchMoreProducts();
+      },
+      { rootMargin: "400px" }
+    );
+    observer.observe(sentinel);
+    return () => observer.disconnect();
+  }, [nextCursor, loadingMore]);
+
   const fetchCategories = async () => {
     try {
       const res = await axios.get(`${API}/categories`);
@@ -129,18 +181,23 @@ export default function ProductsPage() {
     formData.append("file", file);
 
     try {
-      const res = await axios.post(`${API}/products/upload`, formData, {
+      const { data: job } = await axios.post(`${API}/products/upload`, formData, {
         headers: { "Content-Type": "multipart/form-data" }
       });
-      setUploadResult(res.data);
-      toast.success(`${res.data.created} yeni ürün, ${res.data.updated} güncelleme`);
+      // Satırlar sunucuda arka planda işlenir
+      const { result } = await pollJob(`${API}/import/jobs/${job.id}`, {
+        onProgress: setUploadProgress,
+      });
+      setUploadResult(result);
+      toast.success(`${result.created} yeni ürün, ${result.updated} güncelleme`);
       fetchProducts();
       fetchCategories();
     } catch (error) {
       console.error("Error uploading:", error);
-      toast.error(error.response?.data?.detail || "Yükleme hatası");
+      toast.error(jobErrorMessage(error, "Yükleme hatası"));
     } finally {
       setUploading(false);
+      setUploadProgress(null);
       e.target.value = "";
     }
   };
@@ -350,7 +407,13 @@ export default function ProductsPage() {
                   className="w-full text-sm"
                   data-testid="excel-file-input"
                 />
-                {uploading && <p className="text-sm text-blue-600 animate-pulse">Yükleniyor...</p>}
+                {uploading && (
+                  <p className="text-sm text-blue-600 animate-pulse">
+                    {uploadProgress?.total
+                      ? `İşleniyor... ${uploadProgress.processed} / ${uploadProgress.total} satır`
+                      : "Yükleniyor..."}
+                  </p>
+                )}
                 {uploadResult && (
                   <div className="text-sm space-y-1 p-3 bg-slate-50 rounded-lg">
                     <p className="text-green-600">✓ {uploadResult.created} yeni ürün oluşturuldu</p>
@@ -390,8 +453,9 @@ export default function ProductsPage() {
               >
                 <div className="aspect-square bg-slate-100 relative">
                   {product.images?.[0] ? (
-                    <img
+                    <ProductImage
                       src={product.images[0]}
+                      variant={product.thumbnail}
                       alt={product.name}
                       className="w-full h-full object-cover"
                     />
@@ -427,7 +491,7 @@ export default function ProductsPage() {
               >
                 <div className="w-16 h-16 bg-slate-100 rounded-lg overflow-hidden flex-shrink-0">
                   {product.images?.[0] ? (
-                    <img src={product.images[0]} alt="" className="w-full h-full object-cover" />
+                    <ProductImage src={product.images[0]} variant={product.thumbnail} className="w-full h-full object-cover" />
                   ) : (
                     <div className="w-full h-full flex items-center justify-center">
                       <ImageOff className="w-5 h-5 text-slate-300" />
@@ -450,6 +514,11 @@ export default function ProductsPage() {
             ))}
           </div>
         )}
+        {!loading && nextCursor && (
+          <div ref={sentinelRef} className="text-center py-6 text-sm text-slate-400">
+            {loadingMore ? "Yükleniyor..." : ""}
+          </div>
+        )}
       </div>
     </div>
   );
@@ -0,0 +1,73 @@
+"""
+Test Customers Pagination - keyset sayfalama ve akış (streaming) modları
+- GET /api/customers?limit=&cursor=
+- GET /api/customers?format=ndjson
+- GET /api/customers (parametresiz, JSON dizisi)
+"""
+import json
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', 'https://satiskatalogu.preview.emergentagent.com').rstrip('/')
+
+class TestCustomersPagination:
+    """Keyset pagination and streaming for the customer list"""
+
+    @pytest.fixture
+    def auth_headers(self):
+        """Get auth headers"""
+        response = requests.post(f"{BASE_URL}/api/auth/login", json={
+            "email": "test@example.com",
+            "password": "test123"
+        })
+        if response.status_code != 200:
+            pytest.skip("Authentication failed - skipping authenticated tests")
+        return {"Authorization": f"Bearer {response.json()['token']}"}
+
+    def test_legacy_list_is_array(self, auth_headers):
+        """Without parameters the full list is returned as a JSON array"""
+        response = requests.get(f"{BASE_URL}/api/customers", headers=auth_headers)
+        assert response.status_code == 200
+        assert isinstance(response.json(), list)
+
+    def test_pages_cover_full_list(self, auth_headers):
+        """Walking next_cursor should return every customer exactly once, in name order"""
+        full = requests.get(f"{BASE_URL}/api/customers", headers=auth_headers).json()
+
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = requests.get(f"{BASE_URL}/api/customers", headers=auth_headers, params=params)
+            assert response.status_code == 200
+            data = response.json()
+            assert len(data["customers"]) <= 2
+            seen.extend(data["customers"])
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+
+        assert [c["id"] for c in seen] == [c["id"] for c in full]
+        names = [c["name"] for c in seen]
+        assert names == sorted(names)
+        print(f"✓ {len(seen)} customers paged")
+
+    def test_ndjson_export(self, auth_headers):
+        """NDJSON mode should return one customer per line"""
+        full = requests.get(f"{BASE_URL}/api/customers", headers=auth_headers).json()
+        response = requests.get(f"{BASE_URL}/api/customers", headers=auth_headers, params={"format": "ndjson"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines() if line]
+        assert [c["id"] for c in lines] == [c["id"] for c in full]
+
+    def test_invalid_cursor(self, auth_headers):
+        response = requests.get(f"{BASE_URL}/api/customers", headers=auth_headers, params={"limit": 10, "cursor": "bozuk"})
+        assert response.status_code == 400
+
+    def test_limit_is_bounded(self, auth_headers):
+        response = requests.get(f"{BASE_URL}/api/customers", headers=auth_headers, params={"limit": 100000})
+        assert response.status_code == 422
@@ -0,0 +1,119 @@
+"""
+Test Daily Breakdown - performans analizi günlük kırılımı ve günlük özetler (sunucu gerektirmez)
+- server.build_daily_breakdown
+- server.report_days / server.parse_report_range / server.sum_daily_stats
+"""
+import os
+import sys
+import time
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "test_daily_breakdown")
+
+from fastapi import HTTPException  # noqa: E402
+
+import server  # noqa: E402
+
+
+class TestBuildDailyBreakdown:
+    """Tarihe göre gruplanmış takip ve tahsilatlardan gün gün liste"""
+
+    def test_every_day_in_range_once(self):
+        data = server.build_daily_breakdown("2024-02-27", "2024-03-02", {}, {})
+        assert [d["date"] for d in data] == ["2024-02-27", "2024-02-28", "2024-02-29", "2024-03-01", "2024-03-02"]
+        assert all(d["planned"] == 0 and d["completed"] == 0 and d["payment"] == 0 for d in data)
+        assert data[0]["day"] == "Tue"
+
+    def test_grouped_values_land_on_their_day(self):
+        follow_up_days = {"2024-03-01": {"planned": 3, "completed": 2}}
+        daily_payment = {"2024-03-02": 150.5, "2024-04-01": 99}
+        data = server.build_daily_breakdown("2024-03-01", "2024-03-02", follow_up_days, daily_payment)
+        assert data == [
+            {"date": "2024-03-01", "day": "Fri", "planned": 3, "completed": 2, "payment": 0},
+            {"date": "2024-03-02", "day": "Sat", "planned": 0, "completed": 0, "payment": 150.5},
+        ]
+
+    def test_empty_when_end_before_start(self):
+        assert server.build_daily_breakdown("2024-03-02", "2024-03-01", {}, {}) == []
+
+    def test_year_range_is_linear(self):
+        """365 günlük aralık, her gün dolu olsa bile milisaniyeler içinde bitmeli"""
+        start, end = "2023-01-01", "2023-12-31"
+        days = server.build_daily_breakdown(start, end, {}, {})
+        follow_up_days = {d["date"]: {"planned": 5, "completed": 3} for d in days}
+        daily_payment = {d["date"]: 100 for d in days}
+
+        started = time.perf_counter()
+        data = server.build_daily_breakdown(start, end, follow_up_days, daily_payment)
+        elapsed = time.perf_counter() - started
+
+        assert len(data) == 365
+        assert sum(d["planned"] for d in data) == 5 * 365
+        assert sum(d["payment"] for d in data) == 100 * 365
+        assert elapsed < 0.5
+
+
+def stats_doc(day, **fields):
+    doc = server.empty_daily_stats("u1", day)
+    doc.update(fields)
+    return doc
+
+
+class TestSumDailyStats:
+    """Günlük özet belgelerinin dönem toplamı"""
+
+    def test_report_days(self):
+        assert server.report_days("2024-12-30", "2025-01-02") == ["2024-12-30", "2024-12-31", "2025-01-01", "2025-01-02"]
+        assert server.report_days("2024-01-02", "2024-01-01") == []
+
+    def test_empty_period(self):
+        total = server.sum_daily_stats([stats_doc("2024-03-01"), stats_doc("2024-03-02")])
+        assert total["visits"] == 0
+        assert total["working_days"] == 0
+        assert total["visit_skip_reasons"] == {}
+        assert total["quality"][5] == {"count": 0, "paid_count": 0, "paid_sum": 0}
+        assert total["price"]["iskontolu"] == {"visits": 0, "completed": 0, "payment": 0}
+
+    def test_counts_and_breakdowns_are_summed(self):
+        docs = [
+            stats_doc(
+                "2024-03-01", visits=3, visited=2, completed=2, payment_count=1, payment_total=150, km=40,
+                payment_by_type=[{"type": "Nakit", "amount": 150}],
+                visit_skip_reasons=[{"reason": "Kapalı", "count": 1}],
+                quality=[{"rating": 4, "count": 2, "paid_count": 1, "paid_sum": 150}],
+                price={"iskontolu": {"visits": 1, "completed": 1, "payment": 150},
+                       "standart": {"visits": 2, "completed": 1, "payment": 0}},
+            ),
+            stats_doc("2024-03-02", follow_ups_planned=4, follow_ups_completed=1),
+            stats_doc(
+                "2024-03-03", visits=1, visited=1, completed=1, payment_count=1, payment_total=50, fuel_cost=900,
+                payment_by_type=[{"type": "Nakit", "amount": 20}, {"type": "Çek", "amount": 30}],
+                visit_skip_reasons=[{"reason": "Kapalı", "count": 2}],
+                quality=[{"rating": 4, "count": 1, "paid_count": 1, "paid_sum": 50}],
+            ),
+        ]
+        total = server.sum_daily_stats(docs)
+        assert total["visits"] == 4
+        assert total["visited"] == 3
+        assert total["working_days"] == 2
+        assert total["payment_total"] == 200
+        assert total["follow_ups_planned"] == 4
+        assert total["km"] == 40
+        assert total["fuel_cost"] == 900
+        assert total["payment_by_type"] == {"Nakit": 170, "Çek": 30}
+        assert total["visit_skip_reasons"] == {"Kapalı": 3}
+        assert total["quality"][4] == {"count": 3, "paid_count": 2, "paid_sum": 200}
+        assert total["price"]["iskontolu"]["payment"] == 150
+        assert total["price"]["standart"]["visits"] == 2
+
+    def test_parse_report_range(self):
+        assert server.parse_report_range("2024-01-01", "2024-12-31") == (date(2024, 1, 1), date(2024, 12, 31))
+        for start, end in [("2024-13-01", "2024-12-31"), ("01.01.2024", "2024-01-02"),
+                           ("2024-03-02", "2024-03-01"), ("1900-01-01", "2024-01-01")]:
+            with pytest.raises(HTTPException) as exc:
+                server.parse_report_range(start, end)
+            assert exc.value.status_code == 400
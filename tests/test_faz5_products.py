@@ -334,6 +334,45 @@ class TestProductFiltering(TestAuth):
         response2 = requests.get(f"{BASE_URL}/api/products?skip=0&limit=10", headers=auth_headers)
         assert response2.status_code == 200
     
+    def test_products_cursor_pagination(self, auth_headers):
+        """Walking next_cursor should return every product once, matching the total"""
+        first = requests.get(f"{BASE_URL}/api/products?limit=3", headers=auth_headers)
+        assert first.status_code == 200
+        data = first.json()
+        total = data["total"]
+        seen = [p["id"] for p in data["products"]]
+        cursor = data["next_cursor"]
+        
+        while cursor:
+            response = requests.get(
+                f"{BASE_URL}/api/products",
+                headers=auth_headers,
+                params={"limit": 3, "cursor": cursor, "include_total": "false"}
+            )
+            assert response.status_code == 200
+            page = response.json()
+            assert page["total"] is None
+            seen.extend(p["id"] for p in page["products"])
+            cursor = page["next_cursor"]
+        
+        assert len(seen) == len(set(seen)) == total
+    
+    def test_products_total_follows_writes(self, auth_headers):
+        """Cached totals should change after a product is created"""
+        before = requests.get(f"{BASE_URL}/api/products?limit=1", headers=auth_headers).json()["total"]
+        create_response = requests.post(f"{BASE_URL}/api/products", headers=auth_headers, json={
+            "product_code": f"TEST_CNT_{uuid.uuid4().hex[:8]}",
+            "name": "Count Test Product",
+            "category": "Test Kategori"
+        })
+        assert create_response.status_code == 200
+        after = requests.get(f"{BASE_URL}/api/products?limit=1", headers=auth_headers).json()["total"]
+        assert after == before + 1
+        
+        # Cleanup
+        product_id = create_response.json()["product"]["id"]
+        requests.delete(f"{BASE_URL}/api/products/{product_id}", headers=auth_headers)
+    
     def test_products_search_filter(self, auth_headers):
         """Test products search filter"""
         # Create a product with unique name
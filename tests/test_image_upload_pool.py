@@ -0,0 +1,213 @@
+"""
+Test Image Upload Pool - paralel görsel yükleme (sahte depolama ile, sunucu gerektirmez)
+- server.upload_images / server.upload_image
+- server.ImageStorage / server.LocalImageStorage / server.CloudinaryStorage
+- server.hash_upload
+"""
+import asyncio
+import hashlib
+import io
+import os
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import urllib3.exceptions
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "test_image_upload_pool")
+
+from fastapi import UploadFile  # noqa: E402
+
+import server  # noqa: E402
+
+
+class FakeStorage(server.ImageStorage):
+    """Ağ gecikmesini taklit eden depolama; eşzamanlı çağrı sayısını ölçer"""
+
+    name = "fake"
+
+    def __init__(self, latency=0.05, failures=0):
+        self.latency = latency
+        self.failures = failures
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def save(self, contents, folder, timeout=None):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            fail = self.calls <= self.failures
+        try:
+            if timeout is not None and self.latency > timeout:
+                time.sleep(timeout)
+                raise TimeoutError("Yükleme zaman aşımına uğradı")
+            time.sleep(self.latency)
+            if fail:
+                raise ConnectionError("Geçici bağlantı hatası")
+            name = contents.decode()
+            return {"url": f"https://images.local/{folder}/{name}", "public_id": f"{folder}/{name}"}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def make_files(count):
+    return [UploadFile(file=io.BytesIO(f"img{i}".encode()), filename=f"P{i:03d}_1.jpg") for i in range(count)]
+
+
+@pytest.fixture
+def configure(monkeypatch):
+    def apply(storage, concurrency=4, retries=0, timeout=5):
+        pool = server.BoundedExecutor(
+            "image_upload",
+            lambda workers: ThreadPoolExecutor(max_workers=workers),
+            concurrency=concurrency
+        )
+        monkeypatch.setattr(server, "image_upload_pool", pool)
+        monkeypatch.setattr(server, "image_storage", storage)
+        monkeypatch.setattr(server, "IMAGE_UPLOAD_CONCURRENCY", concurrency)
+        monkeypatch.setattr(server, "IMAGE_UPLOAD_RETRIES", retries)
+        monkeypatch.setattr(server, "IMAGE_UPLOAD_TIMEOUT_SECONDS", timeout)
+        return pool
+    yield apply
+
+
+class TestImageUploadPool:
+    """Bounded concurrent image uploads"""
+
+    def test_uploads_run_in_parallel(self, configure):
+        """Uploads should overlap up to the configured concurrency and keep file order"""
+        storage = FakeStorage(latency=0.1)
+        pool = configure(storage, concurrency=4)
+
+        started = time.perf_counter()
+        results = asyncio.run(server.upload_images(make_files(16), "products/u1"))
+        elapsed = time.perf_counter() - started
+        pool.shutdown()
+
+        assert [r["url"] for r in results] == [f"https://images.local/products/u1/img{i}" for i in range(16)]
+        assert storage.peak == 4
+        assert elapsed < 16 * 0.1 / 2, f"Uploads were not parallel ({elapsed:.2f}s)"
+
+    def test_transient_failures_are_retried(self, configure):
+        """A failing upload should be retried before giving up"""
+        storage = FakeStorage(latency=0, failures=2)
+        pool = configure(storage, concurrency=1, retries=2)
+
+        results = asyncio.run(server.upload_images(make_files(1), "products/u1"))
+        pool.shutdown()
+
+        assert results[0]["url"].endswith("img0")
+        assert storage.calls == 3
+
+    def test_timeout_is_reported_per_file(self, configure):
+        """A slow upload should fail with a timeout without failing the others"""
+        storage = FakeStorage(latency=0.3)
+        pool = configure(storage, concurrency=2, retries=0, timeout=0.1)
+
+        results = asyncio.run(server.upload_images(make_files(2), "products/u1"))
+        pool.shutdown()
+
+        assert all(isinstance(r, TimeoutError) for r in results)
+
+    def test_timeout_is_not_retried(self, configure):
+        """A timed-out upload may have landed in storage; retrying would duplicate it"""
+        storage = FakeStorage(latency=0.3)
+        pool = configure(storage, concurrency=1, retries=2, timeout=0.1)
+
+        results = asyncio.run(server.upload_images(make_files(1), "products/u1"))
+        pool.shutdown()
+
+        assert isinstance(results[0], TimeoutError)
+        assert storage.calls == 1
+
+
+class TestLocalImageStorage:
+    """Content-addressed local image storage"""
+
+    def test_same_content_same_url(self, tmp_path):
+        storage = server.LocalImageStorage(tmp_path, "/api/media")
+        jpeg = b"\xff\xd8\xff\xe0" + b"0" * 64
+
+        first = storage.save(jpeg, "products/u1")
+        second = storage.save(jpeg, "products/u1")
+
+        assert first == second
+        assert first["url"].startswith("/api/media/products/u1/")
+        assert first["url"].endswith(".jpg")
+        assert storage.resolve(first["public_id"]).read_bytes() == jpeg
+
+    def test_resolve_rejects_path_traversal(self, tmp_path):
+        storage = server.LocalImageStorage(tmp_path / "media", "/api/media")
+        (tmp_path / "secret.txt").write_text("gizli")
+
+        assert storage.resolve("../secret.txt") is None
+        assert storage.resolve("products/missing.jpg") is None
+
+
+def cloudinary_failure(error):
+    """cloudinary.uploader.call_api'nin ağ hatasını sarma biçimini taklit et"""
+    import cloudinary.exceptions
+
+    def upload(*args, **kwargs):
+        try:
+            raise error
+        except Exception as e:
+            raise cloudinary.exceptions.Error(f"Socket error: {e!r}")
+    return upload
+
+
+class TestImageStorage:
+    """Storage backends must implement save()"""
+
+    def test_incomplete_backend_fails_on_instantiation(self):
+        class Incomplete(server.ImageStorage):
+            name = "incomplete"
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+
+class TestCloudinaryStorage:
+    """Network timeouts from the Cloudinary client are reported as TimeoutError"""
+
+    @pytest.mark.parametrize("error", [
+        socket.timeout("timed out"),
+        urllib3.exceptions.MaxRetryError(None, "/upload", urllib3.exceptions.ReadTimeoutError(None, "/upload", "Read timed out.")),
+    ])
+    def test_timeouts_are_classified(self, monkeypatch, error):
+        import cloudinary.uploader
+        monkeypatch.setattr(cloudinary.uploader, "upload", cloudinary_failure(error))
+
+        with pytest.raises(TimeoutError):
+            server.CloudinaryStorage().save(b"img", "products/u1", timeout=1)
+
+    def test_other_errors_are_not_timeouts(self, monkeypatch):
+        import cloudinary.exceptions
+        import cloudinary.uploader
+        monkeypatch.setattr(cloudinary.uploader, "upload", cloudinary_failure(ConnectionResetError("reset")))
+
+        with pytest.raises(cloudinary.exceptions.Error):
+            server.CloudinaryStorage().save(b"img", "products/u1", timeout=1)
+
+
+class TestHashUpload:
+    """Content hashing used to skip re-uploads"""
+
+    def test_hash_rewinds_file(self):
+        contents = os.urandom(3 * 1024 * 1024 + 17)
+        upload = UploadFile(file=io.BytesIO(contents), filename="P001_1.jpg")
+
+        digest, size = server.hash_upload(upload)
+
+        assert digest == hashlib.sha256(contents).hexdigest()
+        assert size == len(contents)
+        assert asyncio.run(upload.read()) == contents
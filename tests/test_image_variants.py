@@ -0,0 +1,116 @@
+"""
+Test Image Variants - ürün görseli küçük resim / orta boy varyantları (sunucu gerektirmez)
+- image_variants.render_variants / image_variants.difference_hash
+- server.product_thumbnail
+"""
+import io
+import os
+import random
+import sys
+
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "test_image_variants")
+
+import image_variants  # noqa: E402
+import server  # noqa: E402
+
+
+def encode(image, fmt):
+    buffer = io.BytesIO()
+    image.save(buffer, fmt)
+    return buffer.getvalue()
+
+
+def block_image(seed):
+    """Sabit tohumlu, yüksek kontrastlı bloklar: komşu pikseller arasında eşitlik yok"""
+    rng = random.Random(seed)
+    blocks = Image.new("RGB", (9, 8))
+    blocks.putdata([tuple(rng.randrange(256) for _ in range(3)) for _ in range(72)])
+    return blocks.resize((1800, 1600), Image.Resampling.NEAREST)
+
+
+class TestRenderVariants:
+    """Pillow variant rendering"""
+
+    def test_sizes_and_formats(self):
+        """Every size should be rendered as WebP and JPEG within its bounding box"""
+        contents = encode(Image.new("RGB", (3000, 2000), (200, 40, 40)), "JPEG")
+
+        variants = image_variants.render_variants(contents)
+
+        assert {(v["size"], v["format"]) for v in variants} == {
+            (size, fmt) for size in image_variants.VARIANT_SIZES for fmt in image_variants.VARIANT_FORMATS
+        }
+        for variant in variants:
+            edge = image_variants.VARIANT_SIZES[variant["size"]]
+            assert max(variant["width"], variant["height"]) == edge
+            assert abs(variant["width"] / variant["height"] - 1.5) < 0.01
+            decoded = Image.open(io.BytesIO(variant["content"]))
+            assert decoded.format == {"webp": "WEBP", "jpeg": "JPEG"}[variant["format"]]
+            assert len(variant["content"]) < len(contents)
+
+    def test_small_images_are_not_upscaled(self):
+        contents = encode(Image.new("RGB", (200, 100)), "PNG")
+
+        variants = image_variants.render_variants(contents)
+
+        assert all((v["width"], v["height"]) == (200, 100) for v in variants)
+
+    def test_transparent_png_is_flattened(self):
+        """JPEG has no alpha channel; transparent pixels should become white"""
+        contents = encode(Image.new("RGBA", (400, 400), (0, 0, 0, 0)), "PNG")
+
+        variants = image_variants.render_variants(contents)
+        jpeg = next(v for v in variants if v["format"] == "jpeg")
+
+        assert Image.open(io.BytesIO(jpeg["content"])).convert("RGB").getpixel((10, 10)) == (255, 255, 255)
+
+
+class TestDifferenceHash:
+    """Perceptual hash used for near-duplicate upload detection"""
+
+    photo = block_image(seed=7)
+
+    def test_reencoded_copy_has_same_hash(self):
+        original = image_variants.difference_hash(encode(self.photo, "JPEG"))
+        smaller = self.photo.resize((800, 600))
+
+        assert image_variants.difference_hash(encode(smaller, "JPEG")) == original
+        assert image_variants.difference_hash(encode(self.photo, "PNG")) == original
+        assert len(original) == 16
+
+    def test_different_image_has_different_hash(self):
+        mirrored = self.photo.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+
+        assert image_variants.difference_hash(encode(mirrored, "JPEG")) != image_variants.difference_hash(encode(self.photo, "JPEG"))
+
+
+class TestProductThumbnail:
+    """Thumbnail selection for product list responses"""
+
+    def test_uses_first_image_thumb(self):
+        product = {
+            "images": ["https://img/a.jpg", "https://img/b.jpg"],
+            "image_variants": [
+                {"url": "https://img/b.jpg", "variants": [
+                    {"size": "thumb", "format": "jpeg", "width": 320, "height": 240, "url": "https://img/b-t.jpg"},
+                ]},
+                {"url": "https://img/a.jpg", "variants": [
+                    {"size": "medium", "format": "jpeg", "width": 960, "height": 720, "url": "https://img/a-m.jpg"},
+                    {"size": "thumb", "format": "webp", "width": 320, "height": 240, "url": "https://img/a-t.webp"},
+                    {"size": "thumb", "format": "jpeg", "width": 320, "height": 240, "url": "https://img/a-t.jpg"},
+                ]},
+            ],
+        }
+
+        assert server.product_thumbnail(product) == {
+            "url": "https://img/a-t.jpg", "webp": "https://img/a-t.webp", "width": 320, "height": 240
+        }
+
+    def test_missing_variants(self):
+        """Images uploaded before variants existed fall back to the original"""
+        assert server.product_thumbnail({"images": ["https://img/a.jpg"]}) is None
+        assert server.product_thumbnail({"images": [], "image_variants": []}) is None
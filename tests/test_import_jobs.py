@@ -0,0 +1,90 @@
+"""
+Test Import Jobs - Excel yüklemeleri arka plan işi olarak
+- POST /api/products/upload
+- POST /api/customers/upload
+- GET /api/import/jobs/{job_id}
+"""
+import io
+import time
+
+import pytest
+import requests
+import os
+from openpyxl import Workbook
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', 'https://satiskatalogu.preview.emergentagent.com').rstrip('/')
+
+def build_excel(header, rows):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(header)
+    for row in rows:
+        ws.append(row)
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+class TestImportJobs:
+    """Excel import job tests"""
+
+    @pytest.fixture
+    def auth_headers(self):
+        """Get auth headers"""
+        response = requests.post(f"{BASE_URL}/api/auth/login", json={
+            "email": "test@example.com",
+            "password": "test123"
+        })
+        if response.status_code != 200:
+            pytest.skip("Authentication failed - skipping authenticated tests")
+        return {"Authorization": f"Bearer {response.json()['token']}"}
+
+    def wait_for_job(self, job_id, auth_headers):
+        for _ in range(60):
+            response = requests.get(f"{BASE_URL}/api/import/jobs/{job_id}", headers=auth_headers)
+            assert response.status_code == 200
+            job = response.json()
+            if job["status"] in ("done", "failed"):
+                return job
+            time.sleep(1)
+        pytest.fail(f"Import job did not finish: {job}")
+
+    def test_product_upload_returns_job(self, auth_headers):
+        """Product upload should return a job and finish with per-row errors"""
+        excel = build_excel(
+            ["product_code", "product_name", "category", "price"],
+            [["TEST_JOB_001", "Test Job Ürün", "Test Kategori", 10], [None, "Kodsuz", None, None]]
+        )
+        response = requests.post(
+            f"{BASE_URL}/api/products/upload",
+            files={"file": ("urunler.xlsx", excel, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        job = response.json()
+        assert job["status"] in ("queued", "running", "done")
+        assert job["total"] == 2
+
+        job = self.wait_for_job(job["id"], auth_headers)
+        assert job["status"] == "done"
+        assert job["processed"] == 2
+        assert job["failed"] == 1
+        result = job["result"]
+        assert result["created"] + result["updated"] == 1
+        assert result["errors"][0]["row"] == 3
+        print(f"✓ Product import job: {job}")
+
+    def test_customer_upload_missing_column(self, auth_headers):
+        """Header validation should still fail fast with 400"""
+        excel = build_excel(["Müşteri Adı"], [["Test"]])
+        response = requests.post(
+            f"{BASE_URL}/api/customers/upload",
+            files={"file": ("musteriler.xlsx", excel, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")},
+            headers=auth_headers
+        )
+        assert response.status_code == 400
+
+    def test_unknown_job(self, auth_headers):
+        """Unknown job ids should return 404"""
+        response = requests.get(f"{BASE_URL}/api/import/jobs/non-existent-id", headers=auth_headers)
+        assert response.status_code == 404
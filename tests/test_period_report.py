@@ -156,6 +156,22 @@ class TestPerformanceAnalytics:
         assert data["period"] == "monthly", "Period should be monthly"
         
         print("✓ Monthly analytics endpoint works")
+    
+    def test_custom_range_response_shape(self):
+        """Aggregated analytics should keep the full response shape for long ranges"""
+        response = self.session.get(
+            f"{BASE_URL}/api/analytics/performance?period=custom&start_date=2025-01-01&end_date=2025-12-31"
+        )
+        assert response.status_code == 200
+        data = response.json()
+        
+        for key in ["visit_performance", "payment_performance", "customer_acquisition",
+                    "price_analysis", "daily_breakdown", "visit_quality"]:
+            assert key in data, f"Response should have {key}"
+        assert len(data["daily_breakdown"]) == 365
+        assert set(data["price_analysis"]) == {"iskontolu", "standart"}
+        assert set(data["visit_quality"]["rating"]["distribution"]) == {"1", "2", "3", "4", "5"}
+        assert data["customer_acquisition"]["new_count"] == len(data["customer_acquisition"]["new_customers"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,65 @@
+"""
+Test Report Cache - PDF rapor önbelleği ve ETag desteği
+- GET /api/report/pdf/{day_name}/{date}
+- GET /api/report/pdf/period/{period_type}
+"""
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', 'https://satiskatalogu.preview.emergentagent.com').rstrip('/')
+
+class TestReportCache:
+    """PDF report cache tests"""
+
+    @pytest.fixture
+    def auth_headers(self):
+        """Get auth headers"""
+        response = requests.post(f"{BASE_URL}/api/auth/login", json={
+            "email": "test@example.com",
+            "password": "test123"
+        })
+        if response.status_code != 200:
+            pytest.skip("Authentication failed - skipping authenticated tests")
+        return {"Authorization": f"Bearer {response.json()['token']}"}
+
+    def test_daily_report_has_stable_etag(self, auth_headers):
+        """Repeated downloads of the same past day should return the same ETag"""
+        url = f"{BASE_URL}/api/report/pdf/Pazartesi/2024-01-01"
+        first = requests.get(url, headers=auth_headers)
+        assert first.status_code == 200
+        assert first.headers.get("content-type") == "application/pdf"
+        etag = first.headers.get("etag")
+        assert etag, "PDF response should carry an ETag"
+
+        second = requests.get(url, headers=auth_headers)
+        assert second.status_code == 200
+        assert second.headers.get("etag") == etag
+        assert second.content == first.content
+        print(f"✓ Daily report ETag: {etag}")
+
+    def test_daily_report_not_modified(self, auth_headers):
+        """If-None-Match with the current ETag should return 304"""
+        url = f"{BASE_URL}/api/report/pdf/Pazartesi/2024-01-01"
+        etag = requests.get(url, headers=auth_headers).headers.get("etag")
+        response = requests.get(url, headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers.get("etag") == etag
+
+    def test_period_report_not_modified(self, auth_headers):
+        """Period report should support conditional requests as well"""
+        url = f"{BASE_URL}/api/report/pdf/period/weekly?start_date=2024-01-01&end_date=2024-01-07"
+        first = requests.get(url, headers=auth_headers)
+        assert first.status_code == 200
+        etag = first.headers.get("etag")
+        assert etag
+        response = requests.get(url, headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 304
+
+    def test_report_cache_metrics(self, auth_headers):
+        """Metrics should expose report cache counters"""
+        response = requests.get(f"{BASE_URL}/api/metrics", headers=auth_headers)
+        assert response.status_code == 200
+        cache = response.json()["report_cache"]
+        for key in ["memory_hits", "disk_hits", "misses", "not_modified"]:
+            assert key in cache, f"report_cache should have {key}"
@@ -0,0 +1,58 @@
+"""
+Test Report Jobs - arka planda dönem raporu üretimi
+- POST /api/report/jobs
+- GET /api/report/jobs/{job_id}
+- GET /api/report/jobs/{job_id}/download
+"""
+import time
+
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', 'https://satiskatalogu.preview.emergentagent.com').rstrip('/')
+
+class TestReportJobs:
+    """Report job queue tests"""
+
+    @pytest.fixture
+    def auth_headers(self):
+        """Get auth headers"""
+        response = requests.post(f"{BASE_URL}/api/auth/login", json={
+            "email": "test@example.com",
+            "password": "test123"
+        })
+        if response.status_code != 200:
+            pytest.skip("Authentication failed - skipping authenticated tests")
+        return {"Authorization": f"Bearer {response.json()['token']}"}
+
+    def test_submit_poll_and_download(self, auth_headers):
+        """A submitted monthly report should finish and be downloadable"""
+        response = requests.post(f"{BASE_URL}/api/report/jobs", json={"period_type": "monthly"}, headers=auth_headers)
+        assert response.status_code == 200
+        job = response.json()
+        assert job["status"] in ("queued", "running", "done")
+        assert job["params"]["filename"].startswith("performans_raporu_aylik_")
+
+        for _ in range(60):
+            job = requests.get(f"{BASE_URL}/api/report/jobs/{job['id']}", headers=auth_headers).json()
+            if job["status"] in ("done", "failed"):
+                break
+            time.sleep(1)
+        assert job["status"] == "done", f"Job did not finish: {job}"
+
+        response = requests.get(f"{BASE_URL}{job['download_url']}", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.headers.get("content-type") == "application/pdf"
+        assert response.content.startswith(b"%PDF")
+        print(f"✓ Report job {job['id']} downloaded ({len(response.content)} bytes)")
+
+    def test_invalid_period_type(self, auth_headers):
+        """Unknown period types should be rejected"""
+        response = requests.post(f"{BASE_URL}/api/report/jobs", json={"period_type": "yearly"}, headers=auth_headers)
+        assert response.status_code == 400
+
+    def test_unknown_job(self, auth_headers):
+        """Unknown job ids should return 404"""
+        response = requests.get(f"{BASE_URL}/api/report/jobs/non-existent-id", headers=auth_headers)
+        assert response.status_code == 404
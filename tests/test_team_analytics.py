@@ -0,0 +1,35 @@
+"""
+Test Team Analytics - yönetici ekip analizi
+- GET /api/analytics/team
+"""
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', 'https://satiskatalogu.preview.emergentagent.com').rstrip('/')
+
+class TestTeamAnalytics:
+    """Team analytics is restricted to manager roles"""
+
+    @pytest.fixture
+    def auth_headers(self):
+        """Get auth headers for the test representative"""
+        response = requests.post(f"{BASE_URL}/api/auth/login", json={
+            "email": "test@example.com",
+            "password": "test123"
+        })
+        if response.status_code != 200:
+            pytest.skip("Authentication failed - skipping authenticated tests")
+        return {"Authorization": f"Bearer {response.json()['token']}"}
+
+    def test_requires_auth(self):
+        response = requests.get(f"{BASE_URL}/api/analytics/team")
+        assert response.status_code == 401
+
+    def test_representative_is_forbidden(self, auth_headers):
+        """A representative must not see other representatives' data"""
+        me = requests.get(f"{BASE_URL}/api/auth/me", headers=auth_headers).json()
+        if me.get("role") in ("admin", "manager"):
+            pytest.skip("Test user is a manager")
+        response = requests.get(f"{BASE_URL}/api/analytics/team", headers=auth_headers)
+        assert response.status_code == 403